@@ -0,0 +1,251 @@
+"""
+An append-only log of quiz answers.  Each answer is a length-prefixed binary
+record with a CRC, so after a crash the log is cut back to its last whole record.
+Answers are appended to a buffer in memory and a background thread writes the
+buffer out once it passes a size or has waited long enough, so recording an
+answer never waits for the disk.  Compaction folds old answers into per-item
+summaries and rewrites the log without them
+"""
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import Future
+
+Answer = namedtuple('Answer', 'time item correct seconds')
+
+# How an item has been answered: times asked, times correct, total seconds taken
+# and the time of the last answer
+ItemSummary = namedtuple('ItemSummary', 'count correct seconds last')
+
+# Each record is its payload length and CRC, then its sequence number, the time,
+# correct flag and seconds taken, then the item as UTF-8.  Sequence numbers rise
+# through the log, whatever the times recorded
+_header = struct.Struct('<II')
+_fields = struct.Struct('<Qd?f')
+
+
+def encode(answer, seq=0):
+    """ The bytes of one log record """
+    payload = _fields.pack(seq, answer.time, answer.correct, answer.seconds) + answer.item.encode('utf-8')
+    return _header.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _records(f):
+    """ Yield (answer, sequence number, record bytes) up to the first partial or
+    corrupt record """
+    while True:
+        header = f.read(_header.size)
+        if len(header) < _header.size:
+            return
+        size, crc = _header.unpack(header)
+        payload = f.read(size)
+        if len(payload) < size or size < _fields.size or zlib.crc32(payload) != crc:
+            return
+        seq, when, correct, seconds = _fields.unpack_from(payload)
+        yield Answer(when, payload[_fields.size:].decode('utf-8'), correct, seconds), seq, header + payload
+
+
+def read_log(path):
+    """ Yield every whole answer in a log """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        for answer, _, _ in _records(f):
+            yield answer
+
+
+def recover(path):
+    """ Cut a log back to its last whole record, as left by a crash part way
+    through a write.  Returns the number of bytes removed """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r+b') as f:
+        good = 0
+        for _, _, record in _records(f):
+            good += len(record)
+        size = f.seek(0, os.SEEK_END)
+        if size > good:
+            f.truncate(good)
+        return size - good
+
+
+def _fold(summaries, answer):
+    s = summaries.get(answer.item)
+    if s is None:
+        summaries[answer.item] = ItemSummary(1, int(answer.correct), answer.seconds, answer.time)
+    else:
+        summaries[answer.item] = ItemSummary(s.count + 1, s.correct + answer.correct, s.seconds + answer.seconds,
+                                             max(s.last, answer.time))
+
+
+def _replace(path, data, mode='wb'):
+    """ Write a file atomically """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.answers-')
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class AnswerLog(object):
+    """ A buffered, append-only answer log with compacted summaries
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'answers.log')
+    >>> with AnswerLog(path) as log:
+    ...     log.record('3:45 pm', True, 2.5, when=10)
+    ...     log.record('3:45 pm', False, 4.0, when=20)
+    >>> AnswerLog(path).summaries()['3:45 pm']
+    ItemSummary(count=2, correct=1, seconds=6.5, last=20.0)
+    """
+
+    def __init__(self, path, flush_bytes=1 << 16, flush_seconds=1.0, summary_path=None):
+        self.path = path
+        self.summary_path = summary_path or path + '.summary.json'
+        self.flush_bytes = flush_bytes
+        self.flush_seconds = flush_seconds
+        recover(path)
+        self._seq = self._last_seq()
+        self._file = open(path, 'ab')
+        self._buffer = bytearray()
+        # _io serializes writes to the file and is always taken before _buffered
+        self._io = threading.Lock()
+        self._buffered = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name='answer-log', daemon=True)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, item, correct, seconds=0.0, when=None):
+        """ Append an answer.  This only copies it into the buffer """
+        answer = Answer(time.time() if when is None else when, item, correct, seconds)
+        with self._buffered:
+            assert not self._closed, "Log is closed"
+            self._seq += 1
+            self._buffer += encode(answer, self._seq)
+            if len(self._buffer) >= self.flush_bytes:
+                self._buffered.notify()
+
+    def _write_buffer(self):
+        """ Write out the buffer; the caller holds _io """
+        with self._buffered:
+            data, self._buffer = self._buffer, bytearray()
+        if data:
+            self._file.write(data)
+            self._file.flush()
+
+    def _run(self):
+        while True:
+            with self._buffered:
+                self._buffered.wait_for(lambda: len(self._buffer) >= self.flush_bytes or self._closed,
+                                        self.flush_seconds)
+                closed = self._closed
+            with self._io:
+                self._write_buffer()
+            if closed:
+                return
+
+    def flush(self, sync=False):
+        """ Write out buffered answers now, and with sync wait for them to reach the disk """
+        with self._io:
+            self._write_buffer()
+            if sync:
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._buffered:
+            if self._closed:
+                return
+            self._closed = True
+            self._buffered.notify()
+        self._writer.join()
+        with self._io:
+            self._file.close()
+
+    def _load_summaries(self):
+        """ The compacted summaries, and the sequence number of the last answer in them """
+        try:
+            with open(self.summary_path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return {}, -1
+        return {item: ItemSummary(*s) for item, s in saved['items'].items()}, saved['through']
+
+    def _last_seq(self):
+        """ The sequence number of the last answer written, compacted or not """
+        last = self._load_summaries()[1]
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for _, seq, _ in _records(f):
+                    last = max(last, seq)
+        return last
+
+    def summaries(self):
+        """ A summary of every item's answers, compacted and still in the log """
+        self.flush()
+        summaries, through = self._load_summaries()
+        with open(self.path, 'rb') as f:
+            for answer, seq, _ in _records(f):
+                if seq > through:
+                    _fold(summaries, answer)
+        return summaries
+
+    def compact(self, before=None):
+        """ Fold the oldest answers in the log into the summaries, up to the first
+        answered at or after the time before (default all), and rewrite the log with
+        the rest.  The summaries are saved first with the sequence number of the
+        last answer folded, so answers left behind in the log by a crash between the
+        two writes are not counted twice, and answers written late or back-dated are
+        never skipped.  Returns the number folded """
+        before = time.time() if before is None else before
+        with self._io:
+            self._write_buffer()
+            summaries, through = self._load_summaries()
+            keep = bytearray()
+            folded = 0
+            with open(self.path, 'rb') as f:
+                for answer, seq, record in _records(f):
+                    if seq <= through:
+                        continue
+                    if not keep and answer.time < before:
+                        _fold(summaries, answer)
+                        folded += 1
+                        through = seq
+                    else:
+                        keep += record
+            saved = {'through': through, 'items': {item: list(s) for item, s in summaries.items()}}
+            _replace(self.summary_path, json.dumps(saved, ensure_ascii=False), 'w')
+            self._file.close()
+            _replace(self.path, keep)
+            self._file = open(self.path, 'ab')
+        return folded
+
+    def compact_in_background(self, before=None):
+        """ Compact on another thread, returning a Future of the number folded.  Answers
+        recorded meanwhile are buffered as usual """
+        future = Future()
+
+        def run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.compact(before))
+                except Exception as e:
+                    future.set_exception(e)
+
+        threading.Thread(target=run, name='answer-log-compact', daemon=True).start()
+        return future
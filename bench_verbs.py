@@ -0,0 +1,87 @@
+"""
+Benchmark of eager Verb, LazyVerb and VerbTable construction for a large synthetic lexicon
+"""
+import random
+import tracemalloc
+from time import perf_counter
+
+from japanese import Verb, LazyVerb, Vt, hiragana, variable_endings
+from verb_table import VerbTable
+
+
+def synthetic_verbs(n, seed=1):
+    """ (plain, meaning, type) triples for n made up verbs built from the hiragana table
+    >>> synthetic_verbs(2)
+    [('つける', 'verb0', <Vt.REGULAR: 1>), ('ぱどる', 'verb1', <Vt.REGULAR: 1>)]
+    """
+    rng = random.Random(seed)
+    kana = [c for line in hiragana for c in line if c != u' ']
+    result = []
+    for i in range(n):
+        stem = rng.choice(kana) + rng.choice(kana)
+        if rng.random() < 0.5:
+            result.append((stem + u'る', 'verb' + str(i), Vt.REGULAR))
+        else:
+            result.append((stem + rng.choice(variable_endings), 'verb' + str(i), Vt.VARIABLE))
+    return result
+
+
+def time_construction(verb_class, entries):
+    """ Seconds and peak traced bytes to construct a verb_class for every entry.
+    Memory is measured in a second pass so tracing does not distort the timing """
+    start = perf_counter()
+    verbs = [verb_class(plain, meaning, vtype) for plain, meaning, vtype in entries]
+    elapsed = perf_counter() - start
+    del verbs
+
+    tracemalloc.start()
+    verbs = [verb_class(plain, meaning, vtype) for plain, meaning, vtype in entries]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del verbs
+    return elapsed, peak
+
+
+def time_table(entries):
+    """ Seconds and peak traced bytes to load every entry into a VerbTable, measured
+    like time_construction """
+    start = perf_counter()
+    table = VerbTable(entries)
+    elapsed = perf_counter() - start
+    del table
+
+    tracemalloc.start()
+    table = VerbTable(entries)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del table
+    return elapsed, peak
+
+
+def run_table(n=500000):
+    entries = synthetic_verbs(n)
+    print(f'Storing {n} verbs')
+    elapsed, verb_memory = time_construction(Verb, entries)
+    print(f'{"Verb":10s} {elapsed:8.3f} s {verb_memory / 2 ** 20:8.1f} MiB')
+    elapsed, table_memory = time_table(entries)
+    print(f'{"VerbTable":10s} {elapsed:8.3f} s {table_memory / 2 ** 20:8.1f} MiB')
+    print(f'VerbTable holds them in {table_memory / verb_memory:.0%} of the memory')
+
+
+def run(n=100000):
+    entries = synthetic_verbs(n)
+    print(f'Constructing {n} verbs')
+    results = {}
+    for verb_class in (Verb, LazyVerb):
+        elapsed, peak = time_construction(verb_class, entries)
+        results[verb_class.__name__] = elapsed, peak
+        print(f'{verb_class.__name__:10s} {elapsed:8.3f} s {peak / 2 ** 20:8.1f} MiB')
+    (eager_t, eager_m), (lazy_t, lazy_m) = results['Verb'], results['LazyVerb']
+    print(f'Lazy takes {lazy_t / eager_t:.0%} of the time and {lazy_m / eager_m:.0%} of the memory')
+    return results
+
+
+if __name__ == '__main__':
+    run()
+    print()
+    run_table()
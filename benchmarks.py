@@ -0,0 +1,220 @@
+"""
+Benchmarks of the hot paths: building Verbs and the Dictionary, conjugating,
+laying out table rows and building sentences.  Each runs on synthetic lexicons
+of several sizes made from the hiragana table, and reports operations per
+second, per operation percentiles and peak traced memory.  Results can be saved
+as JSON and compared against the committed baseline in bench_baseline.json
+
+    python benchmarks.py --json results.json
+    python benchmarks.py --update-baseline
+"""
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+from time import perf_counter
+
+import sentences
+from bench_verbs import synthetic_verbs
+from japanese import Verb, Noun, Vt, hiragana
+from dictionary import Dictionary, LazyDictionary
+from print_verb_table import UFormat
+
+default_sizes = (100, 1000, 10000)
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+# Percentiles reported for the time of one operation
+percentiles = (50, 90, 99)
+
+# The Vt constants of each conjugation the conjugate benchmark asks for
+conjugation_args = ((Vt.PLAIN,), (Vt.POLITE,), (Vt.TE,), (Vt.NEG,), (Vt.PAST,), (Vt.POLITE, Vt.PAST, Vt.NEG),
+                    (Vt.VOLITIONAL,), (Vt.ENG, Vt.PAST))
+
+# A benchmark prepares its data for a lexicon size, giving the operation to time
+# and the items to apply it to.  Its peak memory is for applying the operation to
+# every item, keeping the results if keep is true, or else for a single item
+Benchmark = namedtuple('Benchmark', 'name prepare keep')
+
+
+def synthetic_nouns(n, seed=1):
+    """ n made up Nouns of two to four hiragana
+    >>> [(noun.jap, noun.eng) for noun in synthetic_nouns(2)]
+    [('けむ', 'noun0'), ('ぱど', 'noun1')]
+    """
+    rng = random.Random(seed)
+    kana = [c for line in hiragana for c in line if c != u' ']
+    return [Noun(''.join(rng.choice(kana) for _ in range(rng.randint(2, 4))), 'noun' + str(i)) for i in range(n)]
+
+
+def synthetic_dictionary_class(n, seed=1):
+    """ A Dictionary whose lexicon is n synthetic verbs and n synthetic nouns """
+    verbs = synthetic_verbs(n, seed)
+    nouns = synthetic_nouns(n, seed)
+    return type('SyntheticDictionary', (Dictionary,),
+                {'_verbs': staticmethod(lambda: verbs), '_nouns': staticmethod(lambda: nouns)})
+
+
+@contextmanager
+def using_dictionary(dictionary):
+    """ Point the sentences module at another dictionary for a while """
+    saved = sentences.sdict
+    sentences.sdict = LazyDictionary(lambda: dictionary)
+    try:
+        yield
+    finally:
+        sentences.sdict = saved
+
+
+def _verb_init(n):
+    return lambda entry: Verb(*entry), synthetic_verbs(n)
+
+
+def _dictionary_init(n):
+    cls = synthetic_dictionary_class(n)
+    return lambda _: cls(), range(max(10, 30000 // (n + 100)))
+
+
+def _conjugate(n):
+    verbs = [Verb(*entry) for entry in synthetic_verbs(n)]
+    return lambda pair: pair[0].conjugate(*pair[1]), [(v, args) for v in verbs for args in conjugation_args]
+
+
+def _format_uwords(n):
+    verbs = [Verb(*entry) for entry in synthetic_verbs(n)]
+    rows = [[v.meaning, v.masu, v.te, v.plain, v.nai, v.ta, v.nakata] for v in verbs]
+    return lambda row: UFormat.format_uwords(row, 12), rows
+
+
+def _basic_sen(n):
+    dictionary = synthetic_dictionary_class(n)()
+    rng = random.Random(n)
+    nouns = list(dictionary.eng_noun_dict)
+    verbs = list(dictionary.eng_verb_dict)
+    pronouns = list(dictionary.eng_pronoun_dict)
+    items = [(rng.choice(pronouns), rng.choice(nouns), rng.choice(verbs), rng.choice(pronouns + [None]))
+             + rng.choice(conjugation_args[:-1]) for _ in range(n)]
+
+    def basic_sen(args):
+        return sentences.basic_sen(*args)
+
+    basic_sen.dictionary = dictionary
+    return basic_sen, items
+
+
+benchmarks = (Benchmark('Verb', _verb_init, True), Benchmark('Dictionary.__init__', _dictionary_init, False),
+              Benchmark('Verb.conjugate', _conjugate, True), Benchmark('UFormat.format_uwords', _format_uwords, True),
+              Benchmark('basic_sen', _basic_sen, True))
+
+
+def _percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+def measure(benchmark, n, repeat=3):
+    """ Time a benchmark at lexicon size n.  Every operation is timed on its own,
+    repeat times over, for the percentiles; samples says how many there were.
+    Memory is measured in a separate pass, so tracing does not distort the timing """
+    op, items = benchmark.prepare(n)
+    items = list(items)
+    dictionary = getattr(op, 'dictionary', None)
+
+    with using_dictionary(dictionary) if dictionary is not None else _nothing():
+        per_op = []
+        for _ in range(repeat):
+            for item in items:
+                start = perf_counter()
+                op(item)
+                per_op.append(perf_counter() - start)
+
+        tracemalloc.start()
+        results = [op(item) for item in (items if benchmark.keep else items[:1])]
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del results
+
+    result = {'ops_per_sec': len(per_op) / sum(per_op), 'peak_bytes': peak, 'samples': len(per_op)}
+    per_op.sort()
+    for p in percentiles:
+        result[f'p{p}_us'] = _percentile(per_op, p) * 1e6
+    return result
+
+
+@contextmanager
+def _nothing():
+    yield
+
+
+def run(sizes=default_sizes, names=None, repeat=3, out=sys.stdout):
+    """ Measure every benchmark, or those named, at each size """
+    results = {}
+    for benchmark in benchmarks:
+        if names and benchmark.name not in names:
+            continue
+        for n in sizes:
+            r = results.setdefault(benchmark.name, {})[str(n)] = measure(benchmark, n, repeat)
+            if out is not None:
+                print(f'{benchmark.name:22s} {n:7d} {r["ops_per_sec"]:12.0f} ops/s  ' +
+                      '  '.join(f'p{p} {r[f"p{p}_us"]:9.2f} us' for p in percentiles) +
+                      f'  {r["peak_bytes"] / 2 ** 20:8.2f} MiB', file=out)
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+
+
+def compare(report, baseline, threshold=0.25):
+    """ (benchmark, size, metric, baseline, now) for each result more than threshold
+    slower, or using more than threshold more memory, than the baseline
+    >>> old = {'results': {'Verb': {'100': {'ops_per_sec': 1000.0, 'peak_bytes': 100}}}}
+    >>> new = {'results': {'Verb': {'100': {'ops_per_sec': 700.0, 'peak_bytes': 110}}}}
+    >>> compare(new, old)
+    [('Verb', '100', 'ops_per_sec', 1000.0, 700.0)]
+    """
+    regressions = []
+    for name, sizes in report['results'].items():
+        for n, now in sizes.items():
+            then = baseline['results'].get(name, {}).get(n)
+            if then is None:
+                continue
+            if now['ops_per_sec'] < then['ops_per_sec'] * (1 - threshold):
+                regressions.append((name, n, 'ops_per_sec', then['ops_per_sec'], now['ops_per_sec']))
+            if now['peak_bytes'] > then['peak_bytes'] * (1 + threshold):
+                regressions.append((name, n, 'peak_bytes', then['peak_bytes'], now['peak_bytes']))
+    return regressions
+
+
+def save(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths against a baseline')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes, help='lexicon sizes')
+    parser.add_argument('--only', nargs='+', help='names of the benchmarks to run')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='file to write the results to')
+    parser.add_argument('--baseline', default=default_baseline)
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed fractional regression')
+    parser.add_argument('--update-baseline', action='store_true', help='save the results as the baseline')
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.only, args.repeat)
+    if args.json:
+        save(report, args.json)
+    if args.update_baseline:
+        save(report, args.baseline)
+    else:
+        regressions = compare(report, load(args.baseline), args.threshold)
+        for name, n, metric, then, now in regressions:
+            print(f'Regression: {name} at {n}: {metric} {then:.0f} -> {now:.0f}')
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,61 @@
+"""
+Inverted index from conjugated surface forms back to the verbs and FormSpecs
+which produce them, for working out what a learner typed
+"""
+from japanese import canonical_specs
+
+
+def surface_key(s):
+    """ Surface forms are matched without spaces, so たべませんでした finds たべません でした
+    >>> surface_key('たべません でした')
+    'たべませんでした'
+    """
+    return s.replace(' ', '').replace('　', '')
+
+
+class ConjugationIndex(object):
+    """ Maps every form of every added verb to its (verb, FormSpec) pairs
+
+    >>> from japanese import Verb
+    >>> index = ConjugationIndex([Verb('たべる', 'eat')])
+    >>> [(v.plain, spec.form) for v, spec in index.lookup('たべなかった')]
+    [('たべる', 'nakata')]
+    """
+
+    def __init__(self, verbs=()):
+        self._forms = {}
+        self._verbs = 0
+        for v in verbs:
+            self.add(v)
+
+    def add(self, verb):
+        """ Index each form of one verb (or VerbSense) """
+        forms = self._forms
+        for spec in canonical_specs:
+            key = surface_key(spec.conjugate(verb))
+            pairs = forms.get(key)
+            if pairs is None:
+                forms[key] = [(verb, spec)]
+            else:
+                pairs.append((verb, spec))
+        self._verbs += 1
+
+    def lookup(self, surface):
+        """ A new list of the (verb, FormSpec) pairs producing surface, empty if it is
+        not known """
+        return list(self._forms.get(surface_key(surface), ()))
+
+    def __contains__(self, surface):
+        return surface_key(surface) in self._forms
+
+    def __iter__(self):
+        """ Every distinct surface form, without spaces """
+        return iter(self._forms)
+
+    def __len__(self):
+        """ The number of distinct surface forms """
+        return len(self._forms)
+
+    @property
+    def verb_count(self):
+        return self._verbs
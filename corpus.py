@@ -0,0 +1,123 @@
+"""
+Builds drill sentence corpora on every core.  The subject × with × noun × verb
+combinations are cut into fixed size shards.  A worker process renders each shard
+into its own file, sampling with the shard's own seed, and the shard files are
+joined in order.  Shards do not depend on the number of workers, so a corpus is
+byte for byte the same however many cores build it
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from japanese import FormSpec, canonical_specs
+from dictionary import sdict
+from sentences import SentenceTemplate, eng_spec
+
+# Everything a worker needs to render any shard, as picklable words and Vt constants
+Plan = namedtuple('Plan', 'subjects with_ nouns verbs specs sample seed shard_size')
+
+
+def _words(words, everything):
+    return tuple(everything) if words is None else tuple(words)
+
+
+def corpus_plan(subjects=None, nouns=None, verbs=None, specs=canonical_specs, with_=(None,),
+                sample=None, seed=0, shard_size=2000):
+    """ A corpus of the same sentences as sentences.sentence_stream, with sampling done
+    per shard.  Words default to every word in the dictionary """
+    return Plan(_words(subjects, sdict.eng_pronoun_dict), _words(with_, sdict.eng_pronoun_dict),
+                _words(nouns, sdict.eng_noun_dict), _words(verbs, sdict.eng_verb_dict),
+                tuple(spec.flags for spec in specs), sample, seed, shard_size)
+
+
+def combination_count(plan):
+    """ The number of subject × with × noun × verb combinations """
+    return len(plan.subjects) * len(plan.with_) * len(plan.nouns) * len(plan.verbs)
+
+
+def shard_count(plan):
+    return -(-combination_count(plan) // plan.shard_size)
+
+
+def shard_seed(seed, shard):
+    """ The seed for one shard's sampling, which depends only on the corpus seed and the shard """
+    return f'{seed}:{shard}'
+
+
+def shard_sentences(plan, shard):
+    """ Yield (jap, eng) for one shard, in sentence_stream order """
+    pools = ([sdict.pronoun(w) if w else None for w in plan.subjects],
+             [sdict.pronoun(w) if w else None for w in plan.with_],
+             [sdict.noun(w) if w else None for w in plan.nouns],
+             [sdict.verb(w) for w in plan.verbs])
+    specs = [(spec, eng_spec(spec)) for spec in (FormSpec.of(*flags) for flags in plan.specs)]
+    rng = random.Random(shard_seed(plan.seed, shard)) if plan.sample is not None else None
+
+    start = shard * plan.shard_size
+    for i in range(start, min(start + plan.shard_size, combination_count(plan))):
+        # Decode the combination number, the last pool varying fastest as in itertools.product
+        entries = []
+        for pool in reversed(pools):
+            i, j = divmod(i, len(pool))
+            entries.append(pool[j])
+        verb, noun, other, subject = entries
+        template = SentenceTemplate(subject, noun, verb, other)
+        for spec, eng in specs:
+            if rng is not None and rng.random() >= plan.sample:
+                continue
+            yield template.render(spec, eng)
+
+
+def write_shard(plan, shard, directory):
+    """ Write one shard as tab separated lines, returning its path and sentence count """
+    path = os.path.join(directory, f'shard-{shard:06}.tsv')
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for jap, eng in shard_sentences(plan, shard):
+            f.write(f'{jap}\t{eng}\n')
+            count += 1
+    return path, count
+
+
+def build_corpus(path, plan, workers=None):
+    """ Render every shard of plan on a pool of worker processes and join them into
+    path, which is replaced atomically.  Returns the number of sentences """
+    workers = workers or os.cpu_count() or 1
+    shards = range(shard_count(plan))
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(prefix='corpus-', dir=directory) as shard_dir:
+        if workers == 1:
+            results = [write_shard(plan, shard, shard_dir) for shard in shards]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(write_shard, repeat(plan), shards, repeat(shard_dir)))
+
+        merged = os.path.join(shard_dir, 'corpus.tsv')
+        with open(merged, 'wb') as out:
+            for shard_path, _ in results:
+                with open(shard_path, 'rb') as f:
+                    shutil.copyfileobj(f, out)
+        os.replace(merged, path)
+    return sum(count for _, count in results)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build a corpus of drill sentences')
+    parser.add_argument('output', help='the tab separated file to write')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per core')
+    parser.add_argument('--sample', type=float, default=None, help='fraction of sentences to keep')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--shard-size', type=int, default=2000, help='combinations in each shard')
+    parser.add_argument('--with', dest='with_', action='store_true', help='add "with someone" to sentences')
+    args = parser.parse_args()
+    plan = corpus_plan(with_=None if args.with_ else (None,), sample=args.sample, seed=args.seed,
+                       shard_size=args.shard_size)
+    n = build_corpus(args.output, plan, args.workers)
+    print(n, 'sentences written to', args.output, file=sys.stderr)
@@ -0,0 +1,86 @@
+"""
+Rule based deinflection of verbs which are not in the Dictionary.  The rules are
+not written out by hand: they are found by conjugating a template verb for each
+verb type and ending with the same Verb rules, then compiled into a trie over
+reversed suffixes, so analysing a word walks back from its last character
+"""
+from collections import namedtuple
+
+from japanese import Verb, Vt, canonical_specs, irregular_forms, variable_endings
+from conjugation_index import surface_key
+
+# A possible analysis of a conjugated word: the plain form, its verb type and the FormSpec
+Candidate = namedtuple('Candidate', 'plain type spec')
+
+
+# Stand-in stem for the template verbs; the rules only look at the final characters
+_template_stem = u'あ'
+
+
+def _templates():
+    """ (stem, plain ending, type) for every template verb """
+    yield _template_stem, u'る', Vt.REGULAR
+    for ending in variable_endings:
+        yield _template_stem, ending, Vt.VARIABLE
+    # Whole word exceptions, which also cover compounds such as べんきょうする
+    yield u'', u'いく', Vt.VARIABLE
+    for plain in irregular_forms['masu']:
+        yield u'', plain, Vt.IREGULAR
+
+
+class Deinflector(object):
+    """ Finds candidate plain forms and FormSpecs for conjugated verbs
+
+    >>> d = Deinflector()
+    >>> [(c.plain, c.type, c.spec.form) for c in d.deinflect('はしらなかった')][:2]
+    [('はしる', <Vt.VARIABLE: 2>, 'nakata'), ('はしらる', <Vt.REGULAR: 1>, 'nakata')]
+    """
+
+    def __init__(self):
+        # Trie keyed by the suffix characters from last to first; '' holds the rules
+        # ending at that node, as (plain ending, type, spec, minimum stem length)
+        self._root = {}
+        self.max_suffix = 0
+        for stem, ending, vtype in _templates():
+            verb = Verb(stem + ending, '', vtype)
+            for spec in canonical_specs:
+                form = surface_key(spec.conjugate(verb))
+                assert form.startswith(stem)
+                self._add_rule(form[len(stem):], (ending, vtype, spec, len(stem)))
+
+    def _add_rule(self, suffix, rule):
+        node = self._root
+        for c in reversed(suffix):
+            node = node.setdefault(c, {})
+        node.setdefault('', []).append(rule)
+        self.max_suffix = max(self.max_suffix, len(suffix))
+
+    def deinflect(self, word, max_candidates=32):
+        """ Candidates for word, longest matching suffix first.  The search visits at
+        most max_suffix trie nodes and returns at most max_candidates candidates """
+        word = surface_key(word)
+        result = {}
+        node = self._root
+        for n in range(len(word) + 1):
+            for ending, vtype, spec, min_stem in reversed(node.get('', ())):
+                stem = word[:len(word) - n]
+                # No verb stem ends in a small っ, which only doubles the following kana
+                if len(stem) >= min_stem and not stem.endswith(u'っ'):
+                    result.setdefault(Candidate(stem + ending, vtype, spec), None)
+            if n == len(word):
+                break
+            node = node.get(word[-1 - n])
+            if node is None:
+                break
+        return list(reversed(result))[:max_candidates]
+
+    def deinflect_many(self, words, max_candidates=32):
+        """ Candidates for each of many words; repeated words are only analysed once """
+        seen = {}
+        result = []
+        for w in words:
+            candidates = seen.get(w)
+            if candidates is None:
+                candidates = seen[w] = self.deinflect(w, max_candidates)
+            result.append(candidates)
+        return result
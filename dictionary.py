@@ -1,37 +1,161 @@
-from japanese import Verb, Noun, Vt
+import threading
+
+import metrics
+from japanese import Verb, VerbRules, VerbSense, Noun, Vt
+from word_index import WordIndex, is_kana
+from conjugation_index import ConjugationIndex
+from fuzzy_index import BKTree
 
 
 class Dictionary(object):
     def __init__(self):
-        verblist = Dictionary._verbs()
-        self.jap_verb_dict = {v.plain: v for v in verblist}
-        self.eng_verb_dict = {v.meaning: v for v in verblist}
+        # One Verb per reading and conjugation class, shared by a VerbSense for each
+        # of its meanings.  Homophones such as かえる (return) and かえる (change)
+        # conjugate differently, so get a Verb each
+        verbs = {}
+        verblist = []
+        seen = set()
+        for entry in self._verbs():
+            plain, meaning = entry[:2]
+            if (plain, meaning) in seen:
+                continue
+            seen.add((plain, meaning))
+            key = (plain, VerbRules.infer_type(plain, *entry[2:]))
+            verb = verbs.get(key)
+            if verb is None:
+                verb = verbs[key] = Verb(*entry)
+            verblist.append(VerbSense(verb, meaning))
+
+        # The senses maps give every word with a key, the plain dicts the first of them
+        self.jap_verb_senses = Dictionary._senses(verblist, 'plain')
+        self.eng_verb_senses = Dictionary._senses(verblist, 'meaning')
+        self.jap_verb_dict = Dictionary._first_senses(self.jap_verb_senses)
+        self.eng_verb_dict = Dictionary._first_senses(self.eng_verb_senses)
+
+        nounlist = self._nouns()
+        self.jap_noun_senses = Dictionary._senses(nounlist, 'jap')
+        self.eng_noun_senses = Dictionary._senses(nounlist, 'meaning')
+        self.jap_noun_dict = Dictionary._first_senses(self.jap_noun_senses)
+        self.eng_noun_dict = Dictionary._first_senses(self.eng_noun_senses)
+
+        pronounlist = self._pronouns()
+        self.jap_pronoun_senses = Dictionary._senses(pronounlist, 'jap')
+        self.eng_pronoun_senses = Dictionary._senses(pronounlist, 'meaning')
+        self.jap_pronoun_dict = Dictionary._first_senses(self.jap_pronoun_senses)
+        self.eng_pronoun_dict = Dictionary._first_senses(self.eng_pronoun_senses)
+
+        self._verblist = verblist
+        self._nounlist = nounlist
+        self._pronounlist = pronounlist
+        self._conjugations = None
+        self._fuzzy = None
+        # Guards building the indexes above on first use
+        self._lock = threading.Lock()
+
+        # One index over every part of speech, for prefix and kana queries
+        self.index = WordIndex()
+        for pos, words in (('verb', verblist), ('noun', nounlist), ('pronoun', pronounlist)):
+            for w in words:
+                self.index.add(pos, w)
+
+    def words(self, pos):
+        """ Every word of a part of speech, 'verb', 'noun' or 'pronoun', in lexicon
+        order.  Verbs are given as a VerbSense for each meaning """
+        return {'verb': self._verblist, 'noun': self._nounlist, 'pronoun': self._pronounlist}[pos]
+
+    def lookup(self, w, pos=None):
+        """ Iterator over the IndexEntry objects for a Japanese or English word """
+        return self.index.exact(w, pos)
+
+    def complete(self, prefix, pos=None):
+        """ Iterator over the entries a partly typed answer could become.  Kana
+        prefixes match readings in either script, others match any key """
+        if prefix and is_kana(prefix[0]):
+            return self.index.kana_prefix(prefix, pos)
+        return self.index.prefix(prefix, pos)
+
+    @property
+    def conjugations(self):
+        """ ConjugationIndex of every verb sense, built once on first use """
+        conjugations = self._conjugations
+        if conjugations is None:
+            with self._lock:
+                if self._conjugations is None:
+                    self._conjugations = ConjugationIndex(self._verblist)
+                conjugations = self._conjugations
+        return conjugations
+
+    def deconjugate(self, surface):
+        """ The (verb, FormSpec) pairs for a conjugated verb, such as たべなかった """
+        return self.conjugations.lookup(surface)
+
+    @property
+    def fuzzy(self):
+        """ BKTree of every reading, meaning and conjugated form, built on first use """
+        if self._fuzzy is None:
+            fuzzy = BKTree()
+            for senses in (self.jap_verb_senses, self.eng_verb_senses, self.jap_noun_senses,
+                           self.eng_noun_senses, self.jap_pronoun_senses, self.eng_pronoun_senses,
+                           self.conjugations):
+                for key in senses:
+                    fuzzy.add(key)
+            self._fuzzy = fuzzy
+        return self._fuzzy
+
+    def suggest(self, w, k=3, max_distance=2):
+        """ The k known words or verb forms nearest to a mistyped w, as (distance, word) """
+        return self.fuzzy.search(w, max_distance, k)
 
-        nounlist = Dictionary._nouns()
-        self.jap_noun_dict = {n.jap: n for n in nounlist}
-        self.eng_noun_dict = {n.meaning: n for n in nounlist}
+    @staticmethod
+    def _senses(words, key):
+        """ Map the key attribute of each word to every word sharing it, in order """
+        result = {}
+        for w in words:
+            result.setdefault(getattr(w, key), []).append(w)
+        return result
+
+    @staticmethod
+    def _first_senses(senses):
+        return {k: words[0] for k, words in senses.items()}
 
-        pronounlist = Dictionary._pronouns()
-        self.jap_pronoun_dict = {n.jap: n for n in pronounlist}
-        self.eng_pronoun_dict = {n.meaning: n for n in pronounlist}
+    def verb_senses(self, w):
+        """ Every sense of a verb given its plain form or one of its english meanings """
+        return self.jap_verb_senses.get(w) or self.eng_verb_senses.get(w, [])
+
+    def noun_senses(self, w):
+        """ Every noun with the given japanese or english form """
+        return self.jap_noun_senses.get(w) or self.eng_noun_senses.get(w, [])
+
+    def pronoun_senses(self, w):
+        """ Every pronoun with the given japanese or english form """
+        return self.jap_pronoun_senses.get(w) or self.eng_pronoun_senses.get(w, [])
 
     def verb(self, w):
-        """ Find a verb given either its plain form or its english meaning """
+        """ Find a verb given either its plain form or its english meaning.  For
+        a plain form with several meanings this is the first listed sense """
+        if metrics.enabled:
+            metrics.count('dictionary_lookups_total', pos='verb')
         if w in self.jap_verb_dict.keys():
             return self.jap_verb_dict[w]
         elif w in self.eng_verb_dict.keys():
             return self.eng_verb_dict[w]
         else:
+            if metrics.enabled:
+                metrics.count('dictionary_misses_total', pos='verb')
             print('Verb', w, 'not found')
             assert False
 
     def noun(self, w):
         """ Find a noun given either its plain form or its english meaning """
+        if metrics.enabled:
+            metrics.count('dictionary_lookups_total', pos='noun')
         if w in self.jap_noun_dict.keys():
             return self.jap_noun_dict[w]
         elif w in self.eng_noun_dict.keys():
             return self.eng_noun_dict[w]
         else:
+            if metrics.enabled:
+                metrics.count('dictionary_misses_total', pos='noun')
             print('Noun', w, 'not found')
             assert False
 
@@ -39,85 +163,91 @@ class Dictionary(object):
         """ Find a pronoun given either its japanese or english meaning """
         if w is None:
             return None
-        elif w in self.jap_pronoun_dict.keys():
+        if metrics.enabled:
+            metrics.count('dictionary_lookups_total', pos='pronoun')
+        if w in self.jap_pronoun_dict.keys():
             return self.jap_pronoun_dict[w]
         elif w in self.eng_pronoun_dict.keys():
             return self.eng_pronoun_dict[w]
         else:
+            if metrics.enabled:
+                metrics.count('dictionary_misses_total', pos='pronoun')
             print('Pronoun', w, 'not found')
             assert False
 
     @staticmethod
     def _verbs():
+        """ (plain, meaning) or (plain, meaning, type) entries.  A verb with several
+        meanings is listed once per meaning """
         result = [
             # Variable verbs
-            Verb('あう', 'meet', Vt.VARIABLE),
-            Verb('あずかる', 'look after', Vt.VARIABLE),
-            Verb('ある', 'exist', Vt.VARIABLE),
-            Verb('あるく', 'walk', Vt.VARIABLE),
-            Verb('いう', 'say', Vt.VARIABLE),
-            Verb('いく', 'go', Vt.VARIABLE),
-            Verb('いただく', 'accept', Vt.VARIABLE),
-            Verb('うる', 'sell', Vt.VARIABLE),
-            Verb('おく', 'put', Vt.VARIABLE),
-            Verb('おくる', 'send', Vt.VARIABLE),
-            Verb('おす', 'push', Vt.VARIABLE),
-            Verb('おわる', 'finish', Vt.VARIABLE),
-            Verb('かう', 'buy', Vt.VARIABLE),
-            Verb('かえる', 'return', Vt.VARIABLE),
-            Verb('かく', 'write', Vt.VARIABLE),
-            Verb('かす', 'lend', Vt.VARIABLE),
-            Verb('かつぐ', 'carry', Vt.VARIABLE),
-            Verb('がんばる', "do one's best", Vt.VARIABLE),
-            Verb('きく', 'listen', Vt.VARIABLE),
-            Verb('けす', 'turn off', Vt.VARIABLE),
-            Verb('こむ', 'be crowded', Vt.VARIABLE),
-            Verb('しる', 'know', Vt.VARIABLE),
-            Verb('すう', 'smoke', Vt.VARIABLE),
-            Verb('すむ', 'live', Vt.VARIABLE),
-            Verb('たつ', 'stand up', Vt.VARIABLE),
-            Verb('ちがう', 'be wrong', Vt.VARIABLE),
-            Verb('つかう', 'use', Vt.VARIABLE),
-            Verb('つく', 'arrive', Vt.VARIABLE),
-            Verb('つくる', 'make', Vt.VARIABLE),
-            Verb('とる', 'take', Vt.VARIABLE),
-            Verb('ならる', 'learn', Vt.VARIABLE),
-            Verb('にあう', 'look good on', Vt.VARIABLE),
-            Verb('のむ', 'drink', Vt.VARIABLE),
-            Verb('のる', 'get on', Vt.VARIABLE),
-            Verb('はいる', 'enter', Vt.VARIABLE),
-            Verb('まがる', 'turn', Vt.VARIABLE),
-            Verb('まつ', 'wait', Vt.VARIABLE),
-            Verb('もつ', 'hold', Vt.VARIABLE),
-            Verb('もらう', 'receive', Vt.VARIABLE),
-            Verb('よぶ', 'call', Vt.VARIABLE),
-            Verb('よむ', 'read', Vt.VARIABLE),
-            Verb('わかる', 'understand', Vt.VARIABLE),
+            ('あう', 'meet', Vt.VARIABLE),
+            ('あずかる', 'look after', Vt.VARIABLE),
+            ('ある', 'exist', Vt.VARIABLE),
+            ('あるく', 'walk', Vt.VARIABLE),
+            ('いう', 'say', Vt.VARIABLE),
+            ('いく', 'go', Vt.VARIABLE),
+            ('いただく', 'accept', Vt.VARIABLE),
+            ('うる', 'sell', Vt.VARIABLE),
+            ('おく', 'put', Vt.VARIABLE),
+            ('おくる', 'send', Vt.VARIABLE),
+            ('おす', 'push', Vt.VARIABLE),
+            ('おわる', 'finish', Vt.VARIABLE),
+            ('かう', 'buy', Vt.VARIABLE),
+            ('かえる', 'return', Vt.VARIABLE),
+            ('かく', 'write', Vt.VARIABLE),
+            ('かす', 'lend', Vt.VARIABLE),
+            ('かつぐ', 'carry', Vt.VARIABLE),
+            ('がんばる', "do one's best", Vt.VARIABLE),
+            ('きく', 'listen', Vt.VARIABLE),
+            ('けす', 'turn off', Vt.VARIABLE),
+            ('こむ', 'be crowded', Vt.VARIABLE),
+            ('しる', 'know', Vt.VARIABLE),
+            ('すう', 'smoke', Vt.VARIABLE),
+            ('すむ', 'live', Vt.VARIABLE),
+            ('たつ', 'stand up', Vt.VARIABLE),
+            ('ちがう', 'be wrong', Vt.VARIABLE),
+            ('つかう', 'use', Vt.VARIABLE),
+            ('つく', 'arrive', Vt.VARIABLE),
+            ('つくる', 'make', Vt.VARIABLE),
+            ('とる', 'take', Vt.VARIABLE),
+            ('ならる', 'learn', Vt.VARIABLE),
+            ('にあう', 'look good on', Vt.VARIABLE),
+            ('のむ', 'drink', Vt.VARIABLE),
+            ('のる', 'get on', Vt.VARIABLE),
+            ('はいる', 'enter', Vt.VARIABLE),
+            ('まがる', 'turn', Vt.VARIABLE),
+            ('まつ', 'wait', Vt.VARIABLE),
+            ('もつ', 'hold', Vt.VARIABLE),
+            ('もらう', 'receive', Vt.VARIABLE),
+            ('よぶ', 'call', Vt.VARIABLE),
+            ('よむ', 'read', Vt.VARIABLE),
+            ('わかる', 'understand', Vt.VARIABLE),
 
             # Plain verbs
-            Verb('あける', 'open'),
-            Verb('あげる', 'give'),
-            Verb('いる', 'be'),
-            Verb('いれる', 'put in'),
-            Verb('おしえる', 'tell'),
-            Verb('おりる', 'get off'),
-            Verb('わすれる', 'forget'),
-            Verb('しめる', 'close'),
-            Verb('たべる', 'eat'),
-            Verb('つける', 'turn on'),
-            Verb('けす', 'turn off'),
-            Verb('つける', 'be careful'),
-            Verb('つとめる', 'work for'),
-            Verb('でる', 'leave'),
-            Verb('とどける', 'deliver'),
-            Verb('とめる', 'park'),
-            Verb('みせる', 'show'),
-            Verb('みる', 'see'),
-            Verb('みる', 'look'),
-            Verb('みる', 'watch'),
+            ('あける', 'open'),
+            ('あげる', 'give'),
+            ('いる', 'be'),
+            ('いれる', 'put in'),
+            ('おしえる', 'tell'),
+            ('おりる', 'get off'),
+            ('わすれる', 'forget'),
+            ('しめる', 'close'),
+            ('たべる', 'eat'),
+            ('つける', 'turn on'),
+            ('けす', 'turn off'),
+            ('つける', 'be careful'),
+            ('つとめる', 'work for'),
+            ('でる', 'leave'),
+            ('とどける', 'deliver'),
+            ('とめる', 'park'),
+            ('みせる', 'show'),
+            ('みる', 'see'),
+            ('みる', 'look'),
+            ('みる', 'watch'),
 
             # Irregular verbs
-            Verb('する', 'do')
+            ('する', 'do'),
         ]
         return result
 
@@ -188,5 +318,40 @@ class Dictionary(object):
         return result
 
 
+class LazyDictionary(object):
+    """ Stands in for a Dictionary which is only built on first use, so importing
+    this module is cheap.  Building is thread safe and happens once """
+
+    def __init__(self, factory=Dictionary):
+        self._factory = factory
+        self._dictionary = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """ The Dictionary, built now if this is the first use """
+        dictionary = self._dictionary
+        if dictionary is None:
+            with self._lock:
+                if self._dictionary is None:
+                    self._dictionary = self._factory()
+                dictionary = self._dictionary
+        return dictionary
+
+    @property
+    def built(self):
+        return self._dictionary is not None
+
+    def __getattr__(self, name):
+        # Private and special names are never forwarded: copy and pickle look them up
+        # on instances whose own attributes are not set yet
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __reduce__(self):
+        # Copies start unbuilt, as the lock cannot be copied
+        return LazyDictionary, (self._factory,)
+
+
 # A statically defined dictionary for everyone to use
-sdict = Dictionary()
+sdict = LazyDictionary()
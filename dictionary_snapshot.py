@@ -0,0 +1,300 @@
+"""
+A read-only snapshot of a built Dictionary in one flat binary buffer, for worker
+processes to share through multiprocessing.shared_memory or an mmap'd file.
+Every conjugated form and every lookup index is in the buffer.  A SnapshotDictionary
+reads entries straight out of it, so attaching costs a header read and the
+memory is shared however many workers attach.
+
+The layout, all little endian:
+
+    header      magic, version, then (offset, count) for each section
+    strings     every distinct string, UTF-8, referred to as (offset, length)
+    verbs       per verb sense: the string refs of its form_slots and meaning, and its type
+    nouns, pronouns   per word: the string refs of its japanese and meaning
+    indexes     per (part of speech, language) and for conjugated forms:
+                (key offset, key length, entry, form) records sorted by key
+"""
+import mmap
+import struct
+from bisect import bisect_left
+
+import metrics
+from japanese import Vt, VerbRules, Noun, canonical_specs, form_slots
+from conjugation_index import surface_key
+
+magic = b'NHDS'
+version = 1
+
+_sections = ('strings', 'verbs', 'nouns', 'pronouns', 'verb_jap', 'verb_eng', 'noun_jap', 'noun_eng',
+             'pronoun_jap', 'pronoun_eng', 'forms')
+_header = struct.Struct('<4sI' + 'II' * len(_sections))
+_verb_record = struct.Struct('<' + 'II' * (len(form_slots) + 1) + 'I')
+_noun_record = struct.Struct('<IIII')
+_index_record = struct.Struct('<IIII')
+
+# Index of the meaning's string ref in a verb record, after the form_slots
+_meaning_slot = len(form_slots)
+
+
+class _Writer(object):
+    """ Collects the sections of a snapshot """
+
+    def __init__(self):
+        self.strings = bytearray()
+        self._refs = {}
+
+    def ref(self, s):
+        """ (offset, length) of a string in the strings section, adding it once """
+        r = self._refs.get(s)
+        if r is None:
+            data = s.encode('utf-8')
+            r = self._refs[s] = (len(self.strings), len(data))
+            self.strings += data
+        return r
+
+    def index(self, keyed):
+        """ Sorted index records for (key, entry, form) triples.  Entries with the same
+        key keep their order, so the first sense is still found first """
+        rows = sorted(((key.encode('utf-8'), entry, form, key) for key, entry, form in keyed),
+                      key=lambda row: row[0])
+        return b''.join(_index_record.pack(*self.ref(key), entry, form) for _, entry, form, key in rows), len(rows)
+
+
+def snapshot_bytes(dictionary):
+    """ Serialize a built Dictionary """
+    writer = _Writer()
+    verbs = dictionary.words('verb')
+    nouns = dictionary.words('noun')
+    pronouns = dictionary.words('pronoun')
+
+    verb_data = b''.join(
+        _verb_record.pack(*[n for s in [v.form(i) for i in range(len(form_slots))] + [v.meaning]
+                            for n in writer.ref(s)], v.type.value)
+        for v in verbs)
+    noun_data = [b''.join(_noun_record.pack(*writer.ref(w.jap), *writer.ref(w.meaning)) for w in words)
+                 for words in (nouns, pronouns)]
+
+    indexes = [writer.index((v.plain, i, 0) for i, v in enumerate(verbs)),
+               writer.index((v.meaning, i, 0) for i, v in enumerate(verbs))]
+    for words in (nouns, pronouns):
+        indexes.append(writer.index((w.jap, i, 0) for i, w in enumerate(words)))
+        indexes.append(writer.index((w.meaning, i, 0) for i, w in enumerate(words)))
+    indexes.append(writer.index((surface_key(spec.conjugate(v)), i, form)
+                                for i, v in enumerate(verbs) for form, spec in enumerate(canonical_specs)))
+
+    sections = [(bytes(writer.strings), len(writer.strings)), (verb_data, len(verbs)),
+                (noun_data[0], len(nouns)), (noun_data[1], len(pronouns))] + indexes
+    offset = _header.size
+    places = []
+    for data, count in sections:
+        places += [offset, count]
+        offset += len(data)
+    return _header.pack(magic, version, *places) + b''.join(data for data, _ in sections)
+
+
+class SnapshotVerb(VerbRules):
+    """ A verb sense read from a snapshot, which looks like a Verb """
+
+    __slots__ = ('_snapshot', '_entry')
+
+    def __init__(self, snapshot, entry):
+        self._snapshot = snapshot
+        self._entry = entry
+
+    def form(self, index):
+        return self._snapshot._verb_string(self._entry, index)
+
+    @property
+    def meaning(self):
+        return self._snapshot._verb_string(self._entry, _meaning_slot)
+
+    @property
+    def type(self):
+        return Vt(self._snapshot._verb_type(self._entry))
+
+    def __repr__(self):
+        return f'SnapshotVerb({self.plain!r}, {self.meaning!r})'
+
+
+def _form_property(index):
+    return property(lambda self: self.form(index))
+
+
+for _index, _name in enumerate(form_slots):
+    setattr(SnapshotVerb, _name, _form_property(_index))
+del _index, _name
+
+
+class _IndexKeys(object):
+    """ The keys of an index section as a sequence, for bisect """
+
+    __slots__ = ('buf', 'strings', 'start', 'count')
+
+    def __init__(self, buf, strings, start, count):
+        self.buf = buf
+        self.strings = strings
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        offset, length = _index_record.unpack_from(self.buf, self.start + i * _index_record.size)[:2]
+        offset += self.strings
+        return bytes(self.buf[offset:offset + length])
+
+
+class SnapshotDictionary(object):
+    """ Dictionary lookups read from a snapshot buffer, without unpacking it
+
+    >>> from dictionary import sdict
+    >>> snapshot = SnapshotDictionary(snapshot_bytes(sdict.get()))
+    >>> snapshot.verb('drink').conjugate(Vt.POLITE, Vt.PAST)
+    'のみました'
+    >>> [(v.meaning, spec.form) for v, spec in snapshot.deconjugate('たべなかった')]
+    [('eat', 'nakata')]
+    """
+
+    def __init__(self, buffer, owner=None):
+        """ buffer is anything supporting the buffer protocol.  owner, such as a
+        SharedMemory or mmap, is kept open for as long as the snapshot is """
+        self._buf = memoryview(buffer)
+        self._owner = owner
+        fields = _header.unpack_from(self._buf)
+        assert fields[0] == magic, "Not a dictionary snapshot"
+        assert fields[1] == version, f"Snapshot version {fields[1]} is not {version}"
+        self._sections = {name: (fields[2 + 2 * i], fields[3 + 2 * i]) for i, name in enumerate(_sections)}
+        self._strings = self._sections['strings'][0]
+        self._verbs = self._sections['verbs'][0]
+
+    def close(self):
+        """ Release the buffer; entries already looked up can no longer be read """
+        self._buf.release()
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _string(self, offset, length):
+        start = self._strings + offset
+        return str(self._buf[start:start + length], 'utf-8')
+
+    def _verb_string(self, entry, slot):
+        return self._string(*struct.unpack_from('<II', self._buf, self._verbs + entry * _verb_record.size + 8 * slot))
+
+    def _verb_type(self, entry):
+        return struct.unpack_from('<I', self._buf, self._verbs + (entry + 1) * _verb_record.size - 4)[0]
+
+    def _noun(self, section, entry):
+        jap_offset, jap_length, eng_offset, eng_length = _noun_record.unpack_from(
+            self._buf, self._sections[section][0] + entry * _noun_record.size)
+        return Noun(self._string(jap_offset, jap_length), self._string(eng_offset, eng_length))
+
+    def _search(self, index, key):
+        """ (entry, form) of every record in an index with the given key """
+        start, count = self._sections[index]
+        keys = _IndexKeys(self._buf, self._strings, start, count)
+        target = key.encode('utf-8')
+        i = bisect_left(keys, target)
+        found = []
+        while i < count and keys[i] == target:
+            found.append(_index_record.unpack_from(self._buf, start + i * _index_record.size)[2:])
+            i += 1
+        return found
+
+    def _entries(self, pos, w):
+        found = self._search(pos + '_jap', w) or self._search(pos + '_eng', w)
+        if pos == 'verb':
+            return [SnapshotVerb(self, entry) for entry, _ in found]
+        return [self._noun(pos + 's', entry) for entry, _ in found]
+
+    def verb_senses(self, w):
+        """ Every verb sense with the given plain form or english meaning """
+        return self._entries('verb', w)
+
+    def noun_senses(self, w):
+        return self._entries('noun', w)
+
+    def pronoun_senses(self, w):
+        return self._entries('pronoun', w)
+
+    def _first(self, pos, w):
+        """ The first sense of a word, counted as a lookup in the metrics """
+        if metrics.enabled:
+            metrics.count('dictionary_lookups_total', pos=pos)
+        senses = self._entries(pos, w)
+        if not senses:
+            if metrics.enabled:
+                metrics.count('dictionary_misses_total', pos=pos)
+            raise KeyError(f'{pos.capitalize()} {w!r} not found')
+        return senses[0]
+
+    def verb(self, w):
+        """ The first sense of a verb, as Dictionary.verb.  KeyError if there is none """
+        return self._first('verb', w)
+
+    def noun(self, w):
+        return self._first('noun', w)
+
+    def pronoun(self, w):
+        if w is None:
+            return None
+        return self._first('pronoun', w)
+
+    def deconjugate(self, surface):
+        """ The (verb, FormSpec) pairs for a conjugated verb, as Dictionary.deconjugate """
+        return [(SnapshotVerb(self, entry), canonical_specs[form])
+                for entry, form in self._search('forms', surface_key(surface))]
+
+    def count(self, section):
+        """ The number of records in a section, such as 'verbs' or 'forms' """
+        return self._sections[section][1]
+
+
+def save_snapshot(dictionary, path):
+    with open(path, 'wb') as f:
+        f.write(snapshot_bytes(dictionary))
+
+
+def open_snapshot(path):
+    """ Map a saved snapshot read-only; pages are shared with every process mapping it """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return SnapshotDictionary(mapped, mapped)
+
+
+def share_snapshot(dictionary, name=None):
+    """ Copy a snapshot into a new SharedMemory block, which the caller should
+    close and unlink once the workers are done with it """
+    from multiprocessing import shared_memory
+
+    data = snapshot_bytes(dictionary)
+    shm = shared_memory.SharedMemory(name, create=True, size=len(data))
+    shm.buf[:len(data)] = data
+    return shm
+
+
+def attach_snapshot(name):
+    """ Attach to a snapshot shared by share_snapshot, without copying it """
+    import multiprocessing
+    from multiprocessing import shared_memory
+
+    try:
+        shm = shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block with this process's
+        # resource tracker, which would remove it when the process exits.  Workers
+        # started by multiprocessing share their parent's tracker, so only
+        # unrelated processes need to undo that
+        shm = shared_memory.SharedMemory(name)
+        if multiprocessing.parent_process() is None:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, 'shared_memory')
+    return SnapshotDictionary(shm.buf, shm)
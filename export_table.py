@@ -0,0 +1,149 @@
+"""
+Streaming export of the verb conjugation table as fixed width text, CSV, JSON Lines
+or HTML.  Rows are generated one verb at a time and written to the sink in buffered
+chunks, so memory does not grow with the size of the lexicon.  The exception is
+sorting by a column, which holds every row's key and verb, or only max_n of them
+"""
+import csv
+import heapq
+import html
+import io
+import json
+import sys
+from itertools import chain, islice
+
+from japanese import FormSpec
+from dictionary import sdict
+from print_verb_table import UFormat, table_specs
+
+table_headings = ('Meaning', 'Masu', 'Te', 'Pres. Pos', 'Pres. Neg.', 'Past Pos.', 'Past Neg.')
+
+# The columns of print_verb_conjugation_table, as (heading, FormSpec) pairs
+default_columns = tuple(zip(table_headings, table_specs))
+
+formats = ('text', 'csv', 'jsonl', 'html')
+
+
+def spec_heading(spec):
+    """ A heading naming every constant of a spec, so no two specs share one
+    >>> from japanese import Vt
+    >>> spec_heading(FormSpec.of(Vt.ENG, Vt.PAST)), spec_heading(FormSpec.of())
+    ('past+eng', 'plain')
+    """
+    return '+'.join(t.name.lower() for t in spec.flags) or 'plain'
+
+
+def _column(column):
+    """ (heading, FormSpec) for a column given as a pair, a FormSpec or a tuple of Vt constants """
+    if isinstance(column, FormSpec):
+        return spec_heading(column), column
+    if len(column) == 2 and isinstance(column[0], str):
+        heading, spec = column
+        return heading, spec if isinstance(spec, FormSpec) else FormSpec.of(*spec)
+    spec = FormSpec.of(*column)
+    return spec_heading(spec), spec
+
+
+def conjugation_rows(verbs, specs):
+    """ Generator of one row of forms per verb """
+    for v in verbs:
+        yield [spec.conjugate(v) for spec in specs]
+
+
+def _text_lines(headings, rows, width=15):
+    yield UFormat.format_uwords(headings, width) + '\n'
+    yield UFormat.format_uwords(['-' * len(h) for h in headings], width) + '\n'
+    for row in rows:
+        yield UFormat.format_uwords(row, width) + '\n'
+
+
+def _csv_lines(headings, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in chain((headings,), rows):
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _jsonl_lines(headings, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headings, row)), ensure_ascii=False) + '\n'
+
+
+def _html_lines(headings, rows):
+    yield '<table>\n<thead>\n<tr>'
+    yield ''.join(f'<th>{html.escape(h)}</th>' for h in headings) + '</tr>\n</thead>\n<tbody>\n'
+    for row in rows:
+        yield '<tr>' + ''.join(f'<td>{html.escape(w)}</td>' for w in row) + '</tr>\n'
+    yield '</tbody>\n</table>\n'
+
+
+_writers = {'text': _text_lines, 'csv': _csv_lines, 'jsonl': _jsonl_lines, 'html': _html_lines}
+
+
+def export_table(sink, fmt='text', columns=default_columns, verbs=None, sort_by=None, max_n=None,
+                 chunk_lines=512):
+    """ Write the conjugation table to sink, any object with a write(str) method.
+
+    columns are (heading, FormSpec) pairs, FormSpecs or tuples of Vt constants.
+    verbs defaults to every verb sense in sdict.  sort_by is a column heading to order
+    rows by, or None to keep dictionary order.  Sorting holds all the verbs in memory,
+    or with max_n only the first max_n of them.  Lines are joined into chunks of
+    chunk_lines before each write.  Returns the number of rows written
+
+    >>> from japanese import Vt
+    >>> out = io.StringIO()
+    >>> export_table(out, 'csv', [('Plain', ()), ('Past', (Vt.PAST,))], max_n=2)
+    2
+    >>> print(out.getvalue(), end='')
+    Plain,Past
+    あう,あった
+    あずかる,あずかった
+    """
+    assert fmt in formats, f"Unknown format {fmt}"
+    columns = [_column(c) for c in columns]
+    headings = [h for h, _ in columns]
+    specs = [s for _, s in columns]
+    if len(set(headings)) < len(headings):
+        raise ValueError(f"Column headings must be unique, not {headings}")
+
+    if verbs is None:
+        verbs = sdict.eng_verb_dict.values()
+    if sort_by is not None:
+        if sort_by not in headings:
+            raise ValueError(f"Cannot sort by {sort_by!r}, which is not one of the columns {headings}")
+        key_spec = specs[headings.index(sort_by)]
+        if max_n is None:
+            verbs = sorted(verbs, key=key_spec.conjugate)
+        else:
+            verbs = heapq.nsmallest(max_n, verbs, key=key_spec.conjugate)
+    verbs = islice(verbs, max_n)
+
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    lines = _writers[fmt](headings, counted(conjugation_rows(verbs, specs)))
+    while True:
+        chunk = ''.join(islice(lines, chunk_lines))
+        if not chunk:
+            break
+        sink.write(chunk)
+    return count
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Export the verb conjugation table')
+    parser.add_argument('--format', choices=formats, default='text')
+    parser.add_argument('--sort', help='heading of the column to sort by')
+    parser.add_argument('--max', type=int, default=None, help='maximum number of verbs')
+    args = parser.parse_args()
+    export_table(sys.stdout, args.format, sort_by=args.sort, max_n=args.max)
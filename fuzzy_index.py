@@ -0,0 +1,101 @@
+"""
+Approximate matching of typed answers against known words, so a mistyped answer
+can be corrected.  Words are held in a BK-tree under edit distance: each child
+hangs off its parent by their distance, so the triangle inequality lets a query
+skip every subtree that cannot hold a match within the bound
+"""
+import heapq
+
+
+def edit_distance(a, b):
+    """ Levenshtein distance between two strings
+    >>> edit_distance('たべなっかた', 'たべなかった')
+    2
+    """
+    if a == b:
+        return 0
+    # Common prefixes and suffixes never add to the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class BKTree(object):
+    """ A BK-tree of strings under edit_distance
+
+    >>> tree = BKTree(['たべる', 'たべた', 'のむ'])
+    >>> tree.search('たべう', 1)
+    [(1, 'たべた'), (1, 'たべる')]
+    """
+
+    def __init__(self, words=()):
+        # Each node is [word, {distance: child node}]
+        self._root = None
+        self._size = 0
+        for w in words:
+            self.add(w)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, word):
+        """ Add a word, ignoring it if it is already in the tree """
+        if self._root is None:
+            self._root = [word, {}]
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            d = edit_distance(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [word, {}]
+                self._size += 1
+                return
+            node = child
+
+    def search(self, word, max_distance=2, k=None):
+        """ (distance, word) pairs within max_distance of word, nearest first, at most
+        k of them when k is given.  Once k matches are found the bound tightens to the
+        worst of them, pruning more of the tree """
+        if self._root is None:
+            return []
+        bound = max_distance
+        best = []   # heap of (-distance, word) holding the k nearest so far
+        found = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            d = edit_distance(word, node_word)
+            if d <= bound:
+                if k is None:
+                    found.append((d, node_word))
+                else:
+                    heapq.heappush(best, (-d, node_word))
+                    if len(best) > k:
+                        heapq.heappop(best)
+                    if len(best) == k:
+                        bound = -best[0][0]
+            for child_d, child in children.items():
+                if d - bound <= child_d <= d + bound:
+                    stack.append(child)
+        if k is not None:
+            found = [(-d, w) for d, w in best]
+        return sorted(found)
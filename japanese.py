@@ -1,6 +1,9 @@
 # coding: utf-8
 
 from enum import Enum
+from time import perf_counter
+
+import metrics
 
 
 hiragana = \
@@ -10,7 +13,7 @@ hiragana = \
         u"さしすせそ",
         u"たちつてと",
         u"なにぬねの",
-        u"はへふへほ",
+        u"はひふへほ",
         u"まみむめも",
         u"や ゆ よ",
         u"らりるれろ",
@@ -22,11 +25,54 @@ hiragana = \
         u"ぱぴぷぺぽ"]
 
 
+# Katakana sits at a fixed code point offset from hiragana, so the table is derived
+katakana = [u''.join(c if c == u' ' else chr(ord(c) + 0x60) for c in line) for line in hiragana]
+
+kana_lines = hiragana + katakana
+
+# Precomputed grid index, character -> (row in kana_lines, column)
+kana_grid = {
+    c: (row, col)
+    for row, line in enumerate(kana_lines)
+    for col, c in enumerate(line)
+    if c != u' '}
+
+# Shift tables, built once so the verb rules are single dict lookups
+_left_kana = {c: kana_lines[r][col - 1] for c, (r, col) in kana_grid.items() if col >= 1}
+_left_most_kana = {
+    c: {u'あ': u'わ', u'ア': u'ワ'}.get(kana_lines[r][0], kana_lines[r][0])
+    for c, (r, col) in kana_grid.items()}
+_right_most_kana = {c: kana_lines[r][-1] for c, (r, col) in kana_grid.items()}
+
+# Dakuten pairs: rows of unvoiced kana and their voiced rows (handakuten for は)
+_voicing_rows = ((1, 9), (2, 10), (3, 11), (5, 12))
+_half_voicing_rows = ((5, 13),)
+
+
+def _row_pairs(row_pairs):
+    result = {}
+    for offset in (0, len(hiragana)):
+        for plain_row, voiced_row in row_pairs:
+            for p, v in zip(kana_lines[plain_row + offset], kana_lines[voiced_row + offset]):
+                result[p] = v
+    return result
+
+
+dakuten = _row_pairs(_voicing_rows)
+handakuten = _row_pairs(_half_voicing_rows)
+seion = {v: p for p, v in dakuten.items()}
+seion.update({v: p for p, v in handakuten.items()})
+
+
 def find_kana_line(c):
-    for line in hiragana:
-        if c in line:
-            return line
-    assert False, "Character " + c + " not found"
+    """
+    >>> find_kana_line(u'ぬ')
+    'なにぬねの'
+    >>> find_kana_line(u'ヌ')
+    'ナニヌネノ'
+    """
+    assert c in kana_grid, "Character " + c + " not found"
+    return kana_lines[kana_grid[c][0]]
 
 
 def left_kana(c):
@@ -34,10 +80,9 @@ def left_kana(c):
     >>> left_kana(u'す')
     'し'
     """
-    line = find_kana_line(c)
-    ix = line.find(c)
-    assert ix >= 1
-    return line[ix - 1]
+    assert c in kana_grid, "Character " + c + " not found"
+    assert c in _left_kana
+    return _left_kana[c]
 
 
 def left_most_kana(c):
@@ -45,8 +90,8 @@ def left_most_kana(c):
     >>> left_most_kana(u'く')
     'か'
     """
-    line = find_kana_line(c)
-    return u'わ' if line[0] == u'あ' else line[0]
+    assert c in kana_grid, "Character " + c + " not found"
+    return _left_most_kana[c]
 
 
 def right_most_kana(c):
@@ -54,107 +99,258 @@ def right_most_kana(c):
     >>> right_most_kana(u'に')
     'の'
     """
-    line = find_kana_line(c)
-    return line[-1]
+    assert c in kana_grid, "Character " + c + " not found"
+    return _right_most_kana[c]
+
+
+def voiced_kana(c):
+    """ The dakuten form of c, or c itself when it has none
+    >>> voiced_kana(u'か')
+    'が'
+    """
+    return dakuten.get(c, c)
+
+
+def unvoiced_kana(c):
+    """ The plain (seion) form of a dakuten or handakuten kana
+    >>> unvoiced_kana(u'ぱ')
+    'は'
+    """
+    return seion.get(c, c)
 
 
 # noinspection SpellCheckingInspection
 class Vt(Enum):
-    REGULAR = 1,  # JFBP Regular 2, e.g. あべる
-    VARIABLE = 2,  # JFBP Regular 1, e.g. のむ、いく
-    IREGULAR = 3,  # くる、する、もって
+    REGULAR = 1  # JFBP Regular 2, e.g. あべる
+    VARIABLE = 2  # JFBP Regular 1, e.g. のむ、いく
+    IREGULAR = 3  # くる、する、もって
 
-    PRESENT = 4,
-    PAST = 5,
+    PRESENT = 4
+    PAST = 5
 
-    AFFIRM = 6,
-    NEG = 7,
+    AFFIRM = 6
+    NEG = 7
 
-    POLITE = 8,
-    PLAIN = 9,
+    POLITE = 8
+    PLAIN = 9
 
-    VOLITIONAL = 10,
-    TE = 11,
+    VOLITIONAL = 10
+    TE = 11
 
     ENG = 12
 
+    @property
+    def bit(self):
+        """ The flag for this constant in a FormSpec key """
+        return 1 << self.value
+
+
+# The conjugated forms every verb provides, in the order Verb builds them
+verb_forms = ('masu', 'te', 'nai', 'ou', 'masen', 'mashita', 'ta', 'masen_deshita', 'nakata', 'mashyo')
+
+# Every form of a verb, in the order of its fixed-size forms array
+form_slots = ('plain',) + verb_forms
+
+# Plain and polite forms indexed by [polite][past][negative]
+_form_table = \
+    (
+        (('plain', 'nai'), ('ta', 'nakata')),
+        (('masu', 'masen'), ('mashita', 'masen_deshita'))
+    )
+
+# Constants which may not appear together in one conjugation
+_exclusive_flags = ((Vt.PRESENT, Vt.PAST), (Vt.AFFIRM, Vt.NEG), (Vt.POLITE, Vt.PLAIN))
+_verb_type_flags = Vt.REGULAR.bit | Vt.VARIABLE.bit | Vt.IREGULAR.bit
+
+
+class FormSpec(object):
+    """ A conjugation compiled from Vt constants.  The constants are folded into an
+    integer key and validated once, then the spec gives the index of its form in a
+    verb's forms array.  Specs are cached, so FormSpec.of is a dict lookup after the
+    first call with the same constants
+
+    >>> spec = FormSpec.of(Vt.POLITE, Vt.PAST)
+    >>> spec.form, spec.index
+    ('mashita', 6)
+    >>> spec is FormSpec.of(Vt.PAST, Vt.POLITE)
+    True
+    >>> spec.conjugate(Verb(u'のむ', 'drink'))
+    'のみました'
+    """
 
-class Verb(object):
-    """ Models a single verb word, providing functionality to congigate
-    and translate """
-
-    def __init__(self, plain, meaning, vtype=None):
-        """"Construct a verb conjugation object given plain form and
-        english meaning.  The tyle flag is to override verb type for
-        variable verbs ending in る, otherwise type is inferred """
-        assert len(plain) >= 1
-        self.plain = plain
-        self.meaning = meaning
-
-        if vtype is None:
-            self.type = Vt.REGULAR if plain[-1] == u'る' else Vt.VARIABLE
-            if plain in (u'くる', u'する', u'もってくる'):
-                self.type = Vt.IREGULAR
+    __slots__ = ('key', 'flags', 'form', 'index', 'eng_suffix')
+
+    _by_args = {}
+    _by_key = {}
+
+    def __init__(self, key):
+        """ Build the spec for a key; use FormSpec.of to get the cached, validated spec """
+        self.key = key
+        self.flags = tuple(t for t in Vt if key & t.bit)
+        assert not key & _verb_type_flags, "Verb types are not conjugations"
+        for a, b in _exclusive_flags:
+            assert not (key & a.bit and key & b.bit), f"{a} and {b} conflict"
+
+        has = self.has
+        if has(Vt.ENG):
+            # English translations are not stored in the forms array
+            self.form = 'meaning'
+            self.index = None
+            self.eng_suffix = 'ed' if has(Vt.PAST) else ''
+            return
+        self.eng_suffix = None
+
+        if has(Vt.TE):
+            assert key == Vt.TE.bit, "The te form takes no other constants"
+            self.form = 'te'
+        elif has(Vt.VOLITIONAL):
+            assert not (has(Vt.PAST) or has(Vt.NEG)), "Volitional forms are present affirmative"
+            self.form = 'mashyo' if has(Vt.POLITE) else 'ou'
         else:
-            self.type = vtype
+            self.form = _form_table[has(Vt.POLITE)][has(Vt.PAST)][has(Vt.NEG)]
+        self.index = form_slots.index(self.form)
+
+    @staticmethod
+    def of(*args):
+        """ The compiled spec for some Vt constants, as passed to Verb.conjugate """
+        try:
+            return FormSpec._by_args[args]
+        except KeyError:
+            pass
+        key = 0
+        for a in args:
+            key |= a.bit
+        spec = FormSpec._by_key.get(key)
+        if spec is None:
+            spec = FormSpec._by_key[key] = FormSpec(key)
+        FormSpec._by_args[args] = spec
+        return spec
+
+    def has(self, t):
+        return bool(self.key & t.bit)
+
+    def conjugate(self, verb):
+        """ This form of the verb, a single indexed lookup for Japanese forms.  Every
+        way of conjugating comes through here, so this is where it is timed """
+        if metrics.enabled:
+            return self._timed_conjugate(verb)
+        if self.index is None:
+            return verb.meaning + self.eng_suffix
+        return verb.form(self.index)
+
+    def _timed_conjugate(self, verb):
+        start = perf_counter()
+        form = verb.meaning + self.eng_suffix if self.index is None else verb.form(self.index)
+        metrics.observe('verb_conjugate_seconds', perf_counter() - start)
+        return form
+
+    def __repr__(self):
+        return 'FormSpec(' + ', '.join(str(t) for t in self.flags) + ')'
+
+
+# One spec for each Japanese form, in form_slots order
+canonical_specs = tuple(
+    FormSpec.of(*args) for args in (
+        (Vt.PLAIN, Vt.PRESENT, Vt.AFFIRM), (Vt.POLITE, Vt.PRESENT, Vt.AFFIRM), (Vt.TE,),
+        (Vt.PLAIN, Vt.PRESENT, Vt.NEG), (Vt.VOLITIONAL, Vt.PLAIN), (Vt.POLITE, Vt.PRESENT, Vt.NEG),
+        (Vt.POLITE, Vt.PAST, Vt.AFFIRM), (Vt.PLAIN, Vt.PAST, Vt.AFFIRM), (Vt.POLITE, Vt.PAST, Vt.NEG),
+        (Vt.PLAIN, Vt.PAST, Vt.NEG), (Vt.VOLITIONAL, Vt.POLITE)))
+
+# te form for variable verbs is based on masu form, depends on the char preceding ます
+te_map = {
+    u'き': u'いて', u'ぎ': u'いで', u'し': u'して',
+    u'い': u'って', u'ち': u'って', u'り': u'って',
+    u'に': u'んで', u'み': u'んで', u'び': u'んで'}
+
+# Final characters the variable verb rules can conjugate, one for each te_map stem
+variable_endings = u'うくぐすつぬぶむる'
+
+irregular_forms = {
+    'masu': {u'くる': u'きます', u'する': u'します', u'もってくる': u'もってきます'},
+    'te': {u'くる': u'きて', u'する': u'して', u'もってくる': u'もってきて'},
+    'nai': {u'くる': u'こない', u'する': u'しない', u'もってくる': u'もってこない'},
+    'ou': {u'くる': u'こよう', u'する': u'しよう', u'もってくる': u'もってこよう'}}
+
+
+class VerbRules(object):
+    """ The conjugation rules shared by the eager Verb and the LazyVerb.  Each
+    form is built by a _make_<form> method from the forms it depends on, so the
+    rules work the same whether those are plain attributes or lazy ones """
+
+    __slots__ = ()
+
+    @staticmethod
+    def infer_type(plain, vtype=None):
+        """ The verb type, inferred from the plain form unless vtype overrides it """
+        assert len(plain) >= 1
+        if vtype is not None:
+            return vtype
+        if plain in irregular_forms['masu']:
+            return Vt.IREGULAR
+        return Vt.REGULAR if plain[-1] == u'る' else Vt.VARIABLE
 
+    def _make_masu(self):
         if self.type is Vt.REGULAR:
             # Regular 2 verbs masu form just removes る then ads ます
-            self.masu = plain[:-1] + u'ます'
-
-            # te form just replaces u'る' with u'て' (not right!)
-            self.te = plain[:-1] + u'て'
-
-            self.nai = plain[:-1] + u'ない'
-
-            self.ou = plain[:-1] + u'よう'
-
+            return self.plain[:-1] + u'ます'
         elif self.type is Vt.VARIABLE:
-            # variable verbs (Regular 1)
             # masu form moves the final char to left on the kana line then adds 'masu'
-            self.masu = plain[:-1] + left_kana(plain[-1]) + u"ます"
+            return self.plain[:-1] + left_kana(self.plain[-1]) + u"ます"
+        return irregular_forms['masu'][self.plain]
 
-            # te form is based on masu form, depnds on the char (c) preceding ます
-            te_map = {
-                u'き': u'いて', u'ぎ': u'いで', u'し': u'して',
-                u'い': u'って', u'ち': u'って', u'り': u'って',
-                u'に': u'んで', u'み': u'んで', u'び': u'んで'}
+    def _make_te(self):
+        if self.type is Vt.REGULAR:
+            # te form just replaces u'る' with u'て' (not right!)
+            return self.plain[:-1] + u'て'
+        elif self.type is Vt.VARIABLE:
             c = self.masu[-3]
-            if c not in te_map.keys():
+            if c not in te_map:
                 print('Te construction not known for character ' + c)
                 assert False
-            self.te = self.masu[:-3] + te_map[c] if plain != u'いく' else u'いって'
             # exception for いく (to go)
+            return self.masu[:-3] + te_map[c] if self.plain != u'いく' else u'いって'
+        return irregular_forms['te'][self.plain]
 
-            self.nai = self.masu[:-3] + left_most_kana(self.masu[-3]) + u'ない'
-            self.ou = self.plain[:-1] + right_most_kana(plain[-1]) + u'う'
+    def _make_nai(self):
+        if self.type is Vt.REGULAR:
+            return self.plain[:-1] + u'ない'
+        elif self.type is Vt.VARIABLE:
+            return self.masu[:-3] + left_most_kana(self.masu[-3]) + u'ない'
+        return irregular_forms['nai'][self.plain]
 
-        elif self.type is Vt.IREGULAR:
-            self.masu = {u'くる': u'きます', u'する': u'します', u'もってくる': u'もってきます'}[plain]
-            self.te = {u'くる': u'きて', u'する': u'して', u'もってくる': u'もってきて'}[plain]
-            self.nai = {u'くる': u'こない', u'する': u'しない', u'もってくる': u'もってこない'}[plain]
-            self.ou = {u'くる': u'こよう', u'する': u'しよう', u'もってくるよう': u'もってくよう'}[plain]
+    def _make_ou(self):
+        if self.type is Vt.REGULAR:
+            return self.plain[:-1] + u'よう'
+        elif self.type is Vt.VARIABLE:
+            return self.plain[:-1] + right_most_kana(self.plain[-1]) + u'う'
+        return irregular_forms['ou'][self.plain]
 
+    def _make_masen(self):
         # polite present negative replaces 'masu' with 'masen'
-        self.masen = self.masu[:-2] + 'ません'
+        return self.masu[:-2] + 'ません'
 
+    def _make_mashita(self):
         # the past polite is the mashita
-        self.mashita = self.masu[:-2] + 'ました'
+        return self.masu[:-2] + 'ました'
 
+    def _make_ta(self):
         # past plain is the 'ta' form, obtained from the te form
         c = self.te[-1]
         assert c in u'てで'
-        self.ta = self.te[:-1] + (u'た' if c == u'て' else u'だ')
+        return self.te[:-1] + (u'た' if c == u'て' else u'だ')
 
+    def _make_masen_deshita(self):
         # polite negative past tense uses 'masen' + 'deshita'
-        self.masen_deshita = self.masen + u' ' + u'でした'
+        return self.masen + u' ' + u'でした'
 
+    def _make_nakata(self):
         # plain negative past is based on the 'nai' form, replacing
         # the 'i' with 'katta'
-        self.nakata = self.nai[:-1] + u'かった'
+        return self.nai[:-1] + u'かった'
 
+    def _make_mashyo(self):
         # polite volitional
-        self.mashyo = self.masu[:-2] + u'ましょう'
+        return self.masu[:-2] + u'ましょう'
 
     @property
     def eng(self):
@@ -170,29 +366,11 @@ class Verb(object):
         >>> v.conjugate(Vt.POLITE, Vt.PAST, Vt.AFFIRM)
         'わかりました'
         """
-        if Vt.ENG in args:
-            if Vt.PAST in args:
-                return self.meaning + 'ed'
-            else:
-                return self.meaning
-
-        if Vt.TE in args:
-            assert len(args) == 1
-            return self.te
-
-        if Vt.VOLITIONAL in args:
-            if Vt.POLITE in args:
-                return self.mashyo
-            else:
-                return self.ou
-
-        result_table = \
-            [
-                [[self.plain, self.nai], [self.ta, self.nakata]],
-                [[self.masu, self.masen], [self.mashita, self.masen_deshita]]
-            ]
-        result = result_table[Vt.POLITE in args][Vt.PAST in args][Vt.NEG in args]
-        return result
+        return FormSpec.of(*args).conjugate(self)
+
+    def form(self, index):
+        """ The form at index in form_slots, see FormSpec.index """
+        return getattr(self, form_slots[index])
 
     def print_one_verb_congugations(self):
         for p in (Vt.PLAIN, Vt.POLITE):
@@ -205,6 +383,134 @@ class Verb(object):
         print()
 
 
+def conjugation_getter(*args):
+    """ Resolve the Vt constants of a conjugation, as passed to Verb.conjugate, into
+    a function returning that form of any verb
+    >>> conjugation_getter(Vt.POLITE, Vt.NEG)(Verb(u'のむ', 'drink'))
+    'のみません'
+    """
+    return FormSpec.of(*args).conjugate
+
+
+def conjugate_many(verbs, specs):
+    """ Conjugate every verb in every form.  specs is a sequence of FormSpecs or of
+    tuples of Vt constants, each resolved only once, and the result has a row per verb
+    >>> conjugate_many([Verb(u'たべる', 'eat'), Verb(u'かく', 'write')], [(Vt.TE,), (Vt.PAST, Vt.NEG)])
+    [['たべて', 'たべなかった'], ['かいて', 'かかなかった']]
+    """
+    getters = [(spec if isinstance(spec, FormSpec) else FormSpec.of(*spec)).conjugate for spec in specs]
+    return [[get(v) for get in getters] for v in verbs]
+
+
+class Verb(VerbRules):
+    """ Models a single verb word, providing functionality to congigate
+    and translate """
+
+    def __init__(self, plain, meaning, vtype=None):
+        """"Construct a verb conjugation object given plain form and
+        english meaning.  The tyle flag is to override verb type for
+        variable verbs ending in る, otherwise type is inferred """
+        start = perf_counter() if metrics.enabled else None
+        self.plain = plain
+        self.meaning = meaning
+        self.type = VerbRules.infer_type(plain, vtype)
+
+        # Build every form now, in dependency order
+        for form in verb_forms:
+            setattr(self, form, getattr(self, '_make_' + form)())
+        self.forms = tuple(getattr(self, form) for form in form_slots)
+        if start is not None:
+            metrics.observe('verb_construct_seconds', perf_counter() - start)
+
+    def form(self, index):
+        return self.forms[index]
+
+
+class _LazyForm(object):
+    """ Descriptor which builds a verb form on first access and caches it in a slot """
+
+    def __init__(self, form, slot):
+        self.make = getattr(VerbRules, '_make_' + form)
+        self.slot = slot
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return self.slot.__get__(obj, objtype)
+        except AttributeError:
+            value = self.make(obj)
+            self.slot.__set__(obj, value)
+            return value
+
+
+class LazyVerb(VerbRules):
+    """ A verb with the same interface as Verb, but each conjugated form is
+    only built on first access and the instance uses __slots__, so that large
+    lexicons are cheap to load.  Note that a verb the rules cannot conjugate
+    only fails when the offending form is first used
+
+    >>> v = LazyVerb(u'のむ', 'drink')
+    >>> v.ta
+    'のんだ'
+    >>> v.conjugate(Vt.POLITE, Vt.NEG)
+    'のみません'
+    """
+
+    __slots__ = ('plain', 'meaning', 'type') + tuple('_' + form for form in verb_forms)
+
+    def __init__(self, plain, meaning, vtype=None):
+        self.plain = plain
+        self.meaning = meaning
+        self.type = VerbRules.infer_type(plain, vtype)
+
+
+for _form in verb_forms:
+    setattr(LazyVerb, _form, _LazyForm(_form, LazyVerb.__dict__['_' + _form]))
+del _form
+
+
+class VerbSense(object):
+    """ One English meaning of a verb.  Verbs with several meanings, such as みる
+    (see, look, watch), have a sense for each, all sharing a single conjugation
+    object, so the forms are only built once
+
+    >>> see = Verb(u'みる', 'see')
+    >>> watch = VerbSense(see, 'watch')
+    >>> watch.conjugate(Vt.PAST), watch.conjugate(Vt.ENG)
+    ('みた', 'watch')
+    """
+
+    __slots__ = ('verb', 'meaning')
+
+    def __init__(self, verb, meaning):
+        self.verb = verb
+        self.meaning = meaning
+
+    def __getattr__(self, name):
+        # Forms, plain and type come from the shared verb.  While unpickling or
+        # copying the slots are not yet set, and must not be looked up on the verb
+        if name in VerbSense.__slots__ or name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.verb, name)
+
+    def __reduce__(self):
+        return VerbSense, (self.verb, self.meaning)
+
+    @property
+    def eng(self):
+        return self.meaning
+
+    def form(self, index):
+        return self.verb.form(index)
+
+    def conjugate(self, *args):
+        return FormSpec.of(*args).conjugate(self)
+
+    def __repr__(self):
+        return f'VerbSense({self.verb.plain!r}, {self.meaning!r})'
+
+
 class Noun(object):
     """ Japanese nouns, with english meaning.  """
 
@@ -0,0 +1,145 @@
+"""
+Optional counters and timing histograms for the hot paths.  Instrumentation is
+off unless enable() is called or the NIHONGO_METRICS environment variable is
+set to something other than 0, false or no.  Instrumented code checks
+metrics.enabled before doing anything else, so when it is off each call site
+costs one attribute lookup
+
+    if metrics.enabled:
+        metrics.count('dictionary_misses_total', pos='verb')
+"""
+import os
+import threading
+from bisect import bisect_left
+
+
+def _switched_on(value):
+    """ Whether an environment variable's value turns something on
+    >>> [_switched_on(v) for v in (None, '', '0', 'False', 'no', '1', 'yes')]
+    [False, False, False, False, False, True, True]
+    """
+    return (value or '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+enabled = _switched_on(os.environ.get('NIHONGO_METRICS'))
+
+# Upper bounds in seconds of the timing histogram buckets, as in Prometheus
+buckets = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+
+class Histogram(object):
+    """ Counts of observations at or below each bucket bound, with their sum """
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        """ {'count', 'sum', 'buckets'} where buckets gives the cumulative count at each bound """
+        cumulative = []
+        total = 0
+        for bound, n in zip(buckets + (float('inf'),), self.counts):
+            total += n
+            cumulative.append((bound, total))
+        return {'count': self.count, 'sum': self.sum, 'buckets': cumulative}
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+
+def count(name, n=1, **labels):
+    """ Add n to a counter """
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def observe(name, seconds, **labels):
+    """ Record a time in a histogram """
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+def metric_name(name, labels=()):
+    """ A metric with its labels, as written in the text format
+    >>> metric_name('dictionary_misses_total', (('pos', 'verb'),))
+    'dictionary_misses_total{pos="verb"}'
+    """
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+def stats():
+    """ A snapshot of every counter and histogram, keyed by metric_name
+
+    >>> reset(); enable()
+    >>> count('say_utterances_total', lang='ja-JP')
+    >>> stats()['counters']
+    {'say_utterances_total{lang="ja-JP"}': 1}
+    >>> disable(); reset()
+    """
+    with _lock:
+        return {'counters': {metric_name(*key): n for key, n in _counters.items()},
+                'histograms': {metric_name(*key): h.snapshot() for key, h in _histograms.items()}}
+
+
+def reset():
+    """ Clear every counter and histogram """
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _bound(bound):
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def prometheus_text():
+    """ Every metric in the Prometheus text exposition format """
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, h.snapshot()) for key, h in _histograms.items())
+    lines = []
+    typed = set()
+    for (name, labels), n in counters:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f'# TYPE {name} counter')
+        lines.append(f'{metric_name(name, labels)} {n}')
+    for (name, labels), snapshot in histograms:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f'# TYPE {name} histogram')
+        for bound, n in snapshot['buckets']:
+            lines.append(f'{metric_name(name + "_bucket", labels + (("le", _bound(bound)),))} {n}')
+        lines.append(f'{metric_name(name + "_sum", labels)} {snapshot["sum"]!r}')
+        lines.append(f'{metric_name(name + "_count", labels)} {snapshot["count"]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,152 @@
+"""
+Japanese readings of integers, in kana and in kanji, with the sound changes such
+as さんびゃく and ろっぴゃく.  Numbers are read in 4 digit 万 blocks; each block's
+reading is memoized, so reading many numbers mostly costs a few dict lookups
+"""
+import re
+
+digit_kana = ('', 'いち', 'に', 'さん', 'よん', 'ご', 'ろく', 'なな', 'はち', 'きゅう')
+digit_kanji = ('', '一', '二', '三', '四', '五', '六', '七', '八', '九')
+
+# Irregular readings of digit × 十, 百 and 千
+_tens_kana = {1: 'じゅう'}
+_hundreds_kana = {1: 'ひゃく', 3: 'さんびゃく', 6: 'ろっぴゃく', 8: 'はっぴゃく'}
+_thousands_kana = {1: 'せん', 3: 'さんぜん', 8: 'はっせん'}
+
+# The 万 units, in kana and kanji, for each 4 digit block from the lowest
+unit_kana = ('', 'まん', 'おく', 'ちょう', 'けい')
+unit_kanji = ('', '万', '億', '兆', '京')
+
+# Final sounds which double before the voiceless ちょう and けい units, by unit
+# number.  ろく and ひゃく (with びゃく and ぴゃく) only double before けい
+_geminate = {3: {'いち': 'いっ', 'はち': 'はっ', 'じゅう': 'じゅっ'},
+             4: {'いち': 'いっ', 'はち': 'はっ', 'じゅう': 'じゅっ', 'ろく': 'ろっ', 'ゃく': 'ゃっ'}}
+
+_block_kana = {}
+_block_kanji = {}
+
+
+def block_kana(n, unit=0):
+    """ Kana reading of 0 < n < 10000 followed by unit number unit, memoized
+    >>> block_kana(3600)
+    'さんぜんろっぴゃく'
+    >>> block_kana(1000, 1)
+    'いっせんまん'
+    """
+    key = (n, unit)
+    reading = _block_kana.get(key)
+    if reading is None:
+        thousands, hundreds, tens, ones = n // 1000, n // 100 % 10, n // 10 % 10, n % 10
+        parts = []
+        if thousands:
+            # A lone 千 in front of a unit is read いっせん, as in いっせんまん
+            if thousands == 1 and unit:
+                parts.append('いっせん')
+            else:
+                parts.append(_thousands_kana.get(thousands, digit_kana[thousands] + 'せん'))
+        if hundreds:
+            parts.append(_hundreds_kana.get(hundreds, digit_kana[hundreds] + 'ひゃく'))
+        if tens:
+            parts.append(_tens_kana.get(tens, digit_kana[tens] + 'じゅう'))
+        if ones:
+            parts.append(digit_kana[ones])
+        elif unit and n == 1:
+            parts.append('いち')
+        if unit in _geminate:
+            last = parts[-1]
+            for sound, doubled in _geminate[unit].items():
+                if last.endswith(sound):
+                    parts[-1] = last[:-len(sound)] + doubled
+                    break
+        reading = _block_kana[key] = ''.join(parts) + unit_kana[unit]
+    return reading
+
+
+def block_kanji(n, unit=0):
+    """ Kanji reading of 0 < n < 10000 followed by unit number unit, memoized
+    >>> block_kanji(3020)
+    '三千二十'
+    >>> block_kanji(1, 1)
+    '一万'
+    """
+    key = (n, unit)
+    reading = _block_kanji.get(key)
+    if reading is None:
+        parts = []
+        for value, name in ((1000, '千'), (100, '百'), (10, '十')):
+            d = n // value % 10
+            if d:
+                parts.append(('' if d == 1 else digit_kanji[d]) + name)
+        parts.append(digit_kanji[n % 10])
+        reading = ''.join(parts)
+        if reading == '' or (unit and n == 1):
+            reading = '一'
+        reading = _block_kanji[key] = reading + unit_kanji[unit]
+    return reading
+
+
+def _read(n, block, zero, minus):
+    assert isinstance(n, int), "Only integers can be read"
+    if n == 0:
+        return zero
+    if n < 0:
+        return minus + _read(-n, block, zero, minus)
+    assert n < 10000 ** len(unit_kana), f"{n} is too large to read"
+    parts = []
+    unit = 0
+    while n:
+        n, b = divmod(n, 10000)
+        if b:
+            parts.append(block(b, unit))
+        unit += 1
+    return ''.join(reversed(parts))
+
+
+def number_kana(n):
+    """ The kana reading of an integer
+    >>> number_kana(3520)
+    'さんぜんごひゃくにじゅう'
+    >>> number_kana(10000000)
+    'いっせんまん'
+    """
+    return _read(n, block_kana, 'ぜろ', 'マイナス')
+
+
+def number_kanji(n):
+    """ The kanji reading of an integer
+    >>> number_kanji(120000305)
+    '一億二千万三百五'
+    """
+    return _read(n, block_kanji, '〇', 'マイナス')
+
+
+def read_numbers(numbers, kanji=False):
+    """ Readings for many integers; any iterable of ints, including an array """
+    read = number_kanji if kanji else number_kana
+    return [read(int(n)) for n in numbers]
+
+
+# Alternative readings learners may type for parts of number_kana's readings
+_alternatives = (('なな', 'しち'), ('じゅっ', 'じっ'))
+
+
+def kana_pattern(n):
+    """ A compiled regular expression matching every accepted kana reading of n, where
+    each なな or じゅっ may independently be said the alternative way
+    >>> bool(kana_pattern(77).fullmatch('ななじゅうしち'))
+    True
+    """
+    pattern = re.escape(number_kana(n))
+    for usual, alternative in _alternatives:
+        pattern = pattern.replace(usual, f'(?:{usual}|{alternative})')
+    return re.compile(pattern)
+
+
+def check_answer(n, answer):
+    """ True if answer is n written in digits, kanji or kana.  Spaces and commas are
+    ignored, and しち for なな and じっ for じゅっ are accepted
+    >>> check_answer(4700, 'よんせんしちひゃく')
+    True
+    """
+    answer = answer.replace(' ', '').replace(',', '').replace('　', '')
+    return answer in (str(n), number_kanji(n)) or kana_pattern(n).fullmatch(answer) is not None
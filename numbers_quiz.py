@@ -1,34 +1,33 @@
 import random
-from say import say_jap_wait, say_eng_wait
+from say import say_jap_wait
+from quiz_pipeline import QuizItem, run_quiz
+from number_reading import number_kana
+from time_reading import time_kana
 
 
-def numbers_quiz(num_questions=10, repeats=2, delay=4):
+def number_items(num_questions=10):
     for i in range(1, num_questions + 1):
         logn = random.uniform(1.8, 4.5)
         n = int(10 ** logn)
-        say_jap_wait(f'{str(i)} ばん', 1)
-        for _ in range(repeats):
-            say_jap_wait(str(n), delay)
-
-        print(i, ':', n)
-        say_eng_wait(f'That was {str(n)}.', 1)
-        say_jap_wait(str(n), 1)
-    say_jap_wait('おわりました')
+        yield QuizItem(i, str(n), f'{n} {number_kana(n)}', f'That was {str(n)}.', 1)
 
 
-def times_quiz(num_questions=10, repeats=2, delay=4):
+def time_items(num_questions=10):
     for i in range(1, num_questions + 1):
-        hrs = random.randint(0, 12)
-        mins = random.choice(['05', 15, 15, 30, 30, 30, 45, 45, 55, 40, 20, 10])
+        hrs = random.randint(1, 12)
+        mins = random.choice([5, 15, 15, 30, 30, 30, 45, 45, 55, 40, 20, 10])
         am_or_pm = random.choice(['am', 'pm'])
-        say_jap_wait(f'{str(i)} ばん', 1)
-        time_eng = f"{hrs}:{mins} {am_or_pm}"
-        for _ in range(repeats):
-            say_jap_wait(time_eng, delay)   # Japanese speech cleverly interprets English times!
-        print(i, ':', time_eng)
-        say_eng_wait(f'That was {time_eng}', 1)
-        say_jap_wait(time_eng, 2)
-    say_jap_wait('おわりました')
+        time_eng = f"{hrs}:{mins:02} {am_or_pm}"
+        reading = time_kana(hrs % 12 + (12 if am_or_pm == 'pm' else 0), mins)
+        yield QuizItem(i, reading, f'{time_eng} {reading}', f'That was {time_eng}', 2)
+
+
+def numbers_quiz(num_questions=10, repeats=2, delay=4):
+    run_quiz(number_items(num_questions), repeats, delay)
+
+
+def times_quiz(num_questions=10, repeats=2, delay=4):
+    run_quiz(time_items(num_questions), repeats, delay)
 
 
 if __name__ == "__main__":
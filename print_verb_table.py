@@ -1,14 +1,38 @@
 
+import math
+import numbers
 from unicodedata import east_asian_width
-from japanese import Vt
+from itertools import islice, repeat
+from japanese import Vt, FormSpec, conjugate_many
 from dictionary import sdict
 
 
+# Display width of a character in ascii spaces; Japanese characters are 'W'
+# and seem to have a width of 5/3 (1.666) that of ascii characters
+wide_char_width = 5 / 3
+
+
+def _char_width(c):
+    return wide_char_width if east_asian_width(c) == 'W' else 1.0
+
+
+# Widths for ascii and the Japanese punctuation and kana blocks are precomputed,
+# any other character is added the first time it is measured
+char_widths = {chr(i): _char_width(chr(i)) for i in list(range(0x20, 0x7f)) + list(range(0x3000, 0x3100))}
+
+
 class UFormat(object):
     """ Routines to lay out text in tables, taking account of the different
     width of kana characters; With experimentation I find they occupy 5/3 ascii
     space widths """
 
+    @staticmethod
+    def char_width(c):
+        width = char_widths.get(c)
+        if width is None:
+            width = char_widths[c] = _char_width(c)
+        return width
+
     @staticmethod
     def sum_width(ustr):
         """ Japanese characters are 'W' and seem to have a width of 5/3 (1.666)
@@ -18,31 +42,74 @@ class UFormat(object):
         >>> UFormat.sum_width('あいえ')
         5.0
         """
-
-        return sum([5 / 3 if east_asian_width(c) == 'W' else 1.0 for c in ustr])
+        widths = char_widths
+        total = 0.0
+        for c in ustr:
+            width = widths.get(c)
+            total += width if width is not None else UFormat.char_width(c)
+        return total
 
     @staticmethod
     def format_uwords(words, width):
         """ Format given list of words in 'width' per column, taking care of non-ascii
-        character widths.
+        character widths.  width may also be a sequence giving each column's width.
         >>> words_ = ['eat', 'たべる', 'たべない']
         >>> UFormat.format_uwords(words_, 10)
         'eat       たべる     たべない   '
+        >>> UFormat.format_uwords(words_, (4, 7, 1))
+        'eat たべる  たべない'
         """
-
+        widths = repeat(width) if isinstance(width, numbers.Real) else width
         actual_width_acc = 0.0
         required_width_acc = 0
-        result_str = ''
-        for word in words:
-            result_str = result_str + word
+        parts = []
+        for word, column_width in zip(words, widths):
+            parts.append(word)
             actual_width_acc += UFormat.sum_width(word)
-            required_width_acc += width
+            required_width_acc += column_width
             spaces_needed = round(required_width_acc - actual_width_acc)
             if spaces_needed > 0:
-                result_str += ' ' * spaces_needed
+                parts.append(' ' * spaces_needed)
                 actual_width_acc += spaces_needed
 
-        return result_str
+        return ''.join(parts)
+
+    @staticmethod
+    def column_widths(rows, gap=2):
+        """ Width of each column needed to fit every row, plus gap, found in one pass
+        >>> UFormat.column_widths([('eat', 'たべる'), ('drink', 'のむ')])
+        [7, 7]
+        """
+        maxima = []
+        for row in rows:
+            if len(row) > len(maxima):
+                maxima.extend([0.0] * (len(row) - len(maxima)))
+            for i, word in enumerate(row):
+                w = UFormat.sum_width(word)
+                if w > maxima[i]:
+                    maxima[i] = w
+        return [math.ceil(m) + gap for m in maxima]
+
+    @staticmethod
+    def render_table(rows, widths=None, gap=2):
+        """ The rows laid out in columns as one string, a line per row.  Column widths
+        are fitted to the rows unless given, and the output is built with a single
+        join so the time taken is linear in its size
+        >>> print(UFormat.render_table([('eat', 'たべる'), ('drink', 'のむ')]))
+        eat    たべる  
+        drink  のむ    
+        """
+        rows = list(rows)
+        if widths is None:
+            widths = UFormat.column_widths(rows, gap)
+        return '\n'.join(UFormat.format_uwords(row, widths) for row in rows)
+
+
+# The columns of the conjugation table, compiled once for conjugate_many
+table_specs = [
+    FormSpec.of(*args) for args in (
+        (Vt.ENG,), (Vt.POLITE,), (Vt.TE,),
+        (Vt.PRESENT, Vt.AFFIRM), (Vt.PRESENT, Vt.NEG), (Vt.PAST, Vt.AFFIRM), (Vt.PAST, Vt.NEG))]
 
 
 def print_verb_conjugation_table(max_n=9999):
@@ -54,14 +121,9 @@ def print_verb_conjugation_table(max_n=9999):
     print(UFormat.format_uwords(headings, width))
     print(UFormat.format_uwords(underlines, width))
 
-    for i, v in enumerate(sdict.eng_verb_dict.values()):
-        if i >= max_n:
-            break
-        conjugations = [
-            v.conjugate(t, pn)
-            for t in (Vt.PRESENT, Vt.PAST)
-            for pn in (Vt.AFFIRM, Vt.NEG)]
-        print(UFormat.format_uwords((v.meaning, v.masu, v.te, *conjugations), width))
+    verbs = islice(sdict.eng_verb_dict.values(), max_n)
+    for row in conjugate_many(verbs, table_specs):
+        print(UFormat.format_uwords(row, width))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,64 @@
+"""
+Runs listening quizzes as a pipeline: while the learner hears one question and
+thinks, a background thread generates the next few items.  When speech is played
+from a render cache (see say.set_render_cache) their audio is rendered ahead into
+it too, so asking an item plays files that are already there
+"""
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from say import say_jap_wait, say_eng_wait, render_cache, jap_speed, eng_speed
+
+# One quiz question: its number, the Japanese to say, the answer to print, the
+# English reveal and the pause after the final repeat
+QuizItem = namedtuple('QuizItem', 'number question answer reveal final_pause')
+
+
+def item_utterances(item):
+    """ (text, lang, speed) for everything said for an item """
+    return [(f'{item.number} ばん', 'ja-JP', jap_speed), (item.question, 'ja-JP', jap_speed),
+            (item.reveal, 'en-GB', eng_speed)]
+
+
+class _Done(object):
+    """ Marks the end of the items """
+
+
+def _prepare(items, cache):
+    """ Generate the next item and render its audio into the cache """
+    item = next(items, _Done)
+    if item is not _Done and cache is not None:
+        for text, lang, speed in item_utterances(item):
+            cache.get(text, lang, speed)
+    return item
+
+
+def prefetched(items, prefetch=3, cache=None):
+    """ Iterate over items, generating and pre-rendering up to prefetch ahead on a
+    background thread """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='quiz') as pool:
+        pending = deque(pool.submit(_prepare, items, cache) for _ in range(max(1, prefetch)))
+        while True:
+            item = pending.popleft().result()
+            if item is _Done:
+                break
+            pending.append(pool.submit(_prepare, items, cache))
+            yield item
+
+
+def ask(item, repeats, delay):
+    """ Say one question, reveal its answer and say it again """
+    say_jap_wait(f'{item.number} ばん', 1)
+    for _ in range(repeats):
+        say_jap_wait(item.question, delay)
+    print(item.number, ':', item.answer)
+    say_eng_wait(item.reveal, 1)
+    say_jap_wait(item.question, item.final_pause)
+
+
+def run_quiz(items, repeats=2, delay=4, prefetch=3):
+    """ Ask every item, preparing the next ones while each is asked """
+    for item in prefetched(items, prefetch, render_cache()):
+        ask(item, repeats, delay)
+    say_jap_wait('おわりました')
@@ -1,47 +1,309 @@
 """
-Wrapper to Pythonista speech package, with no-op fall backs when on Linux
+Wrapper to Pythonista speech package, with no-op fall backs when on Linux.
+The speech module is only probed on first use, so importing this is free of
+side effects.  Everything is spoken through a SpeechScheduler, so waiting for
+speech blocks on a future or the scheduler rather than polling
 """
-from time import sleep
-
-try:
-    # noinspection PyUnresolvedReferences
-    from speech import is_speaking, say
-    print("Speech IS available")
-    speech_available = True
-except ModuleNotFoundError:
-    speech_available = False
-    print("Speech NOT available")
-
-    # noinspection PyUnusedLocal
-    def say(text, lang='en-GB', speed=0.5):
-        # print("Saying:", text[:7], "...")
-        assert lang in ['en-GB', 'ja-JP']    # There are many others but these are only ones we use
-        assert 0.05 <= speed <= 1
+import hashlib
+import math
+import os
+import tempfile
+import threading
+import wave
+from array import array
+from collections import OrderedDict
+from time import sleep, monotonic
+
+import metrics
+from speech_scheduler import SpeechScheduler, PollingBackend
+
+_lock = threading.Lock()
+_backend = None
+_scheduler = None
+_render = None  # (cache, play, is_playing, stop) once set_render_cache is called
+
+# The speeds say_jap_wait and say_eng_wait speak at
+jap_speed = 0.3
+eng_speed = 0.5
+
+
+# noinspection PyUnusedLocal
+def _silent_say(text, lang='en-GB', speed=0.5):
+    # print("Saying:", text[:7], "...")
+    assert lang in ['en-GB', 'ja-JP']    # There are many others but these are only ones we use
+    assert 0.05 <= speed <= 1
+
+
+def _silent_is_speaking():
+    return False
+
+
+def _silent_stop():
+    pass
+
+
+def _probe_speech():
+    """ (say, is_speaking, available, stop) for the Pythonista speech module, or no-op stand ins """
+    try:
+        # noinspection PyUnresolvedReferences
+        from speech import is_speaking as speech_is_speaking, say as speech_say, stop as speech_stop
+        print("Speech IS available")
+        return speech_say, speech_is_speaking, True, speech_stop
+    except ModuleNotFoundError:
+        print("Speech NOT available")
+        return _silent_say, _silent_is_speaking, False, _silent_stop
+
+
+def _speech_locked():
+    global _backend
+    if _backend is None:
+        _backend = _probe_speech()
+    return _backend
+
+
+def _speech():
+    backend = _backend
+    if backend is None:
+        with _lock:
+            backend = _speech_locked()
+    return backend
+
+
+def scheduler():
+    """ The shared SpeechScheduler, speaking through the probed backend """
+    global _scheduler
+    with _lock:
+        if _scheduler is None:
+            if _render is not None:
+                cache, play, is_playing, stop = _render
+                if is_playing is None:
+                    play, is_playing = _timed_playback(play)
+                _scheduler = SpeechScheduler(
+                    PollingBackend(lambda text, lang, speed: play(cache.get(text, lang, speed)), is_playing, stop))
+            else:
+                speech_say, speech_is_speaking, _, speech_stop = _speech_locked()
+                _scheduler = SpeechScheduler(PollingBackend(speech_say, speech_is_speaking, speech_stop))
+        return _scheduler
+
+
+def set_scheduler(new_scheduler):
+    """ Replace the shared scheduler, for instance with one using a FakeBackend """
+    global _scheduler
+    with _lock:
+        _scheduler = new_scheduler
+
+
+def _wav_seconds(path):
+    with wave.open(path) as w:
+        return w.getnframes() / w.getframerate()
+
+
+def _timed_playback(play):
+    """ (play, is_playing) for a player which gives no way to tell when it has
+    finished, taking a file to be playing for the length of its audio """
+    end = 0.0
+
+    def timed_play(path):
+        nonlocal end
+        play(path)
+        end = monotonic() + _wav_seconds(path)
+
+    return timed_play, lambda: monotonic() < end
+
+
+def set_render_cache(cache, play=None, is_playing=None, stop=_silent_stop):
+    """ Speak by playing audio from a RenderCache, where play(path) starts a file
+    playing, such as Pythonista's sound.play_effect.  is_playing() tells whether it
+    still is; without it each file is taken to play for the length of its audio.
+    The shared scheduler is replaced, so this should be called before speaking.  A
+    cache of None goes back to the speech module """
+    global _render, _scheduler
+    assert cache is None or play is not None, "Nothing to play the audio with"
+    with _lock:
+        _render = None if cache is None else (cache, play, is_playing, stop)
+        _scheduler = None
 
-    def is_speaking():
-        return False
+
+def render_cache():
+    """ The RenderCache speech is played from, or None """
+    render = _render
+    return render[0] if render is not None else None
+
+
+def is_speech_available():
+    return _speech()[2]
+
+
+def __getattr__(name):
+    # speech_available used to be a module constant, now it is found on first use
+    if name == 'speech_available':
+        return is_speech_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _count_utterance(lang):
+    if metrics.enabled:
+        metrics.count('say_utterances_total', lang=lang)
+
+
+def say(text, lang='en-GB', speed=0.5):
+    """ Queue text to be spoken, without waiting for it """
+    _count_utterance(lang)
+    scheduler().enqueue(text, lang, speed)
+
+
+def is_speaking():
+    return scheduler().busy
+
+
+async def speak(text, lang='en-GB', speed=0.5):
+    """ Speak through the shared scheduler from a coroutine """
+    _count_utterance(lang)
+    return await scheduler().speak(text, lang, speed)
 
 
 def finish_speaking():
-    # Block until speech synthesis has finished
-    while is_speaking():
-        sleep(0.1)
+    scheduler().wait()
 
 
 def say_jap_wait(jap, t=0):
-    say(jap, 'ja-JP', 0.3)
-    while is_speaking():
-        sleep(0.1)
-    if speech_available:
+    _count_utterance('ja-JP')
+    scheduler().enqueue(jap, 'ja-JP', jap_speed).result()
+    if is_speech_available():
         sleep(t)
 
 
 def say_eng_wait(eng, t=0):
-    say(eng, 'en-GB')
-    while is_speaking():
-        sleep(0.1)
-    if speech_available:
+    _count_utterance('en-GB')
+    scheduler().enqueue(eng, 'en-GB', eng_speed).result()
+    if is_speech_available():
         sleep(t)
 
 
+class WaveRenderer(object):
+    """ A local stand in for a speech synthesizer, which renders text to WAV data
+    with the wave module: a short tone for each character, pitched by the
+    character, and stretched for slower speeds.  Real synthesizers can replace it
+    by providing the same render method """
+
+    def __init__(self, rate=8000, char_seconds=0.06):
+        self.rate = rate
+        self.char_seconds = char_seconds
+
+    def render(self, text, lang, speed):
+        """ The WAV file contents for text """
+        assert 0.05 <= speed <= 1
+        samples = array('h')
+        n = max(1, int(self.rate * self.char_seconds * 0.5 / speed))
+        for c in text:
+            step = 2 * math.pi * (200 + ord(c) % 600) / self.rate
+            samples.extend(int(8000 * math.sin(i * step)) for i in range(n))
+        with tempfile.SpooledTemporaryFile() as f:
+            with wave.open(f, 'wb') as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(self.rate)
+                w.writeframes(samples.tobytes())
+            f.seek(0)
+            return f.read()
+
+
+class RenderCache(object):
+    """ Synthesized audio kept on disk, keyed by (text, lang, speed), so phrases the
+    quizzes repeat are only rendered once.  The files in the directory are capped at
+    max_bytes in total, evicting the least recently used.  Files are written to a
+    temporary name and renamed into place, so a crash never leaves a partial file
+
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     cache = RenderCache(directory, WaveRenderer())
+    ...     cache.get('ばん', 'ja-JP', 0.3) == cache.get('ばん', 'ja-JP', 0.3)
+    True
+    >>> cache.hits, cache.misses
+    (1, 1)
+    """
+
+    suffix = '.wav'
+
+    def __init__(self, directory, renderer=None, max_bytes=50 * 2 ** 20):
+        self.directory = directory
+        self.renderer = renderer if renderer is not None else WaveRenderer()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = None  # file name -> size, least recently used first
+        self._total = 0
+
+    def path(self, text, lang, speed):
+        key = hashlib.sha1(f'{lang}\0{speed}\0{text}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _load(self):
+        # Recover recency order from modification times, which get() refreshes on a hit
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                st = os.stat(os.path.join(self.directory, name))
+                found.append((st.st_mtime, name, st.st_size))
+        self._entries = OrderedDict((name, size) for _, name, size in sorted(found))
+        self._total = sum(self._entries.values())
+
+    def get(self, text, lang='en-GB', speed=0.5):
+        """ Path of the audio for text, rendering and storing it on a miss """
+        path = self.path(text, lang, speed)
+        name = os.path.basename(path)
+        with self._lock:
+            if self._entries is None:
+                self._load()
+            if name in self._entries:
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    # Another process sharing the directory evicted it
+                    self._total -= self._entries.pop(name)
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(name)
+                    return path
+            self.misses += 1
+
+        data = self.renderer.render(text, lang, speed)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = len(data)
+                self._total += len(data)
+            self._evict()
+        return path
+
+    def _evict(self):
+        # The newest file is always kept, even if it alone is over the cap
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total -= size
+            self.evictions += 1
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            if self._entries is None:
+                self._load()
+            return self._total
 
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'files': len(self._entries or ()), 'bytes': self._total}
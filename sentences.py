@@ -1,9 +1,13 @@
 # coding: utf-8
 
-from time import sleep
-from japanese import Vt
+import random
+from itertools import product
+from time import sleep, perf_counter
+
+import metrics
+from japanese import Vt, FormSpec, canonical_specs
 from dictionary import sdict
-from say import say, finish_speaking, speech_available
+from say import say, finish_speaking, is_speech_available
 
 
 def print_and_say(jap_eng):
@@ -12,11 +16,59 @@ def print_and_say(jap_eng):
     print(eng)
     say(jap, 'ja-JP')
     finish_speaking()
-    if speech_available:
+    if is_speech_available():
         sleep(1)
     print()
 
 
+def eng_spec(spec):
+    """ The English translation spec matching a Japanese one """
+    return FormSpec.of(Vt.ENG, *spec.flags)
+
+
+class SentenceTemplate(object):
+    """ A basic sentence compiled from its dictionary entries.  Everything except the
+    verb is joined once into fixed Japanese and English parts, so rendering a form
+    is a conjugation lookup and a concatenation.  Entries are pronouns, nouns and
+    verbs from the dictionary, or None to leave that part out
+
+    >>> t = SentenceTemplate(sdict.pronoun('she'), sdict.noun('phone'), sdict.verb('use'))
+    >>> t.render(FormSpec.of(Vt.POLITE))
+    ('かのじょ は でんわ を つかいます', 'she use the phone ')
+    """
+
+    __slots__ = ('verb', 'jap_prefix', 'eng_prefix', 'eng_suffix')
+
+    def __init__(self, subject=None, noun=None, verb=None, with_=None):
+        jap = ''
+        if subject: jap += subject.jap + ' は '
+        if with_: jap += with_.jap + ' と '
+        if noun: jap += noun.jap + ' を '
+        self.jap_prefix = jap
+
+        self.eng_prefix = subject.eng + ' ' if subject else ''
+        eng = ''
+        if noun: eng += 'the ' + noun.eng + ' '
+        if with_: eng += 'with ' + with_.eng
+        self.eng_suffix = eng
+        self.verb = verb
+
+    def render(self, spec, eng=None):
+        """ The (jap, eng) sentence with the verb in the form given by spec.  eng is
+        the matching English spec, which callers rendering many sentences pass in """
+        if self.verb is None:
+            return self.jap_prefix, self.eng_prefix + self.eng_suffix
+        eng = eng or eng_spec(spec)
+        return (self.jap_prefix + spec.conjugate(self.verb),
+                self.eng_prefix + eng.conjugate(self.verb) + ' ' + self.eng_suffix)
+
+
+def basic_template(subject=None, noun=None, verb=None, with_=None):
+    """ Compile a basic sentence from the english or japanese forms of its words """
+    return SentenceTemplate(sdict.pronoun(subject) if subject else None, sdict.noun(noun) if noun else None,
+                            sdict.verb(verb) if verb else None, sdict.pronoun(with_) if with_ else None)
+
+
 def basic_sen(subject=None, noun=None, verb=None, with_=None, *args):
     """
     >>> print(basic_sen(None, 'beer', 'drink', None, Vt.PAST, Vt.POLITE))
@@ -24,19 +76,59 @@ def basic_sen(subject=None, noun=None, verb=None, with_=None, *args):
     >>> print(basic_sen('he', 'sushi', 'eat', 'Tanaka-san', Vt.PLAIN))
     ('かれ は たなかさん と すし を たべる', 'he eat the sushi with Tanaka-san')
     """
-
-    jap = ''
-    if subject: jap += sdict.pronoun(subject).jap + ' は '
-    if with_: jap += sdict.pronoun(with_).jap + ' と '
-    if noun: jap += sdict.noun(noun).jap + ' を '
-    if verb: jap += sdict.verb(verb).conjugate(*args)
-
-    eng = ''
-    if subject: eng += subject + ' '
-    if verb: eng += sdict.verb(verb).conjugate(Vt.ENG, *args) + ' '
-    if noun: eng += 'the ' + sdict.noun(noun).eng + ' '
-    if with_: eng += 'with ' + sdict.pronoun(with_).eng
-    return jap, eng
+    if not metrics.enabled:
+        return basic_template(subject, noun, verb, with_).render(FormSpec.of(*args))
+    start = perf_counter()
+    sentence = basic_template(subject, noun, verb, with_).render(FormSpec.of(*args))
+    metrics.observe('basic_sen_seconds', perf_counter() - start)
+    metrics.count('sentences_total', kind='basic')
+    return sentence
+
+
+def _entries(find, words, everything):
+    if words is None:
+        return list(everything.values())
+    return [find(w) if w is not None else None for w in words]
+
+
+def sentence_stream(subjects=None, nouns=None, verbs=None, specs=canonical_specs, with_=(None,),
+                    where=None, sample=None, seed=None):
+    """ Lazily yield (jap, eng) for every subject × with × noun × verb × spec.
+    subjects, nouns and verbs default to every word in the dictionary, and None in
+    a list leaves that part out.  Each word is looked up once, and only one
+    sentence is held at a time, however many are generated.
+
+    where(subject, noun, verb, spec), called with the dictionary entries, filters
+    combinations before they are rendered.  sample keeps each combination with
+    that probability, reproducibly for a given seed
+
+    >>> stream = sentence_stream(['I'], ['beer', None], ['drink'], [FormSpec.of(Vt.PAST)])
+    >>> list(stream)
+    [('わたし は ビール を のんだ', 'I drinked the beer '), ('わたし は のんだ', 'I drinked ')]
+    """
+    subjects = _entries(sdict.pronoun, subjects, sdict.eng_pronoun_dict)
+    nouns = _entries(sdict.noun, nouns, sdict.eng_noun_dict)
+    verbs = _entries(sdict.verb, verbs, sdict.eng_verb_dict)
+    assert None not in verbs, "Every sentence needs a verb"
+    with_ = _entries(sdict.pronoun, with_, sdict.eng_pronoun_dict)
+    specs = [(spec, eng_spec(spec)) for spec in specs]
+    rng = random.Random(seed) if sample is not None else None
+
+    yielded = 0
+    try:
+        for subject, other, noun, verb in product(subjects, with_, nouns, verbs):
+            template = SentenceTemplate(subject, noun, verb, other)
+            for spec, eng in specs:
+                if where is not None and not where(subject, noun, verb, spec):
+                    continue
+                if rng is not None and rng.random() >= sample:
+                    continue
+                yielded += 1
+                yield template.render(spec, eng)
+    finally:
+        # Counted once at the end, as the stream may yield millions of sentences
+        if metrics.enabled and yielded:
+            metrics.count('sentences_total', yielded, kind='stream')
 
 
 def basic_sen_examples():
@@ -49,14 +141,19 @@ def basic_sen_examples():
 
 
 def polite_request_sen(verb, noun=None):
+    verb = sdict.verb(verb)
+    noun = sdict.noun(noun) if noun else None
+
     jap = ''
-    if noun: jap += sdict.noun(noun).jap + ' を '
-    jap += sdict.verb(verb).conjugate(Vt.TE) + ' '
+    if noun: jap += noun.jap + ' を '
+    jap += verb.conjugate(Vt.TE) + ' '
     jap += 'ください'
 
-    eng = 'Please ' + sdict.verb(verb).eng
-    if noun: eng += ' the ' + sdict.noun(noun).eng
+    eng = 'Please ' + verb.eng
+    if noun: eng += ' the ' + noun.eng
 
+    if metrics.enabled:
+        metrics.count('sentences_total', kind='polite_request')
     return jap, eng
 
 
@@ -0,0 +1,215 @@
+"""
+SM-2 spaced repetition over dictionary words and verb forms.  A deck keeps its
+cards in a SQLite file.  Only cards about to fall due are loaded into a heap,
+a page at a time in due order, so opening a deck of a million cards reads one
+page and taking the next card costs O(log n).  Reviews are written back in
+batches, each batch in a single transaction
+"""
+import heapq
+import sqlite3
+import time
+
+from japanese import canonical_specs, form_slots
+from dictionary import sdict
+
+day = 24 * 60 * 60
+
+
+class Card(object):
+    """ The SM-2 state of one card.  interval is in days and due is a time.time() """
+
+    __slots__ = ('id', 'ease', 'interval', 'reps', 'due')
+
+    def __init__(self, id, ease=2.5, interval=0.0, reps=0, due=0.0):
+        self.id = id
+        self.ease = ease
+        self.interval = interval
+        self.reps = reps
+        self.due = due
+
+    def __repr__(self):
+        return f'Card({self.id!r}, ease={self.ease:.2f}, interval={self.interval}, reps={self.reps})'
+
+
+def sm2(card, quality, now):
+    """ Update a card for a review graded 0 (forgotten) to 5 (perfect), in place
+    >>> card = Card('noun/すし')
+    >>> [sm2(card, 4, 0).interval for _ in range(3)]
+    [1, 6, 15]
+    >>> sm2(card, 1, 0).interval, card.reps, round(card.ease, 2)
+    (1, 0, 1.96)
+    """
+    assert 0 <= quality <= 5, "Quality is graded 0 to 5"
+    if quality < 3:
+        card.reps = 0
+        card.interval = 1
+    else:
+        if card.reps == 0:
+            card.interval = 1
+        elif card.reps == 1:
+            card.interval = 6
+        else:
+            card.interval = round(card.interval * card.ease)
+        card.reps += 1
+    card.ease = max(1.3, card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    card.due = now + card.interval * day
+    return card
+
+
+def verb_card_ids(verbs=None, specs=canonical_specs):
+    """ A card for each form of each verb, 'verb/<plain>/<form>' """
+    verbs = sdict.jap_verb_dict if verbs is None else verbs
+    return (f'verb/{verb}/{spec.form}' for verb in verbs for spec in specs)
+
+
+def noun_card_ids(nouns=None):
+    """ A card for each noun, 'noun/<japanese>' """
+    nouns = sdict.jap_noun_dict if nouns is None else nouns
+    return (f'noun/{noun}' for noun in nouns)
+
+
+def card_answer(card_id):
+    """ (english, japanese) for a card
+    >>> card_answer('verb/のむ/mashita')
+    ('drink (mashita)', 'のみました')
+    """
+    kind, _, rest = card_id.partition('/')
+    if kind == 'verb':
+        plain, _, form = rest.partition('/')
+        verb = sdict.verb(plain)
+        return f'{verb.eng} ({form})', verb.form(form_slots.index(form))
+    assert kind == 'noun', f"Unknown card {card_id}"
+    return sdict.noun(rest).eng, rest
+
+
+class Deck(object):
+    """ Cards stored in a SQLite file, with the soonest due in a heap
+
+    >>> deck = Deck(':memory:')
+    >>> deck.add(['noun/すし', 'noun/パン'], now=0)
+    >>> card = deck.next_card(now=0)
+    >>> card.id
+    'noun/すし'
+    >>> deck.review(card, 5, now=0).interval
+    1
+    >>> deck.next_card(now=0).id
+    'noun/パン'
+    """
+
+    def __init__(self, path, page_size=256, batch_size=100):
+        self.path = path
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS cards (id TEXT PRIMARY KEY, ease REAL, interval REAL, '
+                             'reps INTEGER, due REAL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS cards_due ON cards (due, id)')
+        self._heap = []
+        self._cards = {}
+        self._pending = {}
+        # (due, id) of the last card paged in; later cards are only in the database
+        self._watermark = None
+        self._exhausted = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        self.flush()
+        return self._db.execute('SELECT COUNT(*) FROM cards').fetchone()[0]
+
+    @property
+    def loaded(self):
+        """ The number of cards read from the database so far """
+        return len(self._cards)
+
+    def add(self, card_ids, now=None):
+        """ Add new cards, due now.  Cards already in the deck keep their state """
+        now = time.time() if now is None else now
+        self.flush()
+        with self._db:
+            self._db.executemany('INSERT OR IGNORE INTO cards VALUES (?, 2.5, 0, 0, ?)',
+                                 ((card_id, now) for card_id in card_ids))
+        # Cards sorting before the watermark would be skipped by paging, so restart it
+        self._heap = []
+        self._cards = {}
+        self._watermark = None
+        self._exhausted = False
+
+    def _load_page(self):
+        self.flush()
+        if self._watermark is None:
+            rows = self._db.execute('SELECT * FROM cards ORDER BY due, id LIMIT ?', (self.page_size,))
+        else:
+            rows = self._db.execute('SELECT * FROM cards WHERE (due, id) > (?, ?) ORDER BY due, id LIMIT ?',
+                                    self._watermark + (self.page_size,))
+        rows = rows.fetchall()
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        for row in rows:
+            card = self._cards[row[0]] = Card(*row)
+            heapq.heappush(self._heap, (card.due, card.id))
+        if rows:
+            self._watermark = (rows[-1][4], rows[-1][0])
+
+    def _peek(self):
+        """ The soonest due card, or None for an empty deck """
+        while True:
+            if not self._heap and not self._exhausted:
+                self._load_page()
+            if not self._heap:
+                return None
+            due, card_id = self._heap[0]
+            card = self._cards.get(card_id)
+            if card is None or card.due != due:
+                # Stale entry for a card since rescheduled
+                heapq.heappop(self._heap)
+                continue
+            return card
+
+    def next_card(self, now=None):
+        """ The card most overdue at now, or None if nothing is due """
+        now = time.time() if now is None else now
+        card = self._peek()
+        if card is None or card.due > now:
+            return None
+        return card
+
+    def review(self, card, quality, now=None):
+        """ Record a review of a card and reschedule it """
+        now = time.time() if now is None else now
+        sm2(card, quality, now)
+        self._cards[card.id] = card
+        self._pending[card.id] = card
+        if self._watermark is None or (card.due, card.id) <= self._watermark:
+            heapq.heappush(self._heap, (card.due, card.id))
+        else:
+            # Paging will find it again once it is written back, even if the last
+            # page had already been read
+            del self._cards[card.id]
+            self._exhausted = False
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return card
+
+    def due_count(self, now=None):
+        """ The number of cards due at now """
+        now = time.time() if now is None else now
+        self.flush()
+        return self._db.execute('SELECT COUNT(*) FROM cards WHERE due <= ?', (now,)).fetchone()[0]
+
+    def flush(self):
+        """ Write pending reviews back in one transaction """
+        if self._pending:
+            with self._db:
+                self._db.executemany('UPDATE cards SET ease = ?, interval = ?, reps = ?, due = ? WHERE id = ?',
+                                     ((c.ease, c.interval, c.reps, c.due, c.id) for c in self._pending.values()))
+            self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._db.close()
@@ -0,0 +1,154 @@
+"""
+A queue of utterances spoken one after another on a worker thread.  Each
+utterance gets a Future, so callers can queue speech ahead, cancel it and wait
+for it to finish, from threads or from asyncio, without polling
+"""
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import Future
+
+# stop is set to cut the utterance short, so a cancel is never lost however early it comes
+Utterance = namedtuple('Utterance', 'text lang speed future stop')
+
+
+class FakeBackend(object):
+    """ A deterministic stand in for a speech engine.  It records every utterance
+    and 'speaks' each for a configured time: durations[text] if given, otherwise
+    default + per_char seconds for each character """
+
+    def __init__(self, durations=None, default=0.0, per_char=0.0):
+        self.durations = durations or {}
+        self.default = default
+        self.per_char = per_char
+        self.spoken = []
+
+    def duration(self, text):
+        return self.durations.get(text, self.default + self.per_char * len(text))
+
+    def speak(self, text, lang, speed, stop):
+        """ Speak text, returning True when finished or False if the stop event was
+        set before it finished """
+        self.spoken.append((text, lang, speed))
+        return not stop.wait(self.duration(text))
+
+
+class PollingBackend(object):
+    """ Drives a say / is_speaking pair such as Pythonista's speech module, which
+    gives no completion callback.  The polling happens on the scheduler's thread
+    so callers still just wait on their futures """
+
+    def __init__(self, say, is_speaking, stop=None, interval=0.02):
+        self._say = say
+        self._is_speaking = is_speaking
+        self._stop_speech = stop
+        self.interval = interval
+
+    def speak(self, text, lang, speed, stop):
+        if stop.is_set():
+            return False
+        self._say(text, lang, speed)
+        while self._is_speaking():
+            if stop.wait(self.interval):
+                if self._stop_speech is not None:
+                    self._stop_speech()
+                return False
+        return True
+
+
+class SpeechScheduler(object):
+    """ Speaks queued utterances in order on a worker thread
+
+    >>> backend = FakeBackend()
+    >>> scheduler = SpeechScheduler(backend)
+    >>> scheduler.enqueue('いち', 'ja-JP').result()
+    True
+    >>> backend.spoken
+    [('いち', 'ja-JP', 0.5)]
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._queue = deque()
+        self._current = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def enqueue(self, text, lang='en-GB', speed=0.5):
+        """ Queue an utterance, returning a Future whose result is True once it has
+        been spoken, or False if it was stopped part way """
+        future = Future()
+        with self._condition:
+            assert not self._closed, "Scheduler is closed"
+            self._queue.append(Utterance(text, lang, speed, future, threading.Event()))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='speech', daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+        return future
+
+    async def speak(self, text, lang='en-GB', speed=0.5):
+        """ Queue an utterance and wait for it from a coroutine """
+        import asyncio  # only needed here, and slow to import
+        return await asyncio.wrap_future(self.enqueue(text, lang, speed))
+
+    def cancel(self, future):
+        """ Cancel a queued utterance, or stop it if it is being spoken.  Returns
+        False if it had already finished """
+        with self._condition:
+            if self._current is not None and self._current.future is future:
+                self._current.stop.set()
+                return True
+            # Under the lock, so the worker cannot start it in between
+            return future.cancel()
+
+    def cancel_all(self):
+        """ Drop everything queued and stop the current utterance """
+        with self._condition:
+            for utterance in self._queue:
+                utterance.future.cancel()
+            self._queue.clear()
+            if self._current is not None:
+                self._current.stop.set()
+            self._condition.notify_all()
+
+    @property
+    def busy(self):
+        with self._condition:
+            return bool(self._queue) or self._current is not None
+
+    def wait(self, timeout=None):
+        """ Block until everything queued has been spoken.  Returns False on timeout """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and self._current is None, timeout)
+
+    def close(self):
+        """ Finish what is queued, then stop the worker """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                utterance = self._queue.popleft()
+                if not utterance.future.set_running_or_notify_cancel():
+                    self._condition.notify_all()
+                    continue
+                self._current = utterance
+            try:
+                finished = self.backend.speak(utterance.text, utterance.lang, utterance.speed, utterance.stop)
+            except Exception as e:
+                utterance.future.set_exception(e)
+            else:
+                utterance.future.set_result(finished)
+            finally:
+                with self._condition:
+                    self._current = None
+                    self._condition.notify_all()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import time
+import unittest
+
+from answer_log import AnswerLog, Answer, ItemSummary, encode, read_log, recover
+
+
+class TestAnswerLog(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, 'answers.log')
+
+    def test_round_trip(self):
+        with AnswerLog(self.path) as log:
+            for i in range(100):
+                log.record(f'{i} ばん', i % 3 == 0, 1.5, when=i)
+        answers = list(read_log(self.path))
+        assert len(answers) == 100
+        assert answers[3] == Answer(3.0, '3 ばん', True, 1.5)
+
+    def test_buffered_until_threshold(self):
+        with AnswerLog(self.path, flush_bytes=1000, flush_seconds=60) as log:
+            log.record('いち', True)
+            time.sleep(0.05)
+            assert os.path.getsize(self.path) == 0
+            while os.path.getsize(self.path) == 0:
+                log.record('いち', True)
+                time.sleep(0.001)
+            assert os.path.getsize(self.path) >= 1000
+
+    def test_flushes_after_time(self):
+        with AnswerLog(self.path, flush_seconds=0.05) as log:
+            log.record('いち', True)
+            deadline = time.time() + 2
+            while os.path.getsize(self.path) == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert len(list(read_log(self.path))) == 1
+
+    def test_recovers_partial_tail(self):
+        with open(self.path, 'wb') as f:
+            f.write(encode(Answer(1, 'いち', True, 1)))
+            f.write(encode(Answer(2, 'に', False, 2))[:-3])
+        assert [a.item for a in read_log(self.path)] == ['いち']
+        with AnswerLog(self.path) as log:
+            log.record('さん', True, when=3)
+        assert [a.item for a in read_log(self.path)] == ['いち', 'さん']
+        assert recover(self.path) == 0
+
+    def test_recovers_corrupt_tail(self):
+        record = bytearray(encode(Answer(2, 'に', False, 2)))
+        record[-1] ^= 0xff
+        with open(self.path, 'wb') as f:
+            f.write(encode(Answer(1, 'いち', True, 1)) + record)
+        assert recover(self.path) == len(record)
+        assert [a.item for a in read_log(self.path)] == ['いち']
+
+    def test_compaction(self):
+        with AnswerLog(self.path) as log:
+            for i in range(10):
+                log.record('a' if i % 2 else 'b', i < 5, 1.0, when=i)
+            before = log.summaries()
+            assert log.compact(before=6) == 6
+            assert len(list(read_log(self.path))) == 4
+            assert log.summaries() == before
+            assert log.summaries()['a'] == ItemSummary(5, 2, 5.0, 9.0)
+            log.record('a', True, 1.0, when=10)
+            assert log.compact_in_background().result() == 5
+            assert list(read_log(self.path)) == []
+            assert log.summaries()['a'] == ItemSummary(6, 3, 6.0, 10.0)
+
+    def test_crash_during_compaction_does_not_double_count(self):
+        with AnswerLog(self.path) as log:
+            for i in range(4):
+                log.record('a', True, 1.0, when=i)
+        with open(self.path, 'rb') as f:
+            original = f.read()
+        with AnswerLog(self.path) as log:
+            log.compact(before=2)
+        # As if the log rewrite never happened
+        with open(self.path, 'wb') as f:
+            f.write(original)
+        with AnswerLog(self.path) as log:
+            assert log.summaries()['a'].count == 4
+            log.compact()
+            assert log.summaries()['a'].count == 4
+
+    def test_late_and_back_dated_answers_are_kept(self):
+        with AnswerLog(self.path) as log:
+            log.record('a', True, 1.0, when=10)
+            log.record('a', True, 1.0, when=20)
+            assert log.compact(before=15) == 1
+            # Stamped before the compaction's time, but written after it
+            log.record('a', False, 1.0, when=5)
+            assert log.summaries()['a'] == ItemSummary(3, 2, 3.0, 20.0)
+            assert log.compact() == 2
+            assert log.summaries()['a'] == ItemSummary(3, 2, 3.0, 20.0)
+        with AnswerLog(self.path) as log:
+            log.record('a', True, 1.0, when=1)
+            assert log.summaries()['a'].count == 4
+
+    def test_record_is_fast(self):
+        with AnswerLog(self.path) as log:
+            start = time.perf_counter()
+            for i in range(20000):
+                log.record('ごごさんじよんじゅうごふん', True, 2.0)
+            assert time.perf_counter() - start < 1
+        assert len(list(read_log(self.path))) == 20000
+
+
+if __name__ == '__main__':
+    unittest.main()
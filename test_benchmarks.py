@@ -0,0 +1,49 @@
+import io
+import os
+import tempfile
+import unittest
+
+import benchmarks
+import sentences
+from dictionary import sdict
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run(self):
+        out = io.StringIO()
+        report = benchmarks.run(sizes=(20,), repeat=1, out=out)
+        assert set(report['results']) == {b.name for b in benchmarks.benchmarks}
+        for sizes in report['results'].values():
+            r = sizes['20']
+            assert r['ops_per_sec'] > 0 and r['peak_bytes'] > 0
+            assert r['p50_us'] <= r['p90_us'] <= r['p99_us']
+            assert r['samples'] >= 3
+        assert report['results']['Verb']['20']['samples'] == 20
+        assert len(out.getvalue().splitlines()) == len(benchmarks.benchmarks)
+        assert sentences.sdict is sdict
+
+    def test_synthetic_dictionary(self):
+        d = benchmarks.synthetic_dictionary_class(50)()
+        assert len(d.eng_verb_dict) == 50
+        assert len(d.eng_noun_dict) == 50
+        assert d.pronoun('she').jap == 'かのじょ'
+
+    def test_compare(self):
+        baseline = benchmarks.run(sizes=(20,), names=['Verb.conjugate'], repeat=1, out=None)
+        slower = {'results': {'Verb.conjugate': {'20': dict(baseline['results']['Verb.conjugate']['20'])}}}
+        assert benchmarks.compare(slower, baseline) == []
+        slower['results']['Verb.conjugate']['20']['ops_per_sec'] /= 2
+        assert [r[2] for r in benchmarks.compare(slower, baseline)] == ['ops_per_sec']
+        assert benchmarks.compare(slower, baseline, threshold=0.6) == []
+
+    def test_baseline(self):
+        baseline = benchmarks.load(benchmarks.default_baseline)
+        assert set(baseline['results']) == {b.name for b in benchmarks.benchmarks}
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'report.json')
+            benchmarks.save(baseline, path)
+            assert benchmarks.load(path) == baseline
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import threading
+import unittest
+
+from japanese import Verb, Vt, FormSpec, canonical_specs, form_slots
+from dictionary import sdict, Dictionary
+from conjugation_index import ConjugationIndex, surface_key
+
+
+class TestConjugationIndex(unittest.TestCase):
+    def test_canonical_specs(self):
+        assert [spec.form for spec in canonical_specs] == list(form_slots)
+
+    def test_surface_key(self):
+        assert surface_key('たべません でした') == 'たべませんでした'
+
+    def test_lookup(self):
+        eat = Verb('たべる', 'eat')
+        index = ConjugationIndex([eat, Verb('のむ', 'drink')])
+        assert index.lookup('たべなかった') == [(eat, FormSpec.of(Vt.PLAIN, Vt.PAST, Vt.NEG))]
+        assert index.lookup('たべませんでした') == index.lookup('たべません でした')
+        assert index.lookup('たべなっかた') == []
+        assert 'のんで' in index
+        assert index.verb_count == 2
+
+    def test_lookup_result_is_a_copy(self):
+        index = ConjugationIndex([Verb('たべる', 'eat')])
+        index.lookup('たべた').clear()
+        assert len(index.lookup('たべた')) == 1
+
+    def test_dictionary_builds_index_once(self):
+        d = Dictionary()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(d.conjugations)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert all(r is results[0] for r in results)
+
+    def test_incremental(self):
+        index = ConjugationIndex()
+        assert 'かいた' not in index
+        index.add(Verb('かく', 'write'))
+        (verb, spec), = index.lookup('かいた')
+        assert verb.plain == 'かく'
+        assert spec.form == 'ta'
+
+    def test_every_form_found(self):
+        for v in sdict.eng_verb_dict.values():
+            for args in ((Vt.POLITE,), (Vt.PAST, Vt.NEG), (Vt.TE,), (Vt.VOLITIONAL, Vt.POLITE)):
+                form = FormSpec.of(*args).form
+                assert any(w is v and spec.form == form for w, spec in sdict.deconjugate(v.conjugate(*args)))
+
+    def test_shared_surface(self):
+        # Every sense of a reading shares its surface forms
+        meanings = {v.meaning for v, spec in sdict.deconjugate('みた')}
+        assert meanings == {'see', 'look', 'watch'}
+
+
+if __name__ == '__main__':
+    unittest.main()
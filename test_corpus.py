@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+import sentences
+from japanese import Vt, FormSpec
+from corpus import corpus_plan, build_corpus, shard_count, combination_count, shard_sentences
+
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def build(self, plan, workers):
+        path = os.path.join(self.dir.name, f'corpus-{workers}.tsv')
+        count = build_corpus(path, plan, workers)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        assert text.count('\n') == count
+        assert os.listdir(self.dir.name).count(os.path.basename(path)) == 1
+        return text
+
+    def test_matches_sentence_stream(self):
+        words = dict(subjects=['I', 'she', None], nouns=['beer', 'sushi', None], verbs=['drink', 'eat', 'use'])
+        plan = corpus_plan(shard_size=4, **words)
+        assert combination_count(plan) == 27
+        assert shard_count(plan) == 7
+        expected = ''.join(f'{jap}\t{eng}\n' for jap, eng in sentences.sentence_stream(**words))
+        assert self.build(plan, 1) == expected
+
+    def test_same_for_any_worker_count(self):
+        plan = corpus_plan(['I', 'he'], None, None, with_=['Tanaka-san', None], sample=0.05, seed=7,
+                           shard_size=100)
+        one = self.build(plan, 1)
+        assert one == self.build(plan, 3)
+        assert one != self.build(plan._replace(seed=8), 1)
+
+    def test_shards_partition(self):
+        plan = corpus_plan(['I'], ['beer', 'bread'], ['drink', 'eat', 'use'], [FormSpec.of(Vt.PAST)], shard_size=4)
+        shards = [list(shard_sentences(plan, shard)) for shard in range(shard_count(plan))]
+        assert [len(s) for s in shards] == [4, 2]
+        assert sum(shards, []) == list(sentences.sentence_stream(['I'], ['beer', 'bread'], ['drink', 'eat', 'use'],
+                                                                 [FormSpec.of(Vt.PAST)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from japanese import Vt, FormSpec
+from dictionary import sdict
+from deinflect import Deinflector, Candidate
+
+
+class TestDeinflector(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.d = Deinflector()
+
+    def plains(self, word):
+        return [c.plain for c in self.d.deinflect(word)]
+
+    def test_godan(self):
+        assert self.d.deinflect('はしらなかった')[0] == \
+            Candidate('はしる', Vt.VARIABLE, FormSpec.of(Vt.PLAIN, Vt.PAST, Vt.NEG))
+        assert 'およぐ' in self.plains('およいで')
+        assert {'かう', 'かつ', 'かる'} <= set(self.plains('かった'))
+
+    def test_ichidan(self):
+        assert 'おきる' in self.plains('おきませんでした')
+        assert 'おきる' in self.plains('おきません でした')
+
+    def test_exceptions(self):
+        assert self.plains('いって')[0] == 'いく'
+        assert 'べんきょうする' in self.plains('べんきょうしました')
+        assert 'くる' in self.plains('こなかった')
+
+    def test_no_small_tsu_stems(self):
+        assert not any(p.endswith('っる') for p in self.plains('かった'))
+
+    def test_known_verbs_round_trip(self):
+        for v in sdict.eng_verb_dict.values():
+            for spec in (FormSpec.of(Vt.POLITE, Vt.PAST), FormSpec.of(Vt.TE), FormSpec.of(Vt.PAST, Vt.NEG)):
+                found = [(c.plain, c.type, c.spec.form) for c in self.d.deinflect(spec.conjugate(v))]
+                assert (v.plain, v.type, spec.form) in found, (v.plain, spec)
+
+    def test_bounded(self):
+        assert len(self.d.deinflect('かった', max_candidates=2)) == 2
+        assert self.d.max_suffix <= 10
+        assert self.d.deinflect('') == []
+        assert self.d.deinflect('abc') == []
+
+    def test_deinflect_many(self):
+        words = ['たべた', 'のんで', 'たべた']
+        result = self.d.deinflect_many(words)
+        assert len(result) == 3
+        assert result[0] is result[2]
+        assert result[1] == self.d.deinflect('のんで')
+
+
+if __name__ == '__main__':
+    unittest.main()
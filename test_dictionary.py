@@ -1,6 +1,10 @@
+import copy
+import pickle
+import threading
 import unittest
 
-from dictionary import sdict
+from japanese import Vt
+from dictionary import sdict, Dictionary, LazyDictionary
 
 
 class TestDictionary(unittest.TestCase):
@@ -25,6 +29,96 @@ class TestDictionary(unittest.TestCase):
         assert p1 is p2
         assert p2 is not p3
 
+    def test_verb_senses(self):
+        see, look, watch = sdict.verb_senses('みる')
+        assert [s.meaning for s in (see, look, watch)] == ['see', 'look', 'watch']
+        assert see.verb is look.verb is watch.verb
+        assert sdict.verb('みる') is see
+        assert sdict.verb('watch') is watch
+        assert watch.conjugate(Vt.PAST) == 'みた'
+        assert watch.conjugate(Vt.ENG) == 'watch'
+        assert sdict.verb_senses('watch') == [watch]
+        assert sdict.verb_senses('nothing') == []
+
+    def test_duplicate_senses_dropped(self):
+        assert len(sdict.verb_senses('けす')) == 1
+        assert [s.meaning for s in sdict.verb_senses('つける')] == ['turn on', 'be careful']
+        assert len({id(s.verb) for s in sdict.eng_verb_dict.values()}) == len(sdict.jap_verb_dict)
+
+    def test_homophones_keep_their_conjugation(self):
+        class Homophones(Dictionary):
+            @staticmethod
+            def _verbs():
+                return [('かえる', 'return', Vt.VARIABLE), ('かえる', 'change'), ('かえる', 'go home', Vt.VARIABLE)]
+
+        back, change, home = Homophones().verb_senses('かえる')
+        assert (back.type, change.type) == (Vt.VARIABLE, Vt.REGULAR)
+        assert back.conjugate(Vt.POLITE) == 'かえります'
+        assert change.conjugate(Vt.POLITE) == 'かえます'
+        assert back.verb is home.verb is not change.verb
+        assert [(v.meaning, spec.form) for v, spec in Homophones().deconjugate('かえます')] == [('change', 'masu')]
+
+    def test_verb_sense_pickles(self):
+        eat = sdict.verb('eat')
+        for clone in (pickle.loads(pickle.dumps(eat)), copy.copy(eat), copy.deepcopy(eat)):
+            assert (clone.plain, clone.meaning, clone.type) == (eat.plain, eat.meaning, eat.type)
+            assert clone.conjugate(Vt.POLITE, Vt.PAST) == 'たべました'
+        with self.assertRaises(AttributeError):
+            eat.no_such_form
+
+    def test_noun_senses(self):
+        assert sdict.noun_senses('ほん') == [sdict.noun('book')]
+        assert sdict.pronoun_senses('she') == [sdict.pronoun('かのじょ')]
+
+    def test_words(self):
+        verbs = sdict.words('verb')
+        assert [v.meaning for v in verbs if v.plain == 'みる'] == ['see', 'look', 'watch']
+        assert sdict.noun('book') in sdict.words('noun')
+        assert sdict.pronoun('she') in sdict.words('pronoun')
+
+    def test_lookup(self):
+        assert [e.word for e in sdict.lookup('eat')] == [sdict.verb('eat')]
+        assert [e.word.meaning for e in sdict.lookup('みる')] == ['see', 'look', 'watch']
+        assert [e.pos for e in sdict.lookup('ほん')] == ['noun']
+        assert list(sdict.lookup('ほ')) == []
+
+    def test_complete(self):
+        assert [e.key for e in sdict.complete('たべ')] == ['たべる']
+        assert [e.key for e in sdict.complete('びー')] == ['ビール']
+        assert [e.key for e in sdict.complete('bo', 'noun')] == ['book', 'bookshelf', 'box']
+        assert {e.key for e in sdict.complete('わた', 'pronoun')} == {'わたし', 'わたしたち'}
+
+    def test_sdict_is_shared(self):
+        assert sdict.get() is sdict.get()
+        assert isinstance(sdict.get(), Dictionary)
+        assert sdict.built
+
+    def test_lazy_dictionary_builds_once(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return Dictionary()
+
+        lazy = LazyDictionary(factory)
+        assert not lazy.built
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(lazy.get())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert lazy.verb('eat').plain == 'たべる'
+
+    def test_lazy_dictionary_copies(self):
+        for clone in (copy.copy(sdict), copy.deepcopy(sdict), pickle.loads(pickle.dumps(sdict))):
+            assert not clone.built
+            assert clone.verb('eat').plain == 'たべる'
+        with self.assertRaises(AttributeError):
+            LazyDictionary.__new__(LazyDictionary).__setstate__
+
 
 if __name__ == '__main__':
     unittest.main()
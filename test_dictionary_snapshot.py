@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+import metrics
+from japanese import canonical_specs, Vt
+from dictionary import sdict
+from dictionary_snapshot import (SnapshotDictionary, snapshot_bytes, save_snapshot, open_snapshot, share_snapshot,
+                                 attach_snapshot)
+
+
+def _worker_lookups(name, words, queue):
+    with attach_snapshot(name) as snapshot:
+        queue.put([snapshot.verb(w).conjugate(Vt.POLITE) for w in words])
+
+
+class TestDictionarySnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = snapshot_bytes(sdict.get())
+
+    def setUp(self):
+        self.snapshot = SnapshotDictionary(self.data)
+
+    def test_every_verb_sense(self):
+        for key, senses in list(sdict.jap_verb_senses.items()) + list(sdict.eng_verb_senses.items()):
+            found = self.snapshot.verb_senses(key)
+            assert [(v.plain, v.meaning, v.type) for v in found] == [(v.plain, v.meaning, v.type) for v in senses]
+            for v, s in zip(found, senses):
+                assert [spec.conjugate(v) for spec in canonical_specs] == [spec.conjugate(s) for spec in canonical_specs]
+                assert v.eng == s.eng
+
+    def test_nouns_and_pronouns(self):
+        for senses, find in ((sdict.jap_noun_senses, self.snapshot.noun_senses),
+                             (sdict.eng_noun_senses, self.snapshot.noun_senses),
+                             (sdict.jap_pronoun_senses, self.snapshot.pronoun_senses),
+                             (sdict.eng_pronoun_senses, self.snapshot.pronoun_senses)):
+            for key, words in senses.items():
+                assert [(n.jap, n.eng) for n in find(key)] == [(n.jap, n.eng) for n in words]
+        assert self.snapshot.pronoun(None) is None
+        assert self.snapshot.noun('beer').jap == sdict.noun('beer').jap
+
+    def test_misses(self):
+        assert self.snapshot.verb_senses('fly to the moon') == []
+        with self.assertRaises(KeyError):
+            self.snapshot.verb('fly to the moon')
+        with self.assertRaises(KeyError):
+            self.snapshot.noun('')
+
+    def test_misses_are_counted(self):
+        metrics.reset()
+        metrics.enable()
+        self.addCleanup(metrics.reset)
+        self.addCleanup(metrics.disable)
+        self.snapshot.verb('drink')
+        with self.assertRaises(KeyError):
+            self.snapshot.pronoun('they')
+        counters = metrics.stats()['counters']
+        assert counters['dictionary_lookups_total{pos="verb"}'] == 1
+        assert counters['dictionary_misses_total{pos="pronoun"}'] == 1
+
+    def test_deconjugate(self):
+        for surface in list(sdict.conjugations)[:200] + ['たべません でした', 'unknown']:
+            expected = [(v.plain, v.meaning, spec) for v, spec in sdict.deconjugate(surface)]
+            assert [(v.plain, v.meaning, spec) for v, spec in self.snapshot.deconjugate(surface)] == expected
+
+    def test_not_a_snapshot(self):
+        with self.assertRaises(AssertionError):
+            SnapshotDictionary(b'\0' * len(self.data))
+
+    def test_mmap(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'dictionary.snapshot')
+            save_snapshot(sdict.get(), path)
+            with open_snapshot(path) as snapshot:
+                assert snapshot.verb('eat').ta == 'たべた'
+                assert snapshot.count('verbs') == len(sdict.words('verb'))
+
+    def test_shared_memory_workers(self):
+        shm = share_snapshot(sdict.get())
+        try:
+            words = ['drink', 'eat', 'のむ']
+            queue = multiprocessing.Queue()
+            workers = [multiprocessing.Process(target=_worker_lookups, args=(shm.name, words, queue))
+                       for _ in range(3)]
+            for w in workers:
+                w.start()
+            results = [queue.get(timeout=30) for _ in workers]
+            for w in workers:
+                w.join()
+            assert results == [['のみます', 'たべます', 'のみます']] * len(workers)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
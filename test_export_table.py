@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import unittest
+
+from japanese import Vt, FormSpec, Verb
+from dictionary import sdict
+from export_table import export_table
+
+
+class CountingSink(object):
+    """ Records how many writes an export makes """
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, s):
+        self.writes.append(s)
+
+
+class TestExportTable(unittest.TestCase):
+    def test_text_matches_print_table(self):
+        out = io.StringIO()
+        assert export_table(out, max_n=3) == 3
+        lines = out.getvalue().split('\n')
+        assert lines[0].startswith('Meaning')
+        assert lines[2].startswith('meet')
+        assert len(lines) == 6
+
+    def test_csv(self):
+        out = io.StringIO()
+        n = export_table(out, 'csv')
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        assert n == len(sdict.eng_verb_dict) == len(rows) - 1
+        assert rows[0][0] == 'Meaning'
+        assert rows[1] == ['meet', 'あいます', 'あって', 'あう', 'あわない', 'あった', 'あわなかった']
+
+    def test_jsonl_columns(self):
+        out = io.StringIO()
+        verbs = [Verb('たべる', 'eat'), Verb('のむ', 'drink')]
+        export_table(out, 'jsonl', [FormSpec.of(Vt.PAST), ('Polite', (Vt.POLITE,)), (Vt.VOLITIONAL,)], verbs)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert records == [{'past': 'たべた', 'Polite': 'たべます', 'volitional': 'たべよう'},
+                           {'past': 'のんだ', 'Polite': 'のみます', 'volitional': 'のもう'}]
+
+    def test_specs_sharing_a_form_get_their_own_keys(self):
+        out = io.StringIO()
+        export_table(out, 'jsonl', [(Vt.ENG,), (Vt.ENG, Vt.PAST)], [Verb('あるく', 'walk')])
+        assert json.loads(out.getvalue()) == {'eng': 'walk', 'past+eng': 'walked'}
+        with self.assertRaises(ValueError):
+            export_table(io.StringIO(), 'csv', [('Eat', ()), ('Eat', (Vt.PAST,))])
+
+    def test_html_escapes(self):
+        out = io.StringIO()
+        export_table(out, 'html', [('Meaning', (Vt.ENG,))], [Verb('たべる', '<eat>')])
+        assert '<td>&lt;eat&gt;</td>' in out.getvalue()
+        assert out.getvalue().endswith('</table>\n')
+
+    def test_sort(self):
+        out = io.StringIO()
+        export_table(out, 'csv', [('Plain', ()), ('Meaning', (Vt.ENG,))], sort_by='Meaning')
+        meanings = [row[1] for row in csv.reader(io.StringIO(out.getvalue()))][1:]
+        assert meanings == sorted(meanings)
+
+    def test_sort_by_unknown_column(self):
+        with self.assertRaises(ValueError) as raised:
+            export_table(io.StringIO(), 'csv', [('Plain', ())], sort_by='Meaning')
+        assert 'Plain' in str(raised.exception)
+
+    def test_sort_first_n(self):
+        columns = [('Plain', ()), ('Meaning', (Vt.ENG,))]
+        every, first = io.StringIO(), io.StringIO()
+        export_table(every, 'csv', columns, sort_by='Meaning')
+        assert export_table(first, 'csv', columns, sort_by='Meaning', max_n=5) == 5
+        assert first.getvalue().splitlines() == every.getvalue().splitlines()[:6]
+
+    def test_chunked_writes(self):
+        sink = CountingSink()
+        n = export_table(sink, 'jsonl', chunk_lines=10)
+        assert len(sink.writes) == -(-n // 10)
+
+    def test_unknown_format(self):
+        with self.assertRaises(AssertionError):
+            export_table(io.StringIO(), 'xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import random
+import unittest
+
+from dictionary import sdict
+from fuzzy_index import BKTree, edit_distance
+
+
+class TestEditDistance(unittest.TestCase):
+    def test_edit_distance(self):
+        assert edit_distance('', '') == 0
+        assert edit_distance('たべる', '') == 3
+        assert edit_distance('たべる', 'たべた') == 1
+        assert edit_distance('kitten', 'sitting') == 3
+        assert edit_distance('あいう', 'あう') == edit_distance('あう', 'あいう') == 1
+
+
+class TestBKTree(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        words = [''.join(rng.choice('あいうかきく') for _ in range(rng.randint(1, 6))) for _ in range(500)]
+        tree = BKTree(words)
+        assert len(tree) == len(set(words))
+        for query in words[:30] + ['かかかか', 'x']:
+            for bound in (0, 1, 2):
+                expected = sorted({(edit_distance(query, w), w) for w in words if edit_distance(query, w) <= bound})
+                assert tree.search(query, bound) == expected
+
+    def test_top_k(self):
+        tree = BKTree(['たべる', 'たべた', 'たべない', 'のむ'])
+        assert tree.search('たべる', 2, k=1) == [(0, 'たべる')]
+        assert [w for d, w in tree.search('たべう', 3, k=2)] == ['たべた', 'たべる']
+        assert BKTree().search('たべる') == []
+
+
+class TestSuggest(unittest.TestCase):
+    def test_suggest(self):
+        assert sdict.suggest('たべなっかた')[0] == (2, 'たべなかった')
+        assert sdict.suggest('たべませんでした', k=1) == [(0, 'たべませんでした')]
+        assert sdict.suggest('bicycel', k=1) == [(2, 'bicycle')]
+        assert sdict.suggest('zzzzzzzz') == []
+
+
+if __name__ == '__main__':
+    unittest.main()
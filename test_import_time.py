@@ -0,0 +1,44 @@
+import subprocess
+import sys
+import unittest
+
+# Cumulative import time allowed for each entry point module, in microseconds
+import_budget_us = 250000
+
+entry_points = ('sentences', 'print_verb_table', 'numbers_quiz', 'say', 'dictionary')
+
+
+def import_times(module, check=''):
+    """ Run a fresh interpreter importing module, returning its stdout and a dict
+    of module name -> cumulative import time in microseconds """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}\n{check}'],
+        capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return result.stdout, times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_budget(self):
+        for module in entry_points:
+            _, times = import_times(module)
+            assert times[module] < import_budget_us, f'{module} took {times[module]} us to import'
+
+    def test_imports_are_silent(self):
+        for module in entry_points:
+            stdout, _ = import_times(module)
+            assert stdout == '', f'{module} printed {stdout!r} on import'
+
+    def test_sdict_not_built_on_import(self):
+        import_times('sentences', 'import dictionary, say\n'
+                                  'assert not dictionary.sdict.built\n'
+                                  'assert say._backend is None')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 # coding: utf-8
 
 import unittest
-from japanese import Verb, Noun, Vt, hiragana, left_kana, left_most_kana
+from japanese import Verb, LazyVerb, FormSpec, form_slots, conjugate_many, conjugation_getter, Noun, Vt, \
+    verb_forms, hiragana, katakana, kana_grid, left_kana, left_most_kana, right_most_kana, voiced_kana, unvoiced_kana
 
 
 class TestJapanese(unittest.TestCase):
@@ -18,6 +19,32 @@ class TestJapanese(unittest.TestCase):
         assert left_most_kana('す') == u'さ'
         assert left_most_kana('に') == u'な'
 
+    def test_kana_grid(self):
+        assert kana_grid[u'あ'] == (0, 0)
+        assert kana_grid[u'ぬ'] == (4, 2)
+        assert kana_grid[u'ヌ'] == (4 + len(hiragana), 2)
+        assert u' ' not in kana_grid
+        for line in katakana:
+            assert len(line) == 5
+
+    def test_katakana_shifts(self):
+        assert left_kana(u'ク') == u'キ'
+        assert left_most_kana(u'イ') == u'ワ'
+        assert right_most_kana(u'ニ') == u'ノ'
+
+    def test_unknown_kana(self):
+        with self.assertRaises(AssertionError):
+            left_kana(u'x')
+        with self.assertRaises(AssertionError):
+            left_kana(u'あ')
+
+    def test_dakuten(self):
+        assert voiced_kana(u'か') == u'が'
+        assert voiced_kana(u'ホ') == u'ボ'
+        assert voiced_kana(u'な') == u'な'
+        assert unvoiced_kana(u'ぱ') == u'は'
+        assert unvoiced_kana(u'ヅ') == u'ツ'
+
     def test_VerbTaberu(self):
         v = Verb(u'たべる', 'to eat')
         assert v.type is Vt.REGULAR
@@ -152,6 +179,79 @@ class TestJapanese(unittest.TestCase):
         assert v.conjugate(Vt.VOLITIONAL) == 'ならおう'
         assert v.conjugate(Vt.VOLITIONAL, Vt.POLITE) == 'ならいましょう'
 
+    def test_VerbMottekuru(self):
+        v = Verb(u'もってくる', 'to bring')
+        assert v.type is Vt.IREGULAR
+        assert v.masu == u'もってきます'
+        assert v.ou == u'もってこよう'
+
+    def test_lazy_verb_matches_verb(self):
+        for plain, vtype in ((u'たべる', None), (u'あるく', None), (u'おくる', Vt.VARIABLE),
+                             (u'いく', None), (u'くる', None), (u'のむ', None)):
+            eager = Verb(plain, 'meaning', vtype)
+            lazy = LazyVerb(plain, 'meaning', vtype)
+            assert lazy.type is eager.type
+            for form in verb_forms:
+                assert getattr(lazy, form) == getattr(eager, form), form
+            assert lazy.conjugate(Vt.POLITE, Vt.PAST, Vt.NEG) == eager.conjugate(Vt.POLITE, Vt.PAST, Vt.NEG)
+
+    def test_lazy_verb_caches_forms(self):
+        v = LazyVerb(u'かく', 'to write')
+        assert not hasattr(v, '__dict__')
+        assert v.te is v.te
+        assert LazyVerb._te.__get__(v) == u'かいて'
+
+    def test_lazy_verb_defers_errors(self):
+        v = LazyVerb('かすい', 'lend')
+        with self.assertRaises(AssertionError):
+            v.te
+
+    def test_conjugate_many(self):
+        verbs = [Verb('ならう', 'learn'), Verb('たべる', 'eat'), LazyVerb('する', 'do')]
+        specs = [(), (Vt.PAST,), (Vt.TE,), (Vt.VOLITIONAL, Vt.POLITE), (Vt.ENG, Vt.PAST)]
+        grid = conjugate_many(verbs, specs)
+        assert len(grid) == 3
+        assert grid[0] == ['ならう', 'ならった', 'ならって', 'ならいましょう', 'learned']
+        for v, row in zip(verbs, grid):
+            assert row == [v.conjugate(*spec) for spec in specs]
+
+    def test_conjugation_getter_te_alone(self):
+        with self.assertRaises(AssertionError):
+            conjugation_getter(Vt.TE, Vt.POLITE)
+
+    def test_vt_values(self):
+        assert Vt.PAST.value == 5
+        assert Vt.PAST.bit == 1 << 5
+
+    def test_form_spec(self):
+        spec = FormSpec.of(Vt.PLAIN, Vt.PAST, Vt.NEG)
+        assert spec.form == 'nakata'
+        assert form_slots[spec.index] == 'nakata'
+        assert spec.key == Vt.PLAIN.bit | Vt.PAST.bit | Vt.NEG.bit
+        assert spec.flags == (Vt.PAST, Vt.NEG, Vt.PLAIN)
+        assert FormSpec.of(Vt.NEG, Vt.PAST, Vt.PLAIN) is spec
+        assert FormSpec.of().form == 'plain'
+        assert FormSpec.of(Vt.TE).form == 'te'
+        assert FormSpec.of(Vt.VOLITIONAL, Vt.POLITE).form == 'mashyo'
+
+    def test_form_spec_eng(self):
+        v = Verb('たべる', 'eat')
+        assert FormSpec.of(Vt.ENG, Vt.PAST, Vt.POLITE).conjugate(v) == 'eated'
+        assert FormSpec.of(Vt.ENG).index is None
+
+    def test_form_spec_invalid(self):
+        for args in ((Vt.PAST, Vt.PRESENT), (Vt.AFFIRM, Vt.NEG), (Vt.POLITE, Vt.PLAIN),
+                     (Vt.TE, Vt.PAST), (Vt.VOLITIONAL, Vt.NEG), (Vt.REGULAR,)):
+            with self.assertRaises(AssertionError):
+                FormSpec.of(*args)
+
+    def test_forms_array(self):
+        v = Verb('かく', 'write')
+        assert len(v.forms) == len(form_slots)
+        for spec_args in ((), (Vt.POLITE,), (Vt.PAST,), (Vt.TE,), (Vt.VOLITIONAL,)):
+            spec = FormSpec.of(*spec_args)
+            assert v.form(spec.index) == v.conjugate(*spec_args) == LazyVerb('かく', 'write').form(spec.index)
+
     def test_noun(self):
         n = Noun('まど', 'window')
         assert n.eng == n.meaning == 'window'
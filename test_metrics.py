@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import metrics
+import sentences
+import say
+from dictionary import sdict
+from japanese import Verb, Vt, conjugate_many
+from speech_scheduler import SpeechScheduler, FakeBackend
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        metrics.enable()
+        self.addCleanup(metrics.reset)
+        self.addCleanup(metrics.disable)
+
+    def test_disabled_records_nothing(self):
+        metrics.disable()
+        Verb(u'のむ', 'drink').conjugate(Vt.PAST)
+        sentences.basic_sen('I', 'beer', 'drink', None, Vt.PAST)
+        assert metrics.stats() == {'counters': {}, 'histograms': {}}
+
+    def test_counters(self):
+        metrics.count('things_total')
+        metrics.count('things_total', 2)
+        metrics.count('things_total', kind='b', a='x')
+        assert metrics.stats()['counters'] == {'things_total': 3, 'things_total{a="x",kind="b"}': 1}
+        metrics.reset()
+        assert metrics.stats()['counters'] == {}
+
+    def test_histogram(self):
+        for seconds in (2e-6, 3e-6, 0.5, 20.0):
+            metrics.observe('op_seconds', seconds)
+        h = metrics.stats()['histograms']['op_seconds']
+        assert h['count'] == 4
+        assert abs(h['sum'] - 20.500005) < 1e-9
+        buckets = dict(h['buckets'])
+        assert buckets[1e-6] == 0
+        assert buckets[2.5e-6] == 1
+        assert buckets[5e-6] == 2
+        assert buckets[1.0] == 3
+        assert buckets[float('inf')] == 4
+
+    def test_verbs(self):
+        v = Verb(u'のむ', 'drink')
+        v.conjugate(Vt.PAST)
+        v.conjugate(Vt.TE)
+        histograms = metrics.stats()['histograms']
+        assert histograms['verb_construct_seconds']['count'] == 1
+        assert histograms['verb_conjugate_seconds']['count'] == 2
+
+    def test_every_conjugation_path_is_timed(self):
+        sdict.verb('eat').conjugate(Vt.PAST)
+        sentences.basic_sen('I', 'beer', 'drink', None, Vt.PAST)
+        conjugate_many([sdict.verb('drink')], [(Vt.TE,), (Vt.ENG, Vt.PAST)])
+        histograms = metrics.stats()['histograms']
+        # The sentence conjugates its verb in Japanese and English
+        assert histograms['verb_conjugate_seconds']['count'] == 5
+
+    def test_environment_switch(self):
+        for value, on in (('0', False), ('false', False), ('1', True)):
+            env = dict(os.environ, NIHONGO_METRICS=value)
+            out = subprocess.run([sys.executable, '-c', 'import metrics; print(metrics.enabled)'], env=env,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+            assert out.stdout.strip() == str(on), (value, out)
+
+    def test_dictionary_misses(self):
+        sdict.verb('drink')
+        sdict.noun('beer')
+        with self.assertRaises(AssertionError):
+            sdict.verb('fly to the moon')
+        with self.assertRaises(AssertionError):
+            sdict.pronoun('they')
+        counters = metrics.stats()['counters']
+        assert counters['dictionary_lookups_total{pos="verb"}'] == 2
+        assert counters['dictionary_lookups_total{pos="noun"}'] == 1
+        assert counters['dictionary_misses_total{pos="verb"}'] == 1
+        assert counters['dictionary_misses_total{pos="pronoun"}'] == 1
+        assert 'dictionary_misses_total{pos="noun"}' not in counters
+
+    def test_say(self):
+        say.set_scheduler(SpeechScheduler(FakeBackend()))
+        self.addCleanup(say.set_scheduler, None)
+        say.say_jap_wait('いち')
+        say.say_jap_wait('に')
+        say.say_eng_wait('one')
+        counters = metrics.stats()['counters']
+        assert counters['say_utterances_total{lang="ja-JP"}'] == 2
+        assert counters['say_utterances_total{lang="en-GB"}'] == 1
+
+    def test_sentences(self):
+        sentences.basic_sen('I', 'beer', 'drink', None, Vt.PAST)
+        sentences.polite_request_sen('eat')
+        stream = sentences.sentence_stream(['I'], ['beer'], ['drink', 'eat'])
+        next(stream)
+        next(stream)
+        stream.close()
+        counters = metrics.stats()['counters']
+        assert counters['sentences_total{kind="basic"}'] == 1
+        assert counters['sentences_total{kind="polite_request"}'] == 1
+        assert counters['sentences_total{kind="stream"}'] == 2
+        assert metrics.stats()['histograms']['basic_sen_seconds']['count'] == 1
+
+    def test_prometheus_text(self):
+        metrics.count('dictionary_misses_total', pos='verb')
+        metrics.observe('verb_conjugate_seconds', 3e-6)
+        lines = metrics.prometheus_text().splitlines()
+        assert lines[:2] == ['# TYPE dictionary_misses_total counter', 'dictionary_misses_total{pos="verb"} 1']
+        assert '# TYPE verb_conjugate_seconds histogram' in lines
+        assert 'verb_conjugate_seconds_bucket{le="2.5e-06"} 0' in lines
+        assert 'verb_conjugate_seconds_bucket{le="5e-06"} 1' in lines
+        assert 'verb_conjugate_seconds_bucket{le="+Inf"} 1' in lines
+        assert 'verb_conjugate_seconds_count 1' in lines
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from array import array
+
+from number_reading import number_kana, number_kanji, read_numbers, check_answer, block_kana, kana_pattern
+
+
+class TestNumberReading(unittest.TestCase):
+    def test_small(self):
+        assert number_kana(0) == 'ぜろ'
+        assert number_kana(7) == 'なな'
+        assert number_kana(14) == 'じゅうよん'
+        assert number_kana(40) == 'よんじゅう'
+        assert number_kana(99) == 'きゅうじゅうきゅう'
+
+    def test_sound_changes(self):
+        assert number_kana(300) == 'さんびゃく'
+        assert number_kana(600) == 'ろっぴゃく'
+        assert number_kana(800) == 'はっぴゃく'
+        assert number_kana(3000) == 'さんぜん'
+        assert number_kana(8000) == 'はっせん'
+        assert number_kana(3520) == 'さんぜんごひゃくにじゅう'
+
+    def test_large(self):
+        assert number_kana(10000) == 'いちまん'
+        assert number_kana(20300) == 'にまんさんびゃく'
+        assert number_kana(10000000) == 'いっせんまん'
+        assert number_kana(100000000) == 'いちおく'
+        assert number_kana(10 ** 12) == 'いっちょう'
+        assert number_kana(8 * 10 ** 12) == 'はっちょう'
+        assert number_kana(10 ** 13) == 'じゅっちょう'
+        assert number_kana(6 * 10 ** 16) == 'ろっけい'
+        assert number_kana(6 * 10 ** 12) == 'ろくちょう'
+        assert number_kana(100 * 10 ** 16) == 'ひゃっけい'
+        assert number_kana(100 * 10 ** 12) == 'ひゃくちょう'
+        assert number_kana(800 * 10 ** 16) == 'はっぴゃっけい'
+        with self.assertRaises(AssertionError):
+            number_kana(10 ** 20)
+
+    def test_kanji(self):
+        assert number_kanji(0) == '〇'
+        assert number_kanji(10) == '十'
+        assert number_kanji(1111) == '千百十一'
+        assert number_kanji(10000) == '一万'
+        assert number_kanji(35000001) == '三千五百万一'
+        assert number_kanji(-12) == 'マイナス十二'
+
+    def test_block_memo(self):
+        assert block_kana(1000, 1) is block_kana(1000, 1)
+        assert block_kana(1000) == 'せん'
+
+    def test_read_numbers(self):
+        numbers = array('q', [1, 300, 10000])
+        assert read_numbers(numbers) == ['いち', 'さんびゃく', 'いちまん']
+        assert read_numbers([1, 300], kanji=True) == ['一', '三百']
+        assert len(read_numbers(range(100000))) == 100000
+
+    def test_check_answer(self):
+        assert check_answer(3520, '3,520')
+        assert check_answer(3520, '三千五百二十')
+        assert check_answer(3520, 'さんぜん ごひゃく にじゅう')
+        assert check_answer(77, 'しちじゅうしち')
+        assert check_answer(77, 'ななじゅうしち')
+        assert not check_answer(3520, 'さんぜんごひゃく')
+        assert kana_pattern(10 ** 13).fullmatch('じっちょう')
+        assert not kana_pattern(10 ** 13).fullmatch('じちょう')
+
+
+if __name__ == '__main__':
+    unittest.main()
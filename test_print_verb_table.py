@@ -1,6 +1,6 @@
 import unittest
 
-from print_verb_table import print_verb_conjugation_table
+from print_verb_table import print_verb_conjugation_table, UFormat, char_widths
 
 
 class TestPrintVerbTable(unittest.TestCase):
@@ -8,5 +8,31 @@ class TestPrintVerbTable(unittest.TestCase):
         print_verb_conjugation_table(3)
 
 
+class TestUFormat(unittest.TestCase):
+    def test_char_width(self):
+        assert UFormat.char_width('a') == 1.0
+        assert UFormat.char_width('ア') == 5 / 3
+        assert UFormat.sum_width('日本') == 10 / 3
+        assert char_widths['日'] == 5 / 3
+
+    def test_format_uwords(self):
+        assert UFormat.format_uwords(['a', 'bb'], 3) == 'a  bb '
+        assert UFormat.format_uwords(iter(['a', 'bb']), 3) == 'a  bb '
+        assert UFormat.format_uwords(['a', 'bb'], [2, 5]) == 'a bb   '
+        assert UFormat.format_uwords([], 3) == ''
+        assert UFormat.format_uwords(['a', 'bb'], 2.5) == 'a  bb'
+
+    def test_column_widths(self):
+        assert UFormat.column_widths([('a',), ('bbb', 'たべる')], gap=1) == [4, 6]
+        assert UFormat.column_widths([]) == []
+
+    def test_render_table(self):
+        rows = [('eat', 'たべる'), ('drink', 'のむ')]
+        lines = UFormat.render_table(rows).split('\n')
+        assert lines == [UFormat.format_uwords(row, [7, 7]) for row in rows]
+        assert UFormat.render_table([]) == ''
+        assert UFormat.render_table(rows, widths=[3, 3], gap=0).startswith('eatたべる')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,96 @@
+import tempfile
+import threading
+import time
+import unittest
+
+import say
+from say import RenderCache
+from speech_scheduler import SpeechScheduler, FakeBackend
+from quiz_pipeline import QuizItem, prefetched, run_quiz, item_utterances
+
+
+def items(n, generated=None, seconds=0.0):
+    for i in range(1, n + 1):
+        time.sleep(seconds)
+        if generated is not None:
+            generated.append(i)
+        yield QuizItem(i, str(i * 100), i * 100, f'That was {i * 100}.', 1)
+
+
+class TestQuizPipeline(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.default = say.scheduler()
+        say.set_scheduler(SpeechScheduler(self.backend))
+
+    def tearDown(self):
+        say.set_scheduler(self.default)
+
+    def test_prefetched_order(self):
+        assert [item.number for item in prefetched(items(5), prefetch=2)] == [1, 2, 3, 4, 5]
+        assert list(prefetched(items(0))) == []
+
+    def test_prefetches_ahead(self):
+        generated = []
+        stream = prefetched(items(10, generated), prefetch=3)
+        first = next(stream)
+        time.sleep(0.05)
+        assert first.number == 1
+        assert generated == [1, 2, 3, 4]
+        stream.close()
+
+    def test_prerenders_into_cache(self):
+        with tempfile.TemporaryDirectory() as d:
+            cache = RenderCache(d)
+            list(prefetched(items(3), cache=cache))
+            assert cache.misses == 9
+            for text, lang, speed in item_utterances(QuizItem(2, '200', 200, 'That was 200.', 1)):
+                cache.get(text, lang, speed)
+            assert cache.hits == 3
+
+    def test_run_quiz_says_items_in_order(self):
+        run_quiz(items(2), repeats=2, delay=0)
+        assert [text for text, _, _ in self.backend.spoken] == [
+            '1 ばん', '100', '100', 'That was 100.', '100',
+            '2 ばん', '200', '200', 'That was 200.', '200',
+            'おわりました']
+
+    def test_plays_prerendered_audio(self):
+        played = []
+        with tempfile.TemporaryDirectory() as d:
+            cache = RenderCache(d)
+            say.set_render_cache(cache, played.append, lambda: False)
+            try:
+                run_quiz(items(2), repeats=2, delay=0)
+            finally:
+                say.set_render_cache(None)
+                say.set_scheduler(self.default)
+        # Only the closing phrase was not rendered ahead
+        assert (cache.misses, cache.hits) == (7, 10)
+        assert len(played) == 11
+
+    def test_generation_overlaps_speech(self):
+        # Saying an item's number waits for the next item to be generated, which
+        # only happens in time if generation runs alongside speech
+        generated = [threading.Event() for _ in range(8)]
+        overlapped = []
+
+        def numbered():
+            for item in items(6):
+                generated[item.number].set()
+                yield item
+
+        class Waiting(FakeBackend):
+            def speak(self, text, lang, speed, stop):
+                if text.endswith('ばん') and int(text.split()[0]) < 6:
+                    overlapped.append(generated[int(text.split()[0]) + 1].wait(2))
+                return super().speak(text, lang, speed, stop)
+
+        say.set_scheduler(SpeechScheduler(Waiting()))
+        run_quiz(numbered(), repeats=0, delay=0, prefetch=2)
+        assert overlapped == [True] * 5
+        assert threading.active_count() < 10
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,12 @@
+import asyncio
+import os
+import tempfile
+import time
+import wave
 import unittest
 
 import say
+from speech_scheduler import SpeechScheduler, FakeBackend
 
 
 class TestSay(unittest.TestCase):
@@ -9,11 +15,17 @@ class TestSay(unittest.TestCase):
         say.say("こんにちは", 'ja-JP')
 
     def test_is_speaking(self):
-        say.say("I'm speaking")
-        if say.speech_available:
+        backend = FakeBackend(durations={"I'm speaking": 10.0})
+        default = say.scheduler()
+        say.set_scheduler(SpeechScheduler(backend))
+        try:
+            say.say("I'm speaking")
             assert say.is_speaking()
-        else:
+            say.scheduler().cancel_all()
+            say.finish_speaking()
             assert not say.is_speaking()
+        finally:
+            say.set_scheduler(default)
 
     def test_finish_speaking(self):
         say.finish_speaking()
@@ -27,6 +39,124 @@ class TestSay(unittest.TestCase):
         say.say_eng_wait("1", 0.5)
         say.say_eng_wait("2", 0)
 
+    def test_speech_available(self):
+        assert say.speech_available == say.is_speech_available()
+        with self.assertRaises(AttributeError):
+            say.no_such_attribute
+
+    def test_waits_use_scheduler(self):
+        backend = FakeBackend()
+        default = say.scheduler()
+        say.set_scheduler(SpeechScheduler(backend))
+        try:
+            say.say_jap_wait('いち')
+            say.say_eng_wait('one')
+            say.say('two')
+            assert asyncio.run(say.speak('に', 'ja-JP'))
+            say.finish_speaking()
+        finally:
+            say.set_scheduler(default)
+        assert backend.spoken == [('いち', 'ja-JP', 0.3), ('one', 'en-GB', 0.5), ('two', 'en-GB', 0.5),
+                                  ('に', 'ja-JP', 0.5)]
+
+    def test_render_cache_playback(self):
+        played = []
+        default = say.scheduler()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = say.RenderCache(directory)
+            say.set_render_cache(cache, played.append, lambda: False)
+            try:
+                say.say_jap_wait('いち')
+                say.say_jap_wait('いち')
+                say.say_eng_wait('one')
+                say.say('one')
+                say.finish_speaking()
+            finally:
+                say.set_render_cache(None)
+                say.set_scheduler(default)
+        assert played == [cache.path('いち', 'ja-JP', 0.3)] * 2 + [cache.path('one', 'en-GB', 0.5)] * 2
+        assert (cache.hits, cache.misses) == (2, 2)
+
+    def test_render_cache_waits_for_audio(self):
+        # With no way to ask the player, each file counts as playing for its length
+        default = say.scheduler()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = say.RenderCache(directory, say.WaveRenderer(char_seconds=0.02))
+            with wave.open(cache.get('いち', 'ja-JP', 0.3)) as w:
+                seconds = w.getnframes() / w.getframerate()
+            say.set_render_cache(cache, lambda path: None)
+            try:
+                start = time.monotonic()
+                say.say_jap_wait('いち')
+                say.say_jap_wait('いち')
+                assert time.monotonic() - start >= 2 * seconds
+            finally:
+                say.set_render_cache(None)
+                say.set_scheduler(default)
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache = say.RenderCache(self.dir.name, say.WaveRenderer())
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_wave_renderer(self):
+        data = say.WaveRenderer(rate=8000, char_seconds=0.1).render('あい', 'ja-JP', 0.5)
+        path = os.path.join(self.dir.name, 'x.wav')
+        with open(path, 'wb') as f:
+            f.write(data)
+        with wave.open(path) as w:
+            assert w.getnframes() == 2 * 800
+            assert w.getframerate() == 8000
+
+    def test_hits_and_misses(self):
+        p1 = self.cache.get('おわりました', 'ja-JP', 0.3)
+        p2 = self.cache.get('おわりました', 'ja-JP', 0.3)
+        p3 = self.cache.get('おわりました', 'ja-JP', 0.5)
+        assert p1 == p2 != p3
+        assert os.path.exists(p1) and os.path.exists(p3)
+        assert (self.cache.hits, self.cache.misses) == (1, 2)
+        assert self.cache.stats()['files'] == 2
+        assert not [n for n in os.listdir(self.dir.name) if n.endswith('.tmp')]
+
+    def test_persistent(self):
+        self.cache.get('ばん', 'ja-JP', 0.3)
+        again = say.RenderCache(self.dir.name)
+        again.get('ばん', 'ja-JP', 0.3)
+        assert (again.hits, again.misses) == (1, 0)
+
+    def test_evicted_by_another_process(self):
+        path = self.cache.get('ばん', 'ja-JP', 0.3)
+        os.unlink(path)
+        assert self.cache.get('ばん', 'ja-JP', 0.3) == path
+        assert os.path.exists(path)
+        assert (self.cache.hits, self.cache.misses) == (0, 2)
+        assert self.cache.total_bytes == os.path.getsize(path)
+
+    def test_lru_eviction(self):
+        size = len(say.WaveRenderer().render('ab', 'en-GB', 0.5))
+        cache = say.RenderCache(self.dir.name, max_bytes=2 * size)
+        a = cache.get('ab')
+        b = cache.get('cd')
+        cache.get('ab')   # b is now the least recently used
+        c = cache.get('ef')
+        assert cache.evictions == 1
+        assert os.path.exists(a) and os.path.exists(c) and not os.path.exists(b)
+        assert cache.total_bytes == 2 * size
+
+    def test_failed_render_leaves_nothing(self):
+        class Broken(object):
+            def render(self, text, lang, speed):
+                raise RuntimeError('no synthesizer')
+
+        cache = say.RenderCache(self.dir.name, Broken())
+        with self.assertRaises(RuntimeError):
+            cache.get('x')
+        assert os.listdir(self.dir.name) == []
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,11 @@
+import tracemalloc
+import types
 import unittest
+from itertools import islice
+
 import sentences
+from japanese import Vt, FormSpec, canonical_specs
+from dictionary import sdict
 
 
 class TestSentences(unittest.TestCase):
@@ -11,6 +17,45 @@ class TestSentences(unittest.TestCase):
     def test_polite_request_sen(self):
         sentences.polite_request_sen_examples()
 
+    def test_template_matches_basic_sen(self):
+        template = sentences.basic_template('I', 'beer', 'drink', 'Tanaka-san')
+        for args in ((Vt.PAST,), (Vt.POLITE, Vt.NEG), (Vt.TE,), (Vt.VOLITIONAL, Vt.POLITE)):
+            assert template.render(FormSpec.of(*args)) == sentences.basic_sen('I', 'beer', 'drink', 'Tanaka-san', *args)
+
+    def test_stream_counts(self):
+        stream = sentences.sentence_stream(['I', 'he'], ['beer', 'sushi', None], ['drink', 'eat'])
+        assert isinstance(stream, types.GeneratorType)
+        assert sum(1 for _ in stream) == 2 * 3 * 2 * len(canonical_specs)
+        everything = sentences.sentence_stream(with_=None, specs=canonical_specs[:1])
+        n = len(sdict.eng_pronoun_dict)
+        assert sum(1 for _ in everything) == n * n * len(sdict.eng_noun_dict) * len(sdict.eng_verb_dict)
+
+    def test_stream_filter(self):
+        polite = [spec for spec in canonical_specs if spec.has(Vt.POLITE)]
+        stream = sentences.sentence_stream(['she'], ['phone'], ['use'],
+                                           where=lambda subject, noun, verb, spec: spec.has(Vt.POLITE))
+        assert [jap for jap, eng in stream] == ['かのじょ は でんわ を ' + spec.conjugate(sdict.verb('use'))
+                                                for spec in polite]
+
+    def test_stream_sample(self):
+        def sampled(seed):
+            return list(sentences.sentence_stream(['I', 'we'], None, None, sample=0.01, seed=seed))
+        first = sampled(1)
+        assert first == sampled(1)
+        assert first != sampled(2)
+        total = 2 * len(sdict.eng_noun_dict) * len(sdict.eng_verb_dict) * len(canonical_specs)
+        assert 0 < len(first) < total / 20
+
+    def test_stream_memory(self):
+        def peak(n):
+            tracemalloc.start()
+            for _ in islice(sentences.sentence_stream(with_=None), n):
+                pass
+            size = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return size
+        assert peak(100000) < 2 * peak(1000) + 100000
+
 
 if __name__ == '__main__':
     unittest.main()
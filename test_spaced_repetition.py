@@ -0,0 +1,112 @@
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from spaced_repetition import Card, Deck, sm2, day, verb_card_ids, noun_card_ids, card_answer
+
+
+class TestSm2(unittest.TestCase):
+    def test_intervals_grow(self):
+        card = Card('noun/すし')
+        intervals = [sm2(card, 5, 0).interval for _ in range(4)]
+        assert intervals == [1, 6, 16, 45]
+        assert card.due == 45 * day
+
+    def test_ease_floor(self):
+        card = Card('noun/すし')
+        for _ in range(10):
+            sm2(card, 0, 0)
+        assert card.ease == 1.3
+        assert card.reps == 0
+
+
+class TestDeck(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, 'deck.sqlite')
+
+    def test_due_order(self):
+        with Deck(self.path, page_size=3) as deck:
+            deck.add([f'noun/{i}' for i in range(10)], now=0)
+            seen = []
+            while True:
+                card = deck.next_card(now=0)
+                if card is None:
+                    break
+                seen.append(card.id)
+                deck.review(card, 4 if len(seen) % 2 else 1, now=len(seen))
+            assert sorted(seen) == sorted(f'noun/{i}' for i in range(10))
+            assert deck.due_count(now=0) == 0
+            assert deck.due_count(now=20 * day) == 10
+            # First reviews are all due a day later, in the order they were reviewed
+            assert deck.next_card(now=2 * day).id == seen[0]
+
+    def test_reviewed_past_last_page(self):
+        with Deck(self.path) as deck:
+            deck.add(['a', 'b'], now=0)
+            for _ in range(2):
+                deck.review(deck.next_card(now=0), 5, now=0)
+            assert deck.next_card(now=0) is None
+            assert deck.due_count(now=2 * day) == 2
+            assert deck.next_card(now=2 * day).id == 'a'
+
+    def test_matches_sorted_order(self):
+        rng = random.Random(1)
+        with Deck(self.path, page_size=16, batch_size=7) as deck:
+            deck.add([f'noun/{i}' for i in range(200)], now=0)
+            now = 0
+            for _ in range(1000):
+                now += rng.randint(0, day // 2)
+                card = deck.next_card(now)
+                if card is None:
+                    continue
+                deck.flush()
+                assert card.due == sqlite3.connect(self.path).execute('SELECT MIN(due) FROM cards').fetchone()[0]
+                deck.review(card, rng.randint(0, 5), now)
+
+    def test_persists(self):
+        with Deck(self.path) as deck:
+            deck.add(['noun/すし'], now=0)
+            deck.review(deck.next_card(now=0), 5, now=0)
+        with Deck(self.path) as deck:
+            assert deck.next_card(now=0) is None
+            card = deck.next_card(now=day)
+            assert (card.id, card.reps, card.interval) == ('noun/すし', 1, 1)
+            deck.add(['noun/すし', 'noun/パン'], now=0)
+            assert len(deck) == 2
+            assert deck.next_card(now=0).id == 'noun/パン'
+
+    def test_batched_writes(self):
+        with Deck(self.path, batch_size=10) as deck:
+            deck.add([f'noun/{i}' for i in range(20)], now=0)
+            for _ in range(9):
+                deck.review(deck.next_card(now=0), 5, now=0)
+            other = sqlite3.connect(self.path)
+            assert other.execute('SELECT COUNT(*) FROM cards WHERE reps > 0').fetchone()[0] == 0
+            deck.review(deck.next_card(now=0), 5, now=0)
+            assert other.execute('SELECT COUNT(*) FROM cards WHERE reps > 0').fetchone()[0] == 10
+
+    def test_large_deck_opens_lazily(self):
+        with Deck(self.path) as deck:
+            deck.add((f'noun/{i}' for i in range(200000)), now=0)
+        start = time.perf_counter()
+        with Deck(self.path, page_size=100) as deck:
+            card = deck.next_card(now=0)
+            assert card is not None
+            assert deck.loaded == 100
+        assert time.perf_counter() - start < 0.5
+
+    def test_dictionary_cards(self):
+        ids = list(verb_card_ids(['のむ'])) + list(noun_card_ids(['すし']))
+        assert ids[0] == 'verb/のむ/plain'
+        assert card_answer(ids[0]) == ('drink (plain)', 'のむ')
+        assert card_answer(ids[-1]) == ('sushi', 'すし')
+        assert len(set(verb_card_ids())) == len(list(verb_card_ids()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from speech_scheduler import SpeechScheduler, FakeBackend, PollingBackend
+
+
+class TestSpeechScheduler(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend(durations={'long': 10.0})
+        self.scheduler = SpeechScheduler(self.backend)
+
+    def tearDown(self):
+        self.scheduler.cancel_all()
+        self.scheduler.close()
+
+    def test_speaks_in_order(self):
+        futures = [self.scheduler.enqueue(str(i), 'ja-JP', 0.3) for i in range(5)]
+        assert self.scheduler.wait(timeout=5)
+        assert all(f.result() for f in futures)
+        assert [text for text, _, _ in self.backend.spoken] == ['0', '1', '2', '3', '4']
+        assert not self.scheduler.busy
+
+    def test_fake_durations(self):
+        backend = FakeBackend(default=0.01, per_char=0.02)
+        assert backend.duration('abc') == 0.01 + 0.06
+        scheduler = SpeechScheduler(backend)
+        start = time.monotonic()
+        scheduler.enqueue('a').result()
+        assert time.monotonic() - start >= 0.03
+        scheduler.close()
+
+    def test_cancel_queued(self):
+        first = self.scheduler.enqueue('long')
+        second = self.scheduler.enqueue('second')
+        while not first.running():
+            time.sleep(0.001)
+        assert self.scheduler.cancel(second)
+        assert self.scheduler.cancel(first)
+        assert first.result(timeout=5) is False
+        assert second.cancelled()
+        assert self.scheduler.wait(timeout=5)
+        assert [text for text, _, _ in self.backend.spoken] == ['long']
+
+    def test_cancel_before_backend_starts(self):
+        # A cancel just after the utterance became current, before the backend has
+        # begun speaking it, still stops it
+        entered, go = threading.Event(), threading.Event()
+
+        class Gated(FakeBackend):
+            def speak(self, text, lang, speed, stop):
+                entered.set()
+                go.wait(5)
+                return super().speak(text, lang, speed, stop)
+
+        scheduler = SpeechScheduler(Gated(default=10.0))
+        future = scheduler.enqueue('a')
+        assert entered.wait(5)
+        assert scheduler.cancel(future)
+        go.set()
+        assert future.result(timeout=5) is False
+        scheduler.close()
+
+    def test_cancel_all(self):
+        futures = [self.scheduler.enqueue('long') for _ in range(3)]
+        self.scheduler.cancel_all()
+        assert self.scheduler.wait(timeout=5)
+        assert all(f.cancelled() or f.result() is False for f in futures)
+
+    def test_wait_timeout(self):
+        self.scheduler.enqueue('long')
+        assert not self.scheduler.wait(timeout=0.05)
+        assert self.scheduler.busy
+
+    def test_asyncio(self):
+        async def main():
+            return await asyncio.gather(self.scheduler.speak('いち', 'ja-JP'), self.scheduler.speak('に', 'ja-JP'))
+
+        assert asyncio.run(main()) == [True, True]
+        assert [text for text, _, _ in self.backend.spoken] == ['いち', 'に']
+
+    def test_backend_error(self):
+        def broken(text, lang, speed):
+            raise ValueError(text)
+
+        scheduler = SpeechScheduler(PollingBackend(broken, lambda: False))
+        with self.assertRaises(ValueError):
+            scheduler.enqueue('x').result(timeout=5)
+        # The worker carries on after a failure
+        with self.assertRaises(ValueError):
+            scheduler.enqueue('y').result(timeout=5)
+        scheduler.close()
+
+    def test_close(self):
+        self.scheduler.enqueue('a')
+        self.scheduler.close()
+        assert self.backend.spoken == [('a', 'en-GB', 0.5)]
+        with self.assertRaises(AssertionError):
+            self.scheduler.enqueue('b')
+
+
+class TestPollingBackend(unittest.TestCase):
+    def test_polls_until_done(self):
+        polls = [True, True, False]
+        said = []
+        backend = PollingBackend(lambda *args: said.append(args), lambda: polls.pop(0), interval=0.001)
+        assert backend.speak('a', 'en-GB', 0.5, threading.Event())
+        assert said == [('a', 'en-GB', 0.5)]
+        assert polls == []
+
+    def test_stopped_before_speaking(self):
+        said = []
+        backend = PollingBackend(lambda *args: said.append(args), lambda: False)
+        stop = threading.Event()
+        stop.set()
+        assert not backend.speak('a', 'en-GB', 0.5, stop)
+        assert said == []
+
+    def test_stop(self):
+        stopped = []
+        backend = PollingBackend(lambda *args: None, lambda: True, lambda: stopped.append(1), interval=0.001)
+        scheduler = SpeechScheduler(backend)
+        future = scheduler.enqueue('a')
+        while not future.running():
+            time.sleep(0.001)
+        assert not future.done()
+        scheduler.cancel(future)
+        assert future.result(timeout=5) is False
+        assert stopped == [1]
+        scheduler.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from time_reading import time_kana, time_text, read_times, reading_table, check_time_answer, hour_kana, minute_kana
+
+
+class TestTimeReading(unittest.TestCase):
+    def test_irregular_hours(self):
+        assert hour_kana(4) == 'よじ'
+        assert hour_kana(7) == 'しちじ'
+        assert hour_kana(9) == 'くじ'
+        assert hour_kana(14) == 'じゅうよじ'
+        assert hour_kana(20) == 'にじゅうじ'
+        assert hour_kana(23) == 'にじゅうさんじ'
+
+    def test_irregular_minutes(self):
+        assert minute_kana(1) == 'いっぷん'
+        assert minute_kana(2) == 'にふん'
+        assert minute_kana(3) == 'さんぷん'
+        assert minute_kana(4) == 'よんぷん'
+        assert minute_kana(8) == 'はっぷん'
+        assert minute_kana(10) == 'じゅっぷん'
+        assert minute_kana(11) == 'じゅういっぷん'
+        assert minute_kana(20) == 'にじゅっぷん'
+        assert minute_kana(59) == 'ごじゅうきゅうふん'
+
+    def test_styles(self):
+        assert time_kana(0, 0) == 'ごぜんじゅうにじ'
+        assert time_kana(0, 0, '24h') == 'れいじ'
+        assert time_kana(12, 30) == 'ごごじゅうにじさんじゅっぷん'
+        assert time_kana(21, 4, '24h') == 'にじゅういちじよんぷん'
+        assert time_text(21, 4, '24h') == '21時4分'
+        assert time_text(9, 0) == '午前9時'
+
+    def test_table(self):
+        for style in ('ampm', '24h'):
+            table = reading_table(style)
+            assert len(table) == 1440
+            assert len(set(table)) == 1440
+        assert reading_table('24h') is reading_table('24h')
+
+    def test_batch(self):
+        minutes = range(0, 1440, 7)
+        assert read_times(minutes) == [time_kana(m // 60, m % 60) for m in minutes]
+        assert read_times([75], '24h', kanji=True) == ['1時15分']
+        assert read_times([]) == []
+
+    def test_check_answer(self):
+        assert check_time_answer(15, 10, 'ごご さんじ じゅっぷん')
+        assert check_time_answer(15, 10, 'ごごさんじじっぷん')
+        assert check_time_answer(15, 10, '午後3時10分')
+        assert check_time_answer(16, 30, 'よじはん', '24h') is False
+        assert check_time_answer(4, 30, 'よじはん', '24h')
+        assert not check_time_answer(15, 10, 'ごごさんじ')
+
+    def test_bad_time(self):
+        with self.assertRaises(AssertionError):
+            time_kana(24, 0)
+        with self.assertRaises(AssertionError):
+            reading_table('12h')
+
+
+if __name__ == '__main__':
+    unittest.main()
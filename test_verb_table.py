@@ -0,0 +1,68 @@
+import unittest
+
+from japanese import Verb, Vt, verb_forms
+from dictionary import sdict
+from verb_table import VerbTable, StringColumn
+
+
+class TestStringColumn(unittest.TestCase):
+    def test_append_and_index(self):
+        c = StringColumn()
+        c.append('あ')
+        c.extend(['', 'いう'])
+        c.append('eat')
+        assert len(c) == 4
+        assert list(c) == ['あ', '', 'いう', 'eat']
+        assert c[-1] == 'eat'
+        with self.assertRaises(IndexError):
+            c[4]
+
+    def test_interleaved_appends_keep_few_buffers(self):
+        c = StringColumn()
+        words = [str(i) * (i % 3) for i in range(5000)]
+        for i, w in enumerate(words):
+            c.append(w)
+            assert c[i] == w
+        assert len(c._chunks) <= 14
+        assert list(c) == words
+
+
+class TestVerbTable(unittest.TestCase):
+    def test_rows_match_verbs(self):
+        verbs = list(sdict.eng_verb_dict.values())
+        table = VerbTable.from_verbs(verbs)
+        assert len(table) == len(verbs)
+        for v, row in zip(verbs, table):
+            assert row.plain == v.plain
+            assert row.meaning == row.eng == v.meaning
+            assert row.type is v.type
+            for form in verb_forms:
+                assert getattr(row, form) == getattr(v, form)
+            assert row.conjugate(Vt.POLITE, Vt.PAST, Vt.NEG) == v.conjugate(Vt.POLITE, Vt.PAST, Vt.NEG)
+
+    def test_column(self):
+        table = VerbTable([('たべる', 'eat'), ('のむ', 'drink'), ('くる', 'come')])
+        assert table.column('ta') == ['たべた', 'のんだ', 'きた']
+        assert table.column('plain') == ['たべる', 'のむ', 'くる']
+
+    def test_append_and_chunks(self):
+        entries = [('たべる', 'eat'), ('のむ', 'drink'), ('おくる', 'send', Vt.VARIABLE)]
+        table = VerbTable()
+        table.extend(entries, chunk_size=2)
+        table.append('かく', 'write')
+        assert len(table) == 4
+        assert table[-1].te == 'かいて'
+        assert table[2].masu == Verb('おくる', 'send', Vt.VARIABLE).masu
+        with self.assertRaises(IndexError):
+            table[4]
+
+    def test_bad_verb_leaves_table_aligned(self):
+        table = VerbTable([('たべる', 'eat')])
+        with self.assertRaises(AssertionError):
+            table.extend([('のむ', 'drink'), ('かすい', 'lend')])
+        assert len(table) == 1
+        assert all(len(c) == 1 for c in table.columns.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from japanese import Verb, Noun
+from word_index import WordIndex, fold_kana, is_kana
+
+
+class TestWordIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = WordIndex()
+        self.eat = Verb('たべる', 'eat')
+        self.beer = Noun('ビール', 'beer')
+        self.bread = Noun('パン', 'bread')
+        self.see = Verb('みる', 'see')
+        self.look = Verb('みる', 'look')
+        for pos, w in (('verb', self.eat), ('noun', self.beer), ('noun', self.bread),
+                       ('verb', self.see), ('verb', self.look)):
+            self.index.add(pos, w)
+
+    def test_fold_kana(self):
+        assert fold_kana('パン') == 'ぱん'
+        assert fold_kana('たべる abc') == 'たべる abc'
+        assert fold_kana('ン') == 'ん'
+
+    def test_is_kana(self):
+        assert is_kana('ん') and is_kana('ン') and is_kana('ー')
+        assert not is_kana('a') and not is_kana('日')
+
+    def test_exact(self):
+        assert [e.word for e in self.index.exact('eat')] == [self.eat]
+        assert [e.word for e in self.index.exact('みる')] == [self.see, self.look]
+        assert list(self.index.exact('みる', pos='noun')) == []
+        assert list(self.index.exact('mi')) == []
+        assert len(self.index) == 10
+
+    def test_prefix(self):
+        assert [e.key for e in self.index.prefix('b')] == ['beer', 'bread']
+        assert [e.key for e in self.index.prefix('b', lang='jap')] == []
+        assert [e.key for e in self.index.prefix('', lang='jap')] == ['たべる', 'みる', 'みる', 'パン', 'ビール']
+        assert list(self.index.prefix('x')) == []
+
+    def test_kana_prefix(self):
+        assert [e.word for e in self.index.kana_prefix('ぱ')] == [self.bread]
+        assert [e.word for e in self.index.kana_prefix('パ')] == [self.bread]
+        assert [e.word for e in self.index.kana_prefix('び', pos='verb')] == []
+        assert list(self.index.kana_prefix('ん')) == []
+
+
+if __name__ == '__main__':
+    unittest.main()
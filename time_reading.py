@@ -0,0 +1,122 @@
+"""
+Japanese readings of clock times.  Readings for all 1,440 minutes of the day are
+built once, on first use, for both the 午前/午後 and the 24 hour styles, so a
+reading is then a single list index
+"""
+import re
+from operator import itemgetter
+
+from number_reading import number_kana
+
+styles = ('ampm', '24h')
+
+# Hour readings whose last digit is irregular before じ
+_hour_ones = ('', 'いち', 'に', 'さん', 'よ', 'ご', 'ろく', 'しち', 'はち', 'く')
+
+# Minute readings for the last digit, with the ふん / ぷん sound changes
+_minute_ones = ('', 'いっぷん', 'にふん', 'さんぷん', 'よんぷん', 'ごふん',
+                'ろっぷん', 'ななふん', 'はっぷん', 'きゅうふん')
+
+_tables = {}
+
+
+def hour_kana(hour):
+    """ Reading of an hour 0 to 24 followed by じ
+    >>> [hour_kana(h) for h in (0, 4, 9, 14, 19)]
+    ['れいじ', 'よじ', 'くじ', 'じゅうよじ', 'じゅうくじ']
+    """
+    if hour == 0:
+        return 'れいじ'
+    tens, ones = divmod(hour, 10)
+    return (number_kana(tens * 10) if tens else '') + _hour_ones[ones] + 'じ'
+
+
+def minute_kana(minute):
+    """ Reading of a minute 0 to 59; empty for 0, so the hour is read alone
+    >>> [minute_kana(m) for m in (1, 6, 10, 30, 45)]
+    ['いっぷん', 'ろっぷん', 'じゅっぷん', 'さんじゅっぷん', 'よんじゅうごふん']
+    """
+    if minute == 0:
+        return ''
+    tens, ones = divmod(minute, 10)
+    if ones:
+        return (number_kana(tens * 10) if tens else '') + _minute_ones[ones]
+    return number_kana(minute)[:-len('じゅう')] + 'じゅっぷん'
+
+
+def _reading(hour, minute, style):
+    if style == 'ampm':
+        # Noon and midnight are read as 12, like the English 12:30 pm
+        prefix = 'ごご' if hour >= 12 else 'ごぜん'
+        return prefix + hour_kana(hour % 12 or 12) + minute_kana(minute)
+    return hour_kana(hour) + minute_kana(minute)
+
+
+def _text(hour, minute, style):
+    if style == 'ampm':
+        prefix = '午後' if hour >= 12 else '午前'
+        clock = f'{prefix}{hour % 12 or 12}時'
+    else:
+        clock = f'{hour}時'
+    return clock + (f'{minute}分' if minute else '')
+
+
+def reading_table(style='ampm', kanji=False):
+    """ The list of readings for every minute of the day, indexed by hour * 60 + minute """
+    assert style in styles, f"Unknown style {style}"
+    key = (style, kanji)
+    table = _tables.get(key)
+    if table is None:
+        make = _text if kanji else _reading
+        table = _tables[key] = [make(h, m, style) for h in range(24) for m in range(60)]
+    return table
+
+
+def time_kana(hour, minute, style='ampm'):
+    """ Kana reading of a 24 hour clock time
+    >>> time_kana(15, 45)
+    'ごごさんじよんじゅうごふん'
+    >>> time_kana(9, 10, '24h')
+    'くじじゅっぷん'
+    """
+    assert 0 <= hour < 24 and 0 <= minute < 60, f"{hour}:{minute} is not a time"
+    return reading_table(style)[hour * 60 + minute]
+
+
+def time_text(hour, minute, style='ampm'):
+    """ A time written with 時 and 分
+    >>> time_text(15, 5)
+    '午後3時5分'
+    """
+    assert 0 <= hour < 24 and 0 <= minute < 60, f"{hour}:{minute} is not a time"
+    return reading_table(style, kanji=True)[hour * 60 + minute]
+
+
+def read_times(minutes_of_day, style='ampm', kanji=False):
+    """ Readings for many times, each given as hour * 60 + minute
+    >>> read_times([0, 61, 1439], '24h')
+    ['れいじ', 'いちじいっぷん', 'にじゅうさんじごじゅうきゅうふん']
+    """
+    minutes_of_day = list(minutes_of_day)
+    if not minutes_of_day:
+        return []
+    table = reading_table(style, kanji)
+    result = itemgetter(*minutes_of_day)(table)
+    return list(result) if len(minutes_of_day) > 1 else [result]
+
+
+def check_time_answer(hour, minute, answer, style='ampm'):
+    """ True if answer is the time in kana or written with 時 and 分.  Spaces are
+    ignored, and じっぷん for じゅっぷん and はん for 30 minutes are accepted
+    >>> check_time_answer(3, 30, 'ごぜんさんじはん')
+    True
+    """
+    answer = answer.replace(' ', '').replace('　', '')
+    if answer == time_text(hour, minute, style):
+        return True
+    pattern = re.escape(time_kana(hour, minute, style))
+    pattern = pattern.replace('じゅっぷん', '(?:じゅっぷん|じっぷん)')
+    if minute == 30:
+        pattern = pattern.replace('さん(?:じゅっぷん|じっぷん)',
+                                  '(?:さんじゅっぷん|さんじっぷん|はん)')
+    return re.fullmatch(pattern, answer) is not None
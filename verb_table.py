@@ -0,0 +1,185 @@
+"""
+Columnar storage for large verb lexicons.  Each column keeps its strings end to end
+in one shared buffer with an array of offsets, so a row costs a few bytes per form
+rather than a Verb object with a dozen string attributes
+"""
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, islice
+
+from japanese import Verb, VerbRules, Vt, verb_forms
+
+# Verb types are stored as small integer codes
+verb_types = (Vt.REGULAR, Vt.VARIABLE, Vt.IREGULAR)
+_type_codes = {t: i for i, t in enumerate(verb_types)}
+
+string_columns = ('plain', 'meaning') + verb_forms
+
+
+class StringColumn(object):
+    """ A sequence of strings held end to end in a few buffers, sliced out by offsets
+    >>> c = StringColumn()
+    >>> c.extend(['たべる', 'のむ'])
+    >>> c[1], len(c)
+    ('のむ', 2)
+    """
+
+    __slots__ = ('_chunks', '_starts', '_pending', '_offsets')
+
+    def __init__(self):
+        self._chunks = []
+        self._starts = []
+        self._pending = []
+        self._offsets = array('I', [0])
+
+    def append(self, s):
+        self._pending.append(s)
+        self._offsets.append(self._offsets[-1] + len(s))
+
+    def extend(self, strings):
+        strings = list(strings)
+        self._pending.extend(strings)
+        self._offsets.extend(islice(accumulate(map(len, strings), initial=self._offsets[-1]), 1, None))
+        self.flush()
+
+    def flush(self):
+        # Pending strings are joined into a new buffer, which swallows the buffers before
+        # it that are no longer than itself.  Like a binary counter this keeps O(log n)
+        # buffers, and each character is copied O(log n) times however appends and reads mix
+        if not self._pending:
+            return
+        chunk = ''.join(self._pending)
+        self._pending = []
+        if not chunk:
+            return
+        start = self._offsets[-1] - len(chunk)
+        chunks, starts = self._chunks, self._starts
+        while chunks and len(chunks[-1]) <= len(chunk):
+            chunk = chunks.pop() + chunk
+            start = starts.pop()
+        chunks.append(chunk)
+        starts.append(start)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('StringColumn index out of range')
+        self.flush()
+        begin, end = self._offsets[i], self._offsets[i + 1]
+        if begin == end:
+            return ''
+        k = bisect_right(self._starts, begin) - 1
+        start = self._starts[k]
+        return self._chunks[k][begin - start:end - start]
+
+    def __iter__(self):
+        self.flush()
+        offsets = self._offsets
+        k = 0
+        for i in range(len(self)):
+            begin, end = offsets[i], offsets[i + 1]
+            if begin == end:
+                yield ''
+                continue
+            while k + 1 < len(self._starts) and self._starts[k + 1] <= begin:
+                k += 1
+            start = self._starts[k]
+            yield self._chunks[k][begin - start:end - start]
+
+
+class VerbView(VerbRules):
+    """ A lightweight row of a VerbTable, which looks like a Verb """
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    @property
+    def type(self):
+        return verb_types[self._table.types[self._row]]
+
+    def __repr__(self):
+        return f'VerbView({self.plain!r}, {self.meaning!r})'
+
+
+def _column_property(name):
+    return property(lambda self: self._table.columns[name][self._row])
+
+
+for _name in string_columns:
+    setattr(VerbView, _name, _column_property(_name))
+del _name
+
+
+class VerbTable(object):
+    """ Verbs stored as parallel columns: plain forms, meanings, types and every
+    conjugated form.  Rows are returned as VerbView objects
+
+    >>> table = VerbTable([('たべる', 'eat'), ('のむ', 'drink')])
+    >>> table[1].conjugate(Vt.PAST)
+    'のんだ'
+    >>> table.column('ta')
+    ['たべた', 'のんだ']
+    """
+
+    def __init__(self, entries=()):
+        """ entries are (plain, meaning) or (plain, meaning, vtype) tuples """
+        self.types = array('B')
+        self.columns = {name: StringColumn() for name in string_columns}
+        self.extend(entries)
+
+    @classmethod
+    def from_verbs(cls, verbs):
+        """ Build a table holding the same verbs as a sequence of Verb objects """
+        return cls((v.plain, v.meaning, v.type) for v in verbs)
+
+    def append(self, plain, meaning, vtype=None):
+        # The columns join appended rows when they are next read
+        self._append(plain, meaning, vtype)
+
+    def extend(self, entries, chunk_size=4096):
+        """ Add entries a chunk at a time, filling each column of the chunk in one pass """
+        entries = iter(entries)
+        while True:
+            verbs = [Verb(*entry) for entry in islice(entries, chunk_size)]
+            if not verbs:
+                break
+            # Build every form before touching the columns so a failing verb leaves them aligned
+            chunk = {name: [getattr(v, name) for v in verbs] for name in string_columns}
+            for name in string_columns:
+                self.columns[name].extend(chunk[name])
+            self.types.extend(_type_codes[v.type] for v in verbs)
+
+    def _append(self, plain, meaning, vtype=None):
+        verb = Verb(plain, meaning, vtype)
+        row = [getattr(verb, name) for name in string_columns]
+        for name, value in zip(string_columns, row):
+            self.columns[name].append(value)
+        self.types.append(_type_codes[verb.type])
+
+    def flush(self):
+        for column in self.columns.values():
+            column.flush()
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('VerbTable index out of range')
+        return VerbView(self, i)
+
+    def __iter__(self):
+        return (VerbView(self, i) for i in range(len(self)))
+
+    def column(self, name):
+        """ Every verb's value for one column, such as 'ta', in a single pass """
+        return list(self.columns[name])
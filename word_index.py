@@ -0,0 +1,114 @@
+"""
+A trie over the Japanese readings and English meanings of dictionary words, for
+exact, prefix and kana queries such as answer autocompletion.  Finding a prefix
+costs one step per character; the matches are then yielded lazily
+"""
+from collections import namedtuple
+
+# One indexed word: the key it is found by, its part of speech ('verb', 'noun'
+# or 'pronoun'), the key's language ('jap' or 'eng') and the word object itself
+IndexEntry = namedtuple('IndexEntry', 'key pos lang word')
+
+# Katakana ァ to ヶ sit 0x60 code points above their hiragana
+_hiragana_of = {k: k - 0x60 for k in range(ord('ァ'), ord('ヶ') + 1)}
+
+
+def fold_kana(s):
+    """ s with katakana folded to hiragana, so either script matches a reading
+    >>> fold_kana('ビール')
+    'びーる'
+    """
+    return s.translate(_hiragana_of)
+
+
+def is_kana(c):
+    """ True for hiragana, katakana and the long vowel mark """
+    return u'\u3041' <= c <= u'\u30fc'
+
+
+class _Node(object):
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = []
+
+
+class WordIndex(object):
+    """ Trie of IndexEntry objects keyed by Japanese reading and English meaning
+
+    >>> from japanese import Noun
+    >>> index = WordIndex()
+    >>> index.add('noun', Noun('ビール', 'beer'))
+    >>> [e.key for e in index.prefix('be')]
+    ['beer']
+    >>> [e.key for e in index.kana_prefix('び')]
+    ['ビール']
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._kana_root = _Node()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def _insert(root, key, entry):
+        node = root
+        for c in key:
+            child = node.children.get(c)
+            if child is None:
+                child = node.children[c] = _Node()
+            node = child
+        node.entries.append(entry)
+
+    @staticmethod
+    def _find(root, key):
+        node = root
+        for c in key:
+            node = node.children.get(c)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _walk(node):
+        """ Entries at and below node, in key order """
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield from node.entries
+            stack.extend(node.children[c] for c in sorted(node.children, reverse=True))
+
+    def add(self, pos, word):
+        """ Index a Verb (by plain form) or a Noun (by jap) under both its Japanese and English keys """
+        jap = word.plain if pos == 'verb' else word.jap
+        jap_entry = IndexEntry(jap, pos, 'jap', word)
+        WordIndex._insert(self._root, jap, jap_entry)
+        WordIndex._insert(self._kana_root, fold_kana(jap), jap_entry)
+        WordIndex._insert(self._root, word.meaning, IndexEntry(word.meaning, pos, 'eng', word))
+        self._size += 2
+
+    def exact(self, key, pos=None):
+        """ Iterator over the entries whose key is exactly key """
+        node = WordIndex._find(self._root, key)
+        entries = node.entries if node is not None else ()
+        return (e for e in entries if pos is None or e.pos == pos)
+
+    def prefix(self, prefix, pos=None, lang=None):
+        """ Iterator over the entries whose key starts with prefix, in key order """
+        node = WordIndex._find(self._root, prefix)
+        if node is None:
+            return iter(())
+        return (e for e in WordIndex._walk(node)
+                if (pos is None or e.pos == pos) and (lang is None or e.lang == lang))
+
+    def kana_prefix(self, kana, pos=None):
+        """ Iterator over the Japanese entries whose reading starts with kana, matching
+        hiragana and katakana alike """
+        node = WordIndex._find(self._kana_root, fold_kana(kana))
+        if node is None:
+            return iter(())
+        return (e for e in WordIndex._walk(node) if pos is None or e.pos == pos)